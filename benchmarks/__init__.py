@@ -0,0 +1 @@
+"""Benchmarks do Party Pascal (rodam sem janela, com o driver dummy do SDL)."""
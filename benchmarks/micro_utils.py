@@ -0,0 +1,315 @@
+#=========================================================
+#   MICRO-BENCHMARKS DOS HELPERS DE DESENHO (src/utils.py)
+#=========================================================
+
+"""
+Mede, isolados, os helpers de desenho usados por todos os minigames:
+draw_text, draw_text_wrapped, draw_question_container,
+draw_modern_container, draw_score_display, fade_in / fade_out e
+performance.adapt_surface, em telas de 720p, 1080p e 4K.
+
+    python -m benchmarks.micro_utils                   # compara com o baseline
+    python -m benchmarks.micro_utils --cases draw_text --sizes 4k
+    python -m benchmarks.micro_utils --update-baseline # regrava o baseline
+
+Como mede (no estilo do timeit):
+- aquecimento: o helper roda até WARMUP_S antes de medir (caches de texto e
+  de escala quentes, como no jogo);
+- calibração: o número de chamadas por rodada dobra até a rodada levar
+  pelo menos ROUND_S;
+- ROUNDS rodadas, intercaladas: cada passada roda uma rodada de cada caso
+  (com uma chamada fora do tempo antes, para reaquecer os caches), então
+  um trecho lento da máquina pega poucas rodadas de cada caso em vez de
+  todas as de um caso só;
+- o resumo traz mediana, mínimo, média e desvio padrão do tempo por
+  chamada (µs). A comparação usa o mínimo: o ruído da máquina (outros
+  processos, frequência da CPU) só soma tempo, então o mínimo é o número
+  mais estável entre execuções.
+
+O baseline fica em benchmarks/baseline_utils.json. Um caso regride quando
+o mínimo passa o do baseline por mais que o limite relativo (--threshold)
+e por mais que o piso absoluto (--noise-floor, em µs): nos casos de
+poucas dezenas de µs, alguns µs de diferença ainda são ruído. Os dois
+valores padrão vêm do arquivo. Com regressão, o processo sai com código 1.
+Os números dependem da máquina: regrave o baseline (--update-baseline) ao
+trocar a máquina de referência.
+
+Os tamanhos dos retângulos e das fontes acompanham a tela, como nas cenas.
+fade_in / fade_out são conduzidos quadro a quadro sem o loop do jogo, com
+o passo fixo equivalente a 60 FPS; o tempo é o da transição inteira.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import pygame
+
+BASELINE_PATH = os.path.join(BASE_DIR, "benchmarks", "baseline_utils.json")
+BG_PATH = os.path.join(BASE_DIR, "assets", "background", "background_main.png")
+
+SIZES = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+
+# Tempos de medição (segundos)
+WARMUP_S = 0.05
+ROUND_S = 0.15
+ROUNDS = 7
+
+# Regressão: mínimo acima de baseline * (1 + limite) e de baseline + piso (µs)
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_NOISE_FLOOR_US = 5.0
+
+QUESTION = ("Qual prática de Governança de TI garante que os riscos sejam "
+            "identificados, avaliados e tratados antes de afetar o negócio?")
+
+
+# ---------------------------------------------------------
+# CASOS
+# ---------------------------------------------------------
+def _drive(coro):
+    """Roda uma corrotina de cena até o fim, sem o scene_manager.run."""
+    try:
+        while True:
+            coro.send(None)
+    except StopIteration:
+        pass
+
+
+def _cases(screen):
+    """{nome: função sem argumentos} para uma tela do tamanho medido."""
+    from src import utils, performance
+    from src.asset_manager import asset_manager
+    from src.scene_manager import scene_manager
+
+    w, h = screen.get_size()
+    font = utils.load_font(int(h * 0.045))
+    font_small = utils.load_font(int(h * 0.03))
+    panel = pygame.Rect(0, 0, int(w * 0.7), int(h * 0.45))
+    panel.center = (w // 2, h // 2)
+
+    background = pygame.image.load(BG_PATH).convert()
+    score = [0]
+
+    # fade: dois ticks de 120 Hz por quadro (60 FPS)
+    scene_manager.timestep.ticks = 2
+
+    def score_display():
+        score[0] += 7  # placar muda a cada chamada, como no jogo
+        utils.draw_score_display(screen, score[0], font)
+
+    def adapt_miss():
+        asset_manager.clear()
+        performance.adapt_surface(background, (w, h))
+
+    return {
+        "draw_text": lambda: utils.draw_text(screen, "Pontuação Final", font, (255, 215, 0), (w // 2, h // 3), shadow=True),
+        "draw_text_wrapped": lambda: utils.draw_text_wrapped(screen, QUESTION, font_small, (255, 255, 255), panel, shadow_color=(0, 0, 0)),
+        "draw_question_container": lambda: utils.draw_question_container(screen, panel, "Pergunta 3", font),
+        "draw_modern_container": lambda: utils.draw_modern_container(screen, panel),
+        "draw_score_display": score_display,
+        "fade_in": lambda: _drive(utils.fade_in(screen)),
+        "fade_out": lambda: _drive(utils.fade_out(screen)),
+        "adapt_surface": lambda: performance.adapt_surface(background, (w, h)),
+        "adapt_surface_miss": adapt_miss,
+    }
+
+
+CASES = [
+    "draw_text",
+    "draw_text_wrapped",
+    "draw_question_container",
+    "draw_modern_container",
+    "draw_score_display",
+    "fade_in",
+    "fade_out",
+    "adapt_surface",
+    "adapt_surface_miss",
+]
+
+
+# ---------------------------------------------------------
+# MEDIÇÃO
+# ---------------------------------------------------------
+def _timed(fn, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - start
+
+
+def calibrate(fn, warmup_s=WARMUP_S, round_s=ROUND_S):
+    """Aquece `fn` e devolve (chamadas por rodada, µs por chamada na última tentativa)."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < warmup_s:
+        fn()
+
+    number = 1
+    while True:
+        elapsed = _timed(fn, number)
+        if elapsed >= round_s:
+            return number, elapsed / number * 1e6
+        number *= 2
+
+
+def summarize(per_call, number):
+    """Resumo (µs por chamada) das rodadas de um caso."""
+    rounds = len(per_call)
+    return {
+        "median_us": round(statistics.median(per_call), 3),
+        "min_us": round(min(per_call), 3),
+        "mean_us": round(statistics.mean(per_call), 3),
+        "stdev_us": round(statistics.stdev(per_call), 3) if len(per_call) > 1 else 0.0,
+        "number": number,
+        "rounds": rounds,
+    }
+
+
+def run(cases, sizes, rounds=ROUNDS):
+    from src import performance
+
+    pygame.init()
+    pygame.display.set_mode((320, 240))
+    performance.force_preset("high")  # smoothscale ligado, sem o governor
+
+    jobs = []
+    for size_name in sizes:
+        # Tela de trabalho no formato do display, do tamanho medido
+        screen = pygame.Surface(SIZES[size_name]).convert()
+        screen.fill((20, 20, 40))
+        fns = _cases(screen)
+        for case in cases:
+            number, first = calibrate(fns[case])
+            jobs.append((f"{case}@{size_name}", fns[case], number, [first]))
+
+    # Rodadas intercaladas entre os casos (ver docstring)
+    for _ in range(rounds - 1):
+        for key, fn, number, per_call in jobs:
+            fn()
+            per_call.append(_timed(fn, number) / number * 1e6)
+
+    results = {}
+    for key, fn, number, per_call in jobs:
+        results[key] = summarize(per_call, number)
+        print(f"  {key:34s} {results[key]['min_us']:12.1f} µs", file=sys.stderr)
+    return results
+
+
+# ---------------------------------------------------------
+# BASELINE
+# ---------------------------------------------------------
+def _meta():
+    return {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(str(v) for v in pygame.get_sdl_version()),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def compare(results, baseline, threshold, noise_floor=DEFAULT_NOISE_FLOOR_US):
+    """Lista de (caso, atual, baseline, razão, status), comparando o min_us."""
+    rows = []
+    base = baseline.get("results", {}) if baseline else {}
+    for key, info in results.items():
+        ref = base.get(key)
+        if ref is None:
+            rows.append((key, info["min_us"], None, None, "novo"))
+            continue
+        current, ref_us = info["min_us"], ref["min_us"]
+        ratio = current / ref_us if ref_us else 1.0
+        if abs(current - ref_us) <= noise_floor:
+            status = "ok"
+        elif ratio > 1 + threshold:
+            status = "REGRESSÃO"
+        elif ratio < 1 / (1 + threshold):
+            status = "melhorou"
+        else:
+            status = "ok"
+        rows.append((key, current, ref_us, ratio, status))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks dos helpers de desenho do src/utils.py.")
+    parser.add_argument("--cases", default=",".join(CASES), help="casos separados por vírgula")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="tamanhos: " + ", ".join(SIZES))
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, help="fração tolerada acima do baseline (padrão: a do arquivo)")
+    parser.add_argument("--noise-floor", type=float, help="diferença em µs sempre tratada como ruído (padrão: a do arquivo)")
+    parser.add_argument("--update-baseline", action="store_true", help="grava os resultados como novo baseline")
+    parser.add_argument("--out", help="grava também os resultados em JSON")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in args.cases.split(",") if c]
+    sizes = [s for s in args.sizes.split(",") if s]
+    unknown = [c for c in cases if c not in CASES] + [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"desconhecido: {', '.join(unknown)}")
+
+    results = run(cases, sizes, rounds=args.rounds)
+    baseline = load_baseline(args.baseline)
+    threshold = args.threshold
+    if threshold is None:
+        threshold = baseline.get("threshold", DEFAULT_THRESHOLD) if baseline else DEFAULT_THRESHOLD
+    noise_floor = args.noise_floor
+    if noise_floor is None:
+        noise_floor = baseline.get("noise_floor_us", DEFAULT_NOISE_FLOOR_US) if baseline else DEFAULT_NOISE_FLOOR_US
+
+    output = {"meta": _meta(), "threshold": threshold, "noise_floor_us": noise_floor, "results": results}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+
+    if args.update_baseline:
+        if baseline:
+            # Mantém os casos que não rodaram agora
+            merged = dict(baseline.get("results", {}))
+            merged.update(results)
+            output["results"] = dict(sorted(merged.items()))
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Baseline gravado em {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print("Sem baseline: rode com --update-baseline para criar.")
+        return 0
+
+    regressions = 0
+    print(f"{'caso':34s} {'atual µs':>12s} {'base µs':>12s} {'razão':>7s}  (mínimos; limite +{threshold:.0%}, piso {noise_floor:g} µs)")
+    for key, current, ref, ratio, status in compare(results, baseline, threshold, noise_floor):
+        ref_text = f"{ref:12.1f}" if ref is not None else f"{'-':>12s}"
+        ratio_text = f"{ratio:7.2f}" if ratio is not None else f"{'-':>7s}"
+        print(f"{key:34s} {current:12.1f} {ref_text} {ratio_text}  {status}")
+        regressions += status == "REGRESSÃO"
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
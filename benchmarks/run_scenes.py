@@ -0,0 +1,412 @@
+#=========================================================
+#   BENCHMARK DAS CENAS (SEM JANELA, SDL DUMMY)
+#=========================================================
+
+"""
+Roda cada cena do jogo por um número fixo de frames, em várias resoluções,
+com entrada roteirizada, e grava um JSON para comparar versões.
+
+    python -m benchmarks.run_scenes
+    python -m benchmarks.run_scenes --frames 600 --sizes 1280x720,1920x1080
+    python -m benchmarks.run_scenes --scenes main_menu,stop --out bench.json
+    python -m benchmarks.run_scenes --scenes show_do_bilhao,stop --frames 4000 --steady 600
+
+Como mede:
+- SDL_VIDEODRIVER / SDL_AUDIODRIVER = dummy: nada aparece na tela e o
+  desempenho não depende do vsync nem do compositor do sistema.
+- O pygame.time.Clock do scene_manager é trocado por BenchClock: não
+  dorme e mede o trabalho real de cada frame (evento + lógica + desenho +
+  present + fim de frame). O game_clock fica em modo stepped com o dt
+  fixo do FPS do preset, então a simulação anda igual em qualquer máquina.
+- O driver dummy não move o mouse com set_pos: pygame.mouse.get_pos
+  devolve a posição do roteiro (as cenas leem o hover por ele).
+- Preset fixo (--preset, padrão high), com o QualityGovernor desligado.
+- Entrada roteirizada e sementes fixas: o mesmo roteiro de mouse / teclas
+  em toda execução. Se a cena terminar antes (ex.: pausa tocada), ela é
+  reaberta até completar os frames.
+- Cada cena x resolução roda num processo separado: caches, memória de pico
+  (RSS) e estado global não vazam de uma medição para outra.
+- Os primeiros --warmup frames (carregamento de assets) ficam fora dos
+  percentis e dos contadores; o tempo deles sai em "warmup_ms".
+
+Por cena: percentis do frame (p50/p95/p99, média e máximo), fases da
+instrumentação (src/instrumentation.py), alocações no período medido
+(superfícies, renders de texto, escalas, blits) e RSS de pico.
+
+Regime permanente: "sprite_cache" traz as surfaces que o cache de carimbos
+criou no período medido, o último frame que alocou e quantos frames
+seguidos, no fim, não alocaram nada (sprite_cache.allocations_last_frame()
+== 0). Com --steady N, o processo sai com código 1 se alguma cena ainda
+alocava nos últimos N frames ou se a roleta gerou algum quadro girado na
+hora do desenho ("wheel_misses" > 0 no período medido).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import pygame
+
+SCENES = [
+    "main_menu",
+    "escolher_modo",
+    "show_do_bilhao",
+    "batalha_naval",
+    "maleta_certa",
+    "roleta_risco",
+    "perseguicao",
+    "stop",
+    "cutscene_intro",
+    "cutscene_final",
+    "show_pause_screen",
+    "start_game_loop",
+]
+
+DEFAULT_SIZES = "1024x600,1280x720,1920x1080"
+DEFAULT_FRAMES = 300
+DEFAULT_WARMUP = 30
+SEED = 1234
+
+# Arquivos que as cenas gravam (configurações): restaurados no fim
+WRITTEN_FILES = [os.path.join(BASE_DIR, "settings.json")]
+
+# Teclas do roteiro (nada de ESC: a pausa é medida à parte)
+SCRIPT_KEYS = [pygame.K_SPACE, pygame.K_RETURN, pygame.K_a, pygame.K_e,
+               pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN]
+
+
+class _Done(BaseException):
+    """Fim da medição (BaseException: os loops das cenas não engolem)."""
+
+
+def _parse_size(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def _scene(name, screen):
+    """Corrotina (ou Scene) de cada cena medida."""
+    from src import core, game_modo, cutscene_intro, cutscene_final, utils, game_loop
+    from src.minigames import show_do_bilhao, batalha_naval, maleta_certa, roleta_risco, perseguicao, stop
+    factories = {
+        "main_menu": lambda: core.main_menu(screen),
+        "escolher_modo": lambda: game_modo.escolher_modo(screen),
+        "show_do_bilhao": lambda: show_do_bilhao.run_show_do_bilhao(screen),
+        "batalha_naval": lambda: batalha_naval.run_batalha_naval(screen),
+        "maleta_certa": lambda: maleta_certa.run_maleta_certa(screen),
+        "roleta_risco": lambda: roleta_risco.roleta_risco(screen, seed=SEED),
+        "perseguicao": lambda: perseguicao.run_perseguicao(screen),
+        "stop": lambda: stop.run_stop(screen),
+        "cutscene_intro": lambda: cutscene_intro.run_cutscene_intro(screen),
+        "cutscene_final": lambda: cutscene_final.run_cutscene_final(screen, 300),
+        "show_pause_screen": lambda: utils.show_pause_screen(screen, "Pausa", "Pontuação: 300", theme="STOP"),
+        "start_game_loop": lambda: game_loop.start_game_loop(screen),
+    }
+    return factories[name]()
+
+
+# ---------------------------------------------------------
+# ENTRADA ROTEIRIZADA
+# ---------------------------------------------------------
+class InputScript:
+    """Mouse em trajetória fixa, cliques e teclas em intervalos fixos."""
+
+    MOVE_EVERY = 4
+    CLICK_EVERY = 45
+    KEY_EVERY = 60
+
+    def __init__(self, size, seed=SEED):
+        self.size = size
+        self.rng = random.Random(seed)
+        self.mouse = (0, 0)
+
+    def _point(self):
+        w, h = self.size
+        return self.rng.randint(0, w - 1), self.rng.randint(0, h - 1)
+
+    def post(self, frame):
+        if frame % self.MOVE_EVERY == 0:
+            pos = self.mouse = self._point()
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(1, 1), buttons=(0, 0, 0)))
+        if frame % self.CLICK_EVERY == 0:
+            pos = self.mouse = self._point()
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(1, 1), buttons=(0, 0, 0)))
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1))
+        if frame % self.KEY_EVERY == 0:
+            key = self.rng.choice(SCRIPT_KEYS)
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, scancode=0,
+                                                 unicode=pygame.key.name(key) if key < 256 else ""))
+
+
+# ---------------------------------------------------------
+# RELÓGIO DE BENCHMARK
+# ---------------------------------------------------------
+class BenchClock:
+    """Substitui o pygame.time.Clock: sem espera, mede o trabalho do frame."""
+
+    # Preenchidos pelo _measure antes de cada execução
+    frames = 0
+    total = 0
+    warmup = 0
+    script = None
+    samples = []
+    warmup_ms = 0.0
+    on_warm = None
+    stamp_allocs = []   # sprite_cache.allocations_last_frame() por frame medido
+    stamps = None       # a própria sprite_cache.allocations_last_frame
+
+    def __init__(self):
+        self._last = time.perf_counter()
+        self._work = 0.0
+
+    def tick(self, fps=0):
+        cls = BenchClock
+        now = time.perf_counter()
+        self._work = (now - self._last) * 1000
+        self._last = now
+
+        cls.frames += 1
+        if cls.frames <= cls.warmup:
+            cls.warmup_ms += self._work
+            if cls.frames == cls.warmup and cls.on_warm:
+                cls.on_warm()
+        else:
+            cls.samples.append(self._work)
+            # end_frame() do sprite_cache roda antes do tick: é o frame que acabou
+            cls.stamp_allocs.append(cls.stamps())
+        if cls.frames >= cls.total:
+            raise _Done()
+
+        cls.script.post(cls.frames)
+        # O próximo tick começa a contar daqui (sem o tempo de postar eventos)
+        self._last = time.perf_counter()
+        return self._work
+
+    def get_time(self):
+        return self._work
+
+    def get_rawtime(self):
+        return self._work
+
+    def get_fps(self):
+        return 1000.0 / self._work if self._work > 0 else 0.0
+
+
+def _peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _steady(allocs):
+    """Alocações do sprite_cache no período e frames finais sem alocar."""
+    last = max((i for i, n in enumerate(allocs) if n), default=None)
+    return {
+        "allocations": sum(allocs),
+        "last_allocation_frame": last,
+        "steady_frames": len(allocs) if last is None else len(allocs) - 1 - last,
+        "allocations_last_frame": allocs[-1] if allocs else 0,
+    }
+
+
+def _summary(values):
+    from src import instrumentation
+    info = instrumentation.percentiles(values)
+    info["mean"] = sum(values) / len(values) if values else 0.0
+    info["max"] = max(values) if values else 0.0
+    return {k: round(v, 4) for k, v in info.items()}
+
+
+# ---------------------------------------------------------
+# UMA MEDIÇÃO (processo filho)
+# ---------------------------------------------------------
+def _measure(scene, size, frames, warmup, preset):
+    from src import performance, instrumentation, sprite_cache
+    from src.game_clock import game_clock
+    from src.input_manager import input_manager
+    from src.scene_manager import scene_manager
+
+    random.seed(SEED)
+    pygame.init()
+    screen = pygame.display.set_mode(size)
+    input_manager.init()
+    performance.force_preset(preset)
+
+    # Botão "Sair" clicado pelo roteiro: a cena reabre em vez de matar o pygame
+    pygame.quit = lambda: None
+    pygame.time.Clock = BenchClock
+
+    BenchClock.frames = 0
+    BenchClock.total = warmup + frames
+    BenchClock.warmup = warmup
+    game_clock.set_mode("stepped", step_ms=1000.0 / performance.target_fps())
+    BenchClock.script = InputScript(size)
+    pygame.mouse.get_pos = lambda: BenchClock.script.mouse
+    BenchClock.samples = []
+    BenchClock.stamp_allocs = []
+    BenchClock.stamps = sprite_cache.allocations_last_frame
+    BenchClock.warmup_ms = 0.0
+    BenchClock.on_warm = instrumentation.reset
+
+    instrumentation.enable()
+    restarts = -1
+    while True:
+        restarts += 1
+        try:
+            asyncio.run(scene_manager.run(_scene(scene, screen)))
+        except _Done:
+            break
+        except SystemExit:
+            pass
+        screen = pygame.display.get_surface()
+
+    report = instrumentation.report()
+    counters = report["counters"]
+    measured = max(1, len(BenchClock.samples))
+    return {
+        "scene": scene,
+        "size": list(size),
+        "preset": preset,
+        "frames": len(BenchClock.samples),
+        "restarts": restarts,
+        "warmup_ms": round(BenchClock.warmup_ms, 3),
+        "frame_ms": _summary(BenchClock.samples),
+        "phases": {name: {phase: {k: round(v, 4) for k, v in pct.items()} for phase, pct in phases.items()}
+                   for name, phases in report["scenes"].items()},
+        "allocations": {
+            "surfaces": counters.get("surfaces", 0),
+            "text_renders": counters.get("text_renders", 0),
+            "scales": counters.get("scales", 0),
+            "blits": counters.get("blits", 0),
+            "wheel_misses": counters.get("wheel_misses", 0),
+            "surfaces_per_frame": round(counters.get("surfaces", 0) / measured, 4),
+            "text_renders_per_frame": round(counters.get("text_renders", 0) / measured, 4),
+        },
+        "sprite_cache": _steady(BenchClock.stamp_allocs),
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+# ---------------------------------------------------------
+# PROCESSO PRINCIPAL
+# ---------------------------------------------------------
+def _run_child(scene, size, args):
+    cmd = [sys.executable, "-m", "benchmarks.run_scenes", "--child",
+           "--scenes", scene, "--sizes", f"{size[0]}x{size[1]}",
+           "--frames", str(args.frames), "--warmup", str(args.warmup), "--preset", args.preset]
+    proc = subprocess.run(cmd, cwd=BASE_DIR, capture_output=True, text=True)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return {"scene": scene, "size": list(size), "error": (proc.stderr or proc.stdout).strip()[-2000:]}
+
+
+def _backup(paths):
+    saved = {}
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                saved[path] = f.read()
+        except OSError:
+            saved[path] = None
+    return saved
+
+
+def _restore(saved):
+    for path, data in saved.items():
+        if data is None:
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das cenas do Party Pascal (SDL dummy).")
+    parser.add_argument("--scenes", default=",".join(SCENES), help="cenas separadas por vírgula")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="resoluções LxA separadas por vírgula")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="frames medidos por cena")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="frames descartados no início")
+    parser.add_argument("--preset", default="high", choices=["low", "medium", "high"])
+    parser.add_argument("--out", help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--steady", type=int, default=0,
+                        help="falha se o sprite_cache alocou nos últimos N frames de alguma cena "
+                             "ou se a roleta gerou quadros na hora do desenho")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    scenes = [s for s in args.scenes.split(",") if s]
+    sizes = [_parse_size(s) for s in args.sizes.split(",") if s]
+    unknown = [s for s in scenes if s not in SCENES]
+    if unknown:
+        parser.error(f"cenas desconhecidas: {', '.join(unknown)}")
+
+    if args.child:
+        print(json.dumps(_measure(scenes[0], sizes[0], args.frames, args.warmup, args.preset)))
+        return 0
+
+    saved = _backup(WRITTEN_FILES)
+    results = []
+    unsteady = 0
+    try:
+        for size in sizes:
+            for scene in scenes:
+                result = _run_child(scene, size, args)
+                results.append(result)
+                if "error" in result:
+                    print(f"✗ {scene:18s} {size[0]}x{size[1]}  ERRO", file=sys.stderr)
+                else:
+                    ms = result["frame_ms"]
+                    steady = result["sprite_cache"]["steady_frames"]
+                    misses = result["allocations"]["wheel_misses"]
+                    ok = steady >= args.steady and not (args.steady and misses)
+                    unsteady += not ok
+                    print(f"{'✓' if ok else '✗'} {scene:18s} {size[0]}x{size[1]}  p50 {ms['p50']:.2f}  p95 {ms['p95']:.2f}  "
+                          f"p99 {ms['p99']:.2f} ms  rss {result['peak_rss_kb']} KB  "
+                          f"carimbos: {steady} frames sem alocar  roleta: {misses} misses", file=sys.stderr)
+    finally:
+        _restore(saved)
+
+    output = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "sdl": ".".join(str(v) for v in pygame.get_sdl_version()),
+            "platform": platform.platform(),
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "preset": args.preset,
+            "seed": SEED,
+            "steady": args.steady,
+        },
+        "results": results,
+    }
+    text = json.dumps(output, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if unsteady or any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
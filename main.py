@@ -11,11 +11,25 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.core import main_menu
 from src.performance import is_mobile_like
+from src import calibration, instrumentation, replay
+from src.game_clock import game_clock
+from src.input_manager import input_manager
+from src.scene_manager import scene_manager
 
 # 2. A FUNÇÃO PRINCIPAL AGORA É 'ASYNC'
 async def main():
     # Inicializa o Pygame
     pygame.init()
+    input_manager.init()  # Filtra a fila de eventos antes do primeiro frame
+
+    # Medição por frame (src/instrumentation.py), ligada por variável de ambiente
+    instrumentation.enable_from_env()
+    input_manager.add_quit_hook(instrumentation.disable)
+
+    # Relógio do jogo (src/game_clock.py): real, acelerado ou em passos fixos
+    game_clock.configure_from_env()
+
+    input_manager.add_quit_hook(replay.stop)
     
     # Detecta o ambiente
     # Dica: No Pygbag (Web), o sistema muitas vezes é identificado como 'emscripten'
@@ -37,18 +51,24 @@ async def main():
         screen = pygame.display.set_mode(default_size, pygame.RESIZABLE)
         print(f"💻 Modo PC Detectado: Janela {default_size}")
 
+    # Gravação / replay de sessão (src/replay.py), também por variável de ambiente.
+    # O replay volta ao tamanho de janela, limites do aparelho e modo de
+    # relógio da gravação, e não calibra
+    if not replay.replay_from_env():
+        # Primeiro uso (ou perfil de outra versão): mede o aparelho antes do menu
+        calibrated = calibration.load_profile() is None
+        if calibrated:
+            await scene_manager.run(calibration.run_calibration(screen))
+        # A gravação começa com a janela e o perfil já definidos
+        replay.record_from_env(calibrated)
+
     # ------------------------------------------------------------------
     # 3. CHAMADA DO MENU (O PONTO CRÍTICO)
-    # Como o main_menu provavelmente tem um loop (while), ele também
-    # precisa ser async ou você precisa garantir que o loop dele tenha
-    # o await asyncio.sleep(0).
+    # O scene_manager tem o único loop de frames do jogo (clock, flip e o
+    # asyncio.sleep(0) da web); as outras cenas são empilhadas por cima
+    # do menu.
     # ------------------------------------------------------------------
-    
-    # Se você alterou o main_menu para ser 'async def main_menu...', use:
-    await main_menu(screen)
-    
-    # Se o main_menu NÃO for async, o jogo vai rodar, mas pode travar
-    # se não houver o asyncio.sleep(0) lá dentro.
+    await scene_manager.run(main_menu(pygame.display.get_surface()))
 
 if __name__ == "__main__":
     # 4. EXECUÇÃO COM ASYNCIO
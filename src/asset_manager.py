@@ -0,0 +1,148 @@
+#=========================================================
+#   GERENCIADOR CENTRAL DE IMAGENS
+#=========================================================
+
+"""
+AssetManager – carrega cada imagem do disco uma única vez
+----------------------------------------------------------
+- load(): lê o arquivo, converte para o formato da tela (convert /
+  convert_alpha) e guarda o original para sempre.
+- scaled(): variantes redimensionadas por (arquivo, tamanho, filtro), em
+  LRU com orçamento de memória. Redimensionar a janela ou apertar F11 volta
+  a um tamanho já visto sem tocar no disco nem reescalar.
+- scale_surface(): o mesmo cache para superfícies geradas em código
+  (substitui o antigo _scaled_cache do performance, que era por id() e
+  nunca esvaziava).
+
+As superfícies devolvidas são compartilhadas: não altere (set_alpha, fill,
+blit sobre elas). Faça .copy() antes, se precisar.
+"""
+
+import os
+from collections import OrderedDict
+
+import pygame
+
+from src import performance, instrumentation, image_ops
+
+# Orçamento das variantes escaladas (bytes). Os originais não contam.
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def _surface_bytes(surf):
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+class _AssetManager:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._originals = {}
+        self._scaled = OrderedDict()
+        self._bytes = 0
+        self._stats = {"loads": 0, "hits": 0, "misses": 0, "evicted": 0}
+
+    # ==========================================================
+    # ORIGINAIS
+    # ==========================================================
+    def load(self, path, alpha=False):
+        """Imagem original convertida, ou None se o arquivo não existir."""
+        key = (path, alpha)
+        if key in self._originals:
+            return self._originals[key]
+
+        surf = None
+        if path and os.path.exists(path):
+            try:
+                with instrumentation.timer("asset_load"):
+                    raw = pygame.image.load(path)
+                    surf = raw.convert_alpha() if alpha else raw.convert()
+                instrumentation.count("surfaces")
+                self._stats["loads"] += 1
+            except Exception as e:
+                print(f"[AssetManager] Erro ao carregar {path}: {e}")
+                surf = None
+
+        self._originals[key] = surf
+        return surf
+
+    # ==========================================================
+    # VARIANTES ESCALADAS (LRU)
+    # ==========================================================
+    def scaled(self, path, size, filter="smooth", alpha=False):
+        """Imagem de `path` no tamanho `size`, ou None se o arquivo não existir."""
+        source = self.load(path, alpha)
+        if source is None:
+            return None
+        return self._get_scaled((path, alpha), source, size, filter)
+
+    def scale_surface(self, surface, size, filter="auto"):
+        """Cache de escala para superfícies geradas em código."""
+        return self._get_scaled(surface, surface, size, filter)
+
+    def _get_scaled(self, source_key, source, size, filter):
+        size = (max(1, int(size[0])), max(1, int(size[1])))
+        if size == source.get_size():
+            return source
+
+        if filter == "auto":
+            filter = "smooth" if performance.supports_smoothscale() else "fast"
+
+        key = (source_key, size, filter)
+        surf = self._scaled.get(key)
+        if surf is not None:
+            self._scaled.move_to_end(key)
+            self._stats["hits"] += 1
+            return surf
+
+        self._stats["misses"] += 1
+        instrumentation.count("scales")
+        if filter == "smooth":
+            try:
+                surf = image_ops.smoothscale(source, size)
+            except (ValueError, pygame.error):
+                # smoothscale só aceita 24/32 bits
+                surf = image_ops.scale(source, size)
+        else:
+            surf = image_ops.scale(source, size)
+
+        self._scaled[key] = surf
+        self._bytes += _surface_bytes(surf)
+        while self._bytes > self.max_bytes and len(self._scaled) > 1:
+            _, old = self._scaled.popitem(last=False)
+            self._bytes -= _surface_bytes(old)
+            self._stats["evicted"] += 1
+        return surf
+
+    def scaled_to_height(self, path, height, filter="smooth", alpha=False):
+        """Atalho para sprites: mantém a proporção do original."""
+        source = self.load(path, alpha)
+        if source is None:
+            return None
+        ratio = source.get_width() / source.get_height()
+        return self.scaled(path, (int(height * ratio), int(height)), filter, alpha)
+
+    def scaled_to_width(self, path, width, filter="smooth", alpha=False):
+        source = self.load(path, alpha)
+        if source is None:
+            return None
+        ratio = source.get_height() / source.get_width()
+        return self.scaled(path, (int(width), int(width * ratio)), filter, alpha)
+
+    # ==========================================================
+    # CONTADORES
+    # ==========================================================
+    def stats(self):
+        info = dict(self._stats)
+        info["originals"] = len(self._originals)
+        info["scaled"] = len(self._scaled)
+        info["bytes"] = self._bytes
+        return info
+
+    def clear(self):
+        self._originals.clear()
+        self._scaled.clear()
+        self._bytes = 0
+
+
+# Singleton
+asset_manager = _AssetManager()
@@ -0,0 +1,244 @@
+#=========================================================
+#   CALIBRAÇÃO DO APARELHO (PERFIL DE DESEMPENHO)
+#=========================================================
+
+"""
+Calibração curta no primeiro uso (ou pelo menu de configurações).
+
+Em vez de adivinhar o preset pelo tamanho da tela, mede no próprio aparelho
+as cargas que mais pesam num frame do jogo:
+
+- blit de um fundo do tamanho da tela;
+- smoothscale de um fundo (o que acontece ao abrir cena / F11);
+- N partículas com alpha (carimbos do sprite_cache + blits);
+- render de texto sem cache;
+- rotozoom (pulso do logo, respiração do Pascal).
+
+Com os tempos, estima o custo de um frame típico em cada nível e escolhe o
+mais alto que cabe com folga no orçamento do seu FPS. Recursos que sozinhos
+já são caros viram limites do aparelho (`caps`), aplicados sobre qualquer
+nível pelo performance.set_preset (o QualityGovernor continua ajustando em
+tempo real, mas nunca passa desses limites).
+
+O perfil fica em device_profile.json, ao lado do settings.json, e é lido
+nas próximas execuções. Cada carga roda entre frames (await), para o
+navegador (pygbag) não travar e a tela mostrar o progresso.
+"""
+
+import json
+import os
+import sys
+import time
+
+import pygame
+
+from src import performance
+from src.input_manager import input_manager
+from src.particle_system import ParticleSystem
+from src.scene_manager import scene_manager
+from src.utils import load_font, draw_text
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_PATH = os.path.join(BASE_DIR, "device_profile.json")
+BG_PATH = os.path.join(BASE_DIR, "assets", "background", "background_main.png")
+
+# Muda quando as cargas ou a derivação mudam: perfis antigos são refeitos
+PROFILE_VERSION = 1
+
+# Tempo máximo de cada carga (ms) e repetições mínimas
+WORKLOAD_BUDGET_MS = 150
+MIN_RUNS = 3
+
+# Partículas medidas de uma vez
+CALIBRATION_PARTICLES = 64
+
+# Fração do orçamento do frame que o frame típico estimado pode ocupar
+FRAME_HEADROOM = 0.5
+
+# Acima disso o recurso vira limite do aparelho (ms por chamada)
+SMOOTHSCALE_MAX_MS = 40.0
+ROTOZOOM_MAX_MS = 2.0
+
+# Fração do orçamento do frame reservada às partículas
+PARTICLE_SHARE = 0.2
+
+# Composição de um frame típico (blits de tela cheia, textos novos por frame)
+FULL_BLITS_PER_FRAME = 3
+TEXTS_PER_FRAME = 4
+
+
+# ---------------------------------------------------------
+# PERFIL EM DISCO
+# ---------------------------------------------------------
+def load_profile(path=PROFILE_PATH):
+    """Lê e aplica o perfil salvo. Devolve o perfil ou None se precisar calibrar."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    except Exception:
+        return None
+    if profile.get("version") != PROFILE_VERSION or profile.get("platform") != sys.platform:
+        return None
+    performance.apply_profile(profile)
+    return profile
+
+
+def save_profile(profile, path=PROFILE_PATH):
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+        # Na web (pygbag) o arquivo fica no sistema de arquivos virtual, como o settings.json
+    except Exception as e:
+        print("⚠ Erro ao salvar perfil do aparelho:", e)
+
+
+# ---------------------------------------------------------
+# CARGAS
+# ---------------------------------------------------------
+def _time_workload(fn, budget_ms=WORKLOAD_BUDGET_MS):
+    """Mediana (ms) de `fn()` repetida até estourar o orçamento."""
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < MIN_RUNS or (time.perf_counter() - start) * 1000 < budget_ms:
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+        if len(samples) >= 200:
+            break
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def _background(size):
+    try:
+        return pygame.image.load(BG_PATH).convert()
+    except Exception:
+        surf = pygame.Surface((max(1, size[0] * 2), max(1, size[1] * 2)))
+        surf.fill((30, 30, 45))
+        return surf
+
+
+def _workloads(screen):
+    """Lista de (nome, função) medidas uma por frame."""
+    w, h = screen.get_size()
+    bg = _background((w, h))
+    full = pygame.transform.scale(bg, (w, h))
+
+    particles = ParticleSystem(
+        CALIBRATION_PARTICLES,
+        palette=[(255, 215, 0), (100, 200, 255)],
+        spawn={"x": (0, w), "y": (0, h), "size": [2, 3, 4, 5], "alpha": (60, 255), "vy": (-80, -20)},
+    )
+
+    # Fonte do jogo, mas render direto (sem o cache do text_cache)
+    font = load_font(max(12, int(h * 0.04)))
+    counter = [0]
+
+    def text():
+        counter[0] += 1
+        font.render(f"Pontuação: {counter[0]} - Governança de TI", True, (255, 255, 255))
+
+    logo = pygame.Surface((max(1, w // 3), max(1, h // 5)), pygame.SRCALPHA)
+    logo.fill((255, 215, 0, 200))
+
+    def particles_frame():
+        particles.step(1 / 60)
+        particles.draw(screen)
+
+    return [
+        ("blit_full", lambda: screen.blit(full, (0, 0))),
+        ("smoothscale_bg", lambda: pygame.transform.smoothscale(bg, (w, h))),
+        ("particles", particles_frame),
+        ("text", text),
+        ("rotozoom", lambda: pygame.transform.rotozoom(logo, 0, 1.03)),
+    ]
+
+
+# ---------------------------------------------------------
+# DERIVAÇÃO DO PERFIL
+# ---------------------------------------------------------
+def estimate_frame_ms(timings, preset):
+    """Custo estimado de um frame típico com os valores de `preset`."""
+    per_particle = timings["particles"] / CALIBRATION_PARTICLES
+    cost = timings["blit_full"] * FULL_BLITS_PER_FRAME
+    cost += timings["text"] * TEXTS_PER_FRAME
+    cost += per_particle * preset["particles"]
+    if preset["use_rotozoom"]:
+        cost += timings["rotozoom"]
+    return cost
+
+
+def derive_profile(timings, screen_size):
+    caps = {}
+    if timings["smoothscale_bg"] > SMOOTHSCALE_MAX_MS:
+        caps["use_smoothscale"] = False
+    if timings["rotozoom"] > ROTOZOOM_MAX_MS:
+        caps["use_rotozoom"] = False
+
+    # Nível mais alto cujo frame estimado cabe no orçamento do seu FPS
+    chosen = performance.LEVELS[0]
+    for name in performance.LEVELS:
+        preset = dict(performance.PRESETS[name])
+        for key, cap in caps.items():
+            preset[key] = preset[key] and cap
+        budget = 1000.0 / preset["fps"]
+        if estimate_frame_ms(timings, preset) <= budget * FRAME_HEADROOM:
+            chosen = name
+
+    # Teto de partículas: o que cabe na fatia do orçamento do nível escolhido
+    per_particle = timings["particles"] / CALIBRATION_PARTICLES
+    if per_particle > 0:
+        budget = 1000.0 / performance.PRESETS[chosen]["fps"]
+        cap = int(budget * PARTICLE_SHARE / per_particle)
+        if cap < performance.PRESETS["high"]["particles"]:
+            caps["particles"] = max(8, cap)
+
+    return {
+        "version": PROFILE_VERSION,
+        "platform": sys.platform,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "screen": list(screen_size),
+        "timings": {k: round(v, 4) for k, v in timings.items()},
+        "preset": chosen,
+        "caps": caps,
+    }
+
+
+# ---------------------------------------------------------
+# CENA DE CALIBRAÇÃO
+# ---------------------------------------------------------
+def _draw_progress(screen, done, total, label):
+    w, h = screen.get_size()
+    screen.fill((15, 15, 30))
+    draw_text(screen, "Calibrando desempenho...", load_font(int(h * 0.06)), (255, 215, 0), (w // 2, int(h * 0.42)), shadow=True)
+
+    bar = pygame.Rect(0, 0, int(w * 0.5), max(8, int(h * 0.03)))
+    bar.center = (w // 2, int(h * 0.52))
+    pygame.draw.rect(screen, (60, 60, 80), bar, border_radius=6)
+    fill = bar.copy()
+    fill.width = int(bar.width * done / max(1, total))
+    pygame.draw.rect(screen, (100, 200, 255), fill, border_radius=6)
+
+    draw_text(screen, label, load_font(int(h * 0.035)), (200, 200, 200), (w // 2, int(h * 0.60)))
+
+
+async def run_calibration(screen, save=True):
+    """Mede o aparelho, aplica e salva o perfil. Devolve o perfil."""
+    workloads = _workloads(screen)
+    timings = {}
+
+    for i, (name, fn) in enumerate(workloads):
+        _draw_progress(screen, i, len(workloads), name)
+        await scene_manager.frame()
+        input_manager.poll()  # mantém a janela respondendo (fechar / F11)
+        screen = pygame.display.get_surface()
+        timings[name] = _time_workload(fn)
+
+    profile = derive_profile(timings, screen.get_size())
+    performance.apply_profile(profile)
+    if save:
+        save_profile(profile)
+
+    _draw_progress(screen, len(workloads), len(workloads), f"Perfil: {profile['preset']}")
+    await scene_manager.wait(400)
+    return profile
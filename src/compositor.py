@@ -0,0 +1,90 @@
+#=========================================================
+#   COMPOSITOR DE CAMADAS REUTILIZÁVEIS
+#=========================================================
+
+"""
+Camadas nomeadas que vivem entre frames.
+
+Os minigames desenham a interface numa Surface SRCALPHA do tamanho da tela
+para depois blitar com o deslocamento do shake. Criar essa Surface a cada
+frame custa ~8 MB de alocação por frame em 1080p. Aqui cada camada é
+criada uma vez por resolução e só é limpa (fill transparente, que é
+barato) antes de redesenhar.
+
+Quando a camada recebe uma `key` e ela é igual à do frame anterior, begin()
+devolve None e o conteúdo antigo é reaproveitado sem redesenhar:
+
+    hud = layers.begin("hud", key=(score, msg))
+    if hud is not None:
+        ...desenha em hud...
+    layers.blit(screen, "hud", (shake_x, shake_y))
+"""
+
+import pygame
+
+from src import image_ops
+
+_CLEAR = (0, 0, 0, 0)
+
+
+class Layer:
+    def __init__(self, size):
+        self.surface = image_ops.new_surface(size, pygame.SRCALPHA)
+        self.key = None
+
+
+class Compositor:
+    def __init__(self, size):
+        self.size = tuple(size)
+        self._layers = {}
+        self.allocations = 0
+        self.redraws = 0
+        self.skips = 0
+
+    def resize(self, size):
+        """Nova resolução: as camadas são recriadas no próximo begin()."""
+        size = tuple(size)
+        if size != self.size:
+            self.size = size
+            self._layers.clear()
+
+    def begin(self, name, key=None, size=None):
+        """Camada limpa para desenhar, ou None se `key` não mudou."""
+        size = tuple(size) if size else self.size
+        layer = self._layers.get(name)
+        if layer is None or layer.surface.get_size() != size:
+            layer = self._layers[name] = Layer(size)
+            self.allocations += 1
+        elif key is not None and key == layer.key:
+            self.skips += 1
+            return None
+        else:
+            layer.surface.fill(_CLEAR)
+
+        layer.key = key
+        self.redraws += 1
+        return layer.surface
+
+    def get(self, name):
+        layer = self._layers.get(name)
+        return layer.surface if layer else None
+
+    def invalidate(self, name=None):
+        """Força redesenho (ex.: fonte ou tema mudou sem mudar a key)."""
+        layers = self._layers.values() if name is None else [self._layers.get(name)]
+        for layer in layers:
+            if layer is not None:
+                layer.key = None
+
+    def blit(self, target, name, offset=(0, 0)):
+        layer = self._layers.get(name)
+        if layer is not None:
+            image_ops.blit(target, layer.surface, offset)
+
+    def stats(self):
+        return {
+            "layers": len(self._layers),
+            "allocations": self.allocations,
+            "redraws": self.redraws,
+            "skips": self.skips,
+        }
@@ -2,12 +2,9 @@
 #                          MENU PRINCIPAL (WEB READY)
 #========================================================================
 
-import asyncio  # <--- 1. Import essencial para Web
 import pygame
-import sys
 import os
 import math
-import random
 import json
 
 # Nota: As funções importadas abaixo também precisarão ser convertidas para 'async'
@@ -17,6 +14,13 @@ from src.utils import load_font
 from src.cutscene_intro import run_cutscene_intro
 from src.settings_menu import run_settings_menu
 from src.audio_manager import audio_manager
+from src import performance, instrumentation
+from src.input_manager import input_manager
+from src.scene_manager import scene_manager, TICK, ease_per_tick
+from src.game_clock import game_clock
+from src.asset_manager import asset_manager
+from src import image_ops
+from src.particle_system import ParticleSystem
 
 # --------------------------------------------------
 # Config / paths
@@ -24,6 +28,10 @@ from src.audio_manager import audio_manager
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SETTINGS_PATH = os.path.join(BASE_DIR, "settings.json")
 
+# Animação do menu (ajustada a 60 FPS: 0.18 por frame / 10 de alpha por frame)
+BUTTON_EASE = ease_per_tick(0.18)
+FADE_SPEED = 600          # alpha/s
+
 def load_settings():
     defaults = {"music_volume": 0.5, "fx_volume": 1.0, "fullscreen": False}
     try:
@@ -40,34 +48,26 @@ def load_settings():
 
 
 # --------------------------------------------------
-# Menu particle (leve e cheap)
+# Menu particles (leve e cheap, NumPy)
 # --------------------------------------------------
-class MenuParticle:
-    __slots__ = ("w","x","y","r","alpha","speed","dir")
-    def __init__(self, w, h):
-        self.w = max(1, w)
-        self.reset(h)
-
-    def reset(self, h):
-        self.x = random.uniform(0, self.w)
-        self.y = random.uniform(0, h)
-        self.r = random.uniform(2, 4)
-        self.alpha = random.randint(40, 130)
-        self.speed = random.uniform(0.3, 0.9)
-        self.dir = random.choice([-1, 1])
-
-    def update(self, dt, w, h):
-        # dt is ms from clock.tick
-        self.y -= self.speed * dt * 0.05
-        self.x += math.sin(self.y * 0.01) * 0.4 * self.dir
-        if self.y < -10:
-            self.reset(h)
-            self.y = h + random.uniform(20, 80)
-
-    def draw(self, surf):
-        s = pygame.Surface((int(self.r*2), int(self.r*2)), pygame.SRCALPHA)
-        pygame.draw.circle(s, (255,255,255,int(self.alpha)), (int(self.r), int(self.r)), int(self.r))
-        surf.blit(s, (int(self.x), int(self.y)))
+def menu_particles(w, h):
+    w = max(1, w)
+    return ParticleSystem(
+        performance.particle_count(32),
+        palette=[(255, 255, 255)],
+        bounds=(-math.inf, -10, math.inf, math.inf),
+        spawn={
+            "x": (0, w), "y": (0, h),
+            "size": (2, 4),
+            "alpha": (40, 130),
+            "vy": (-45, -15),
+            # balanço lateral acompanha a subida (sin(y * 0.01))
+            "sway": [-24, 24],
+            "phase": lambda ps, idx: ps.y[idx] * 0.01,
+            "sway_freq": lambda ps, idx: ps.vy[idx] * 0.01,
+        },
+        respawn={"y": (h + 20, h + 80)},
+    )
 
 
 # --------------------------------------------------
@@ -83,18 +83,9 @@ class Button:
         self.hover_color = hover_color
         self.icon = None
 
-        if icon_path and os.path.exists(icon_path):
-            try:
-                img = pygame.image.load(icon_path).convert_alpha()
-                img = pygame.transform.smoothscale(img, (44, 44))
-                white = pygame.Surface(img.get_size(), pygame.SRCALPHA)
-                for x in range(img.get_width()):
-                    for y in range(img.get_height()):
-                        r,g,b,a = img.get_at((x,y))
-                        white.set_at((x,y), (255,255,255,a))
-                self.icon = white
-            except Exception:
-                self.icon = None
+        if icon_path:
+            img = asset_manager.scaled(icon_path, (44, 44), alpha=True)
+            self.icon = image_ops.whiten(img) if img else None
 
         self.scale = 1.0
         self.target_scale = 1.0
@@ -114,17 +105,22 @@ class Button:
         self.font = font
         self._create_surfaces()
 
-    def draw(self, screen, mouse_pos, dt):
+    def update(self, mouse_pos):
+        # Um tick: desliza até o alvo e anima a escala do hover
         cx, cy = self.center
         tx, ty = self.target_center
-        cx += (tx - cx) * 0.18
-        cy += (ty - cy) * 0.18
+        cx += (tx - cx) * BUTTON_EASE
+        cy += (ty - cy) * BUTTON_EASE
         self.center = (cx, cy)
         self.rect.center = (int(cx), int(cy))
 
         hover = self.rect.collidepoint(mouse_pos)
         self.target_scale = 1.06 if hover else 1.0
-        self.scale += (self.target_scale - self.scale) * 0.18
+        self.scale += (self.target_scale - self.scale) * BUTTON_EASE
+
+    def draw(self, screen, mouse_pos):
+        cx, cy = self.center
+        hover = self.rect.collidepoint(mouse_pos)
 
         cur_w = int(self.width * self.scale)
         cur_h = int(self.height * self.scale)
@@ -140,12 +136,12 @@ class Button:
 
         if self.icon:
             icon_rect = self.icon.get_rect(center=(r.left + 38, r.centery))
-            screen.blit(self.icon, icon_rect)
+            image_ops.blit(screen, self.icon, icon_rect)
             text_rect = self.text_surf.get_rect(midleft=(icon_rect.right + 12, r.centery))
         else:
             text_rect = self.text_surf.get_rect(center=r.center)
 
-        screen.blit(self.text_surf, text_rect)
+        image_ops.blit(screen, self.text_surf, text_rect)
 
     def try_click(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -166,22 +162,15 @@ def load_assets(screen, background_path, logo_path):
     except:
         font = pygame.font.Font(None, font_size)
 
-    try:
-        bg = pygame.image.load(background_path).convert()
-        bg = pygame.transform.smoothscale(bg, (W, H))
-    except Exception:
-        bg = pygame.Surface((W,H))
+    # Originais ficam no asset_manager: F11 não relê o disco
+    bg = asset_manager.scaled(background_path, (W, H))
+    if bg is None:
+        bg = image_ops.new_surface((W,H))
         bg.fill((20,20,30))
 
-    logo = None
-    try:
-        logo_img = pygame.image.load(logo_path).convert_alpha()
-        lw = int(W * 0.35)
-        ratio = logo_img.get_height() / logo_img.get_width()
-        lh = int(lw * ratio)
-        logo = pygame.transform.smoothscale(logo_img, (lw, lh))
-    except Exception:
-        logo = pygame.Surface((int(W*0.4), int(H*0.2)))
+    logo = asset_manager.scaled_to_width(logo_path, int(W * 0.35), alpha=True)
+    if logo is None:
+        logo = image_ops.new_surface((int(W*0.4), int(H*0.2)))
         logo.fill((80,80,80))
 
     return font, bg, logo
@@ -202,7 +191,7 @@ async def main_menu(screen): # <--- 2. Definição Async
     font, background, logo = load_assets(screen, background_path, logo_path)
     W, H = screen.get_size()
 
-    particles = [MenuParticle(W, H) for _ in range(32)]
+    particles = menu_particles(W, H)
 
     base_y = int(H * 0.58)
     spacing = int(H * 0.15)
@@ -224,13 +213,10 @@ async def main_menu(screen): # <--- 2. Definição Async
     last_size = screen.get_size()
     needs_recalc = False
 
-    clock = pygame.time.Clock()
     fading = True
     fade_alpha = 255
 
     while True:
-        dt = clock.tick(60)
-
         mouse_pos = pygame.mouse.get_pos()
         W, H = screen.get_size()
 
@@ -241,83 +227,80 @@ async def main_menu(screen): # <--- 2. Definição Async
             spacing = int(H * 0.15)
             for i, b in enumerate(buttons):
                 b.update_layout((cx, base_y + i * spacing), font)
-            particles = [MenuParticle(W, H) for _ in range(32)]
+            particles = menu_particles(W, H)
             last_size = (W, H)
             needs_recalc = False
 
-        # DRAW
-        screen.blit(background, (0,0))
-
-        for p in particles:
-            p.update(dt, W, H)
-            p.draw(screen)
+        for _ in range(scene_manager.ticks):
+            for b in buttons:
+                b.update(mouse_pos)
+            if fading:
+                fade_alpha = max(0, fade_alpha - FADE_SPEED * TICK)
+        particles.advance(scene_manager.ticks, TICK)
 
-        logo_pulse = 1.0 + 0.03 * math.sin(pygame.time.get_ticks() * 0.002)
-        logo_s = pygame.transform.rotozoom(logo, 0, logo_pulse)
+        # DRAW
+        instrumentation.mark("update")
+        image_ops.blit(screen, background, (0,0))
+        particles.draw(screen, interp=scene_manager.alpha)
+
+        # Pulso do logo só com rotozoom liberado no preset atual
+        if performance.supports_rotozoom():
+            logo_pulse = 1.0 + 0.03 * math.sin(game_clock.ticks() * 0.002)
+            logo_s = image_ops.rotozoom(logo, 0, logo_pulse)
+        else:
+            logo_s = logo
         logo_rect = logo_s.get_rect(center=(W//2, int(H*0.28)))
-        screen.blit(logo_s, logo_rect)
+        image_ops.blit(screen, logo_s, logo_rect)
 
         for b in buttons:
-            b.draw(screen, mouse_pos, dt)
+            b.draw(screen, mouse_pos)
 
         # Fade-in initial
         if fading:
-            f = pygame.Surface((W,H))
-            f.fill((0,0,0))
-            f.set_alpha(fade_alpha)
-            screen.blit(f, (0,0))
-            fade_alpha = max(0, fade_alpha - 10)
+            image_ops.shade(screen, (0, 0, 0), int(fade_alpha))
             if fade_alpha == 0:
                 fading = False
+        instrumentation.mark("draw")
 
         # EVENTS
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-
-            if ev.type == pygame.KEYDOWN:
-                if ev.key == pygame.K_ESCAPE:
-                    pygame.quit(); sys.exit()
-                if ev.key == pygame.K_F11:
-                    is_full = screen.get_flags() & pygame.FULLSCREEN
-                    if is_full:
-                        screen = pygame.display.set_mode((1024, 600), pygame.RESIZABLE)
-                    else:
-                        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                    needs_recalc = True
+        for ev in input_manager.poll():
+            if ev.type == pygame.KEYDOWN and ev.key == pygame.K_ESCAPE:
+                input_manager.quit()
+
+            if ev.type == input_manager.RESIZED:
+                screen = pygame.display.get_surface()
+                needs_recalc = True
 
             for b in buttons:
                 if b.try_click(ev):
-                    pygame.display.flip()
-                    
-                    # 4. Substituição do wait(300) por sleep async
+                    # 4. Substituição do wait(300) por espera sem travar
                     # Isso evita que o navegador trave durante o delay do clique
-                    await asyncio.sleep(0.3) 
+                    await scene_manager.wait(300)
 
                     # --- INICIAR JOGO ---
                     if b.text == "Iniciar Jogo":
-                        f = pygame.Surface((W,H)); f.fill((0,0,0))
+                        f = image_ops.new_surface((W,H)); f.fill((0,0,0))
                         for a in range(0, 255, 20):
                             f.set_alpha(a)
-                            screen.blit(f,(0,0))
-                            pygame.display.flip()
+                            image_ops.blit(screen, f,(0,0))
+                            instrumentation.mark("draw")
                             # 4. Substituição do wait(10) no fade
-                            await asyncio.sleep(0.01)
+                            await scene_manager.frame()
 
                         audio_manager.fade_to_music("cutscene_intro", fade_ms=700)
                         
                         # 5. CHAMADAS COM AWAIT
                         # Nota: Você deve converter esses arquivos para async também!
-                        await run_cutscene_intro(screen)
+                        await scene_manager.call(run_cutscene_intro(screen))
 
                         from src.game_modo import escolher_modo, run_minigame_selector
                         # Assumindo que escolher_modo também será async
-                        modo = await escolher_modo(screen)
+                        modo = await scene_manager.call(escolher_modo(screen))
 
                         if modo == "campanha":
-                            await start_game_loop(screen)
+                            await scene_manager.call(start_game_loop(screen))
                         elif modo == "livre":
-                            await run_minigame_selector(screen)
+                            await scene_manager.call(run_minigame_selector(screen))
 
                         audio_manager.fade_to_music("menu", fade_ms=800)
                         needs_recalc = True
@@ -325,14 +308,12 @@ async def main_menu(screen): # <--- 2. Definição Async
                     # --- CONFIGURAÇÕES ---
                     elif b.text == "Configurações":
                         # 5. Call async
-                        await run_settings_menu(screen)
+                        await scene_manager.call(run_settings_menu(screen))
                         needs_recalc = True
 
                     # --- SAIR ---
                     elif b.text == "Sair":
-                        pygame.quit(); sys.exit()
+                        input_manager.quit()
 
-        pygame.display.flip()
-        
-        # 3. LINHA MÁGICA: Devolve controle ao navegador
-        await asyncio.sleep(0)
\ No newline at end of file
+        # 3. LINHA MÁGICA: fecha o frame e devolve controle ao navegador
+        await scene_manager.frame()
\ No newline at end of file
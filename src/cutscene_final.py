@@ -3,54 +3,47 @@
 # ===========================================================
 
 import pygame
-import sys
 import os
-import random
 import math
 from math import sin
-import asyncio  # <--- IMPORTANTE PARA WEB
 
 from src.utils import (
-    load_font, draw_text, draw_text_wrapped, draw_modern_container, 
+    load_font, draw_text, draw_modern_container, 
     fade_in, fade_out
 )
 from src.audio_manager import audio_manager
 import src.difficulty_manager as dm
+from src import performance, image_ops
+from src.scene_manager import Scene, scene_manager
+from src.game_clock import game_clock
+from src.particle_system import ParticleSystem
+from src.text_cache import render_text
+from src.typewriter import Typewriter
+from src.asset_manager import asset_manager
+from src import derived_assets
+
+# Ritmos ajustados a 60 FPS, agora em tempo simulado
+TYPE_CHAR_MS = 1000 / 60      # uma letra por frame de 60 FPS
+CREDITS_SPEED = 90            # px/s (1.5 px por frame)
 
 
 # ===========================================================
 # CLASSES E UTILITÁRIOS LOCAIS
 # ===========================================================
 
-def _blur_surface(surface, amount=10):
-    """Gera um blur rápido reduzindo e ampliando a imagem."""
-    if amount <= 1: return surface
-    w, h = surface.get_size()
-    small = pygame.transform.smoothscale(surface, (max(1, w//amount), max(1, h//amount)))
-    return pygame.transform.smoothscale(small, (w, h))
-
-class StarParticle:
+def star_particles(w, h, base):
     """Partículas sutis para o fundo (Poeira Estelar)"""
-    def __init__(self, w, h):
-        self.w, self.h = w, h
-        self.reset(first_time=True)
-
-    def reset(self, first_time=False):
-        self.x = random.randint(0, self.w)
-        if first_time: self.y = random.randint(0, self.h)
-        else: self.y = self.h + 10
-        self.speed = random.uniform(0.3, 0.9) # Velocidade lenta e calma
-        self.size = random.randint(1, 2)      # Pequenas
-        self.alpha = random.randint(80, 180)  # Transparência média
-    
-    def update(self):
-        self.y -= self.speed
-        if self.y < -10: self.reset()
-
-    def draw(self, surface):
-        s = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (255, 255, 255, int(self.alpha)), (self.size, self.size), self.size)
-        surface.blit(s, (int(self.x), int(self.y)))
+    return ParticleSystem(
+        performance.particle_count(base),
+        bounds=(-math.inf, -10, math.inf, math.inf),
+        spawn={
+            "x": (0, w), "y": (0, h),
+            "vy": (-54, -18),            # Velocidade lenta e calma
+            "size": [1, 2],              # Pequenas
+            "alpha": (80, 180),          # Transparência média
+        },
+        respawn={"y": h + 10},
+    )
 
 def draw_glowing_text(screen, text, font, center_pos, time_val):
     """Texto com efeito neon pulsante para o Game Over"""
@@ -58,23 +51,199 @@ def draw_glowing_text(screen, text, font, center_pos, time_val):
     glow_color = (200, 220, 255, max(0, min(255, glow_intensity)))
     
     # Glow (blur simulado)
-    txt_surf = font.render(text, True, glow_color)
+    txt_surf = render_text(font, text, glow_color[:3])
     rect = txt_surf.get_rect(center=center_pos)
     for off in [2, -2]:
-        screen.blit(txt_surf, (rect.x + off, rect.y))
-        screen.blit(txt_surf, (rect.x, rect.y + off))
+        image_ops.blit(screen, txt_surf, (rect.x + off, rect.y))
+        image_ops.blit(screen, txt_surf, (rect.x, rect.y + off))
         
     # Texto Sólido
-    main_surf = font.render(text, True, (255, 255, 255))
-    screen.blit(main_surf, rect)
+    main_surf = render_text(font, text, (255, 255, 255))
+    image_ops.blit(screen, main_surf, rect)
+
+
+# ===========================================================
+# ATOS (CENAS DA PILHA)
+# ===========================================================
+
+class PascalAct(Scene):
+    """Ato 1: Pascal comenta o resultado; termina com um clique."""
+
+    def __init__(self, bg, pascal_path, title, body, font_title, font_body):
+        super().__init__()
+        self.bg = bg
+        self.pascal_path = pascal_path
+        self.has_pascal = asset_manager.load(pascal_path, alpha=True) is not None
+        self.title = title
+        self.font_title = font_title
+        self.typer = Typewriter(body, font_body, (255, 255, 255), align="center")
+
+    def handle_event(self, ev):
+        if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
+            audio_manager.play_sfx_if_exists("click")
+            self.finish() # Próximo ato
+
+    def update(self, dt):
+        self.typer.update(dt * 1000, TYPE_CHAR_MS)
+
+    def draw(self, screen):
+        W, H = screen.get_size()
+        image_ops.blit(screen, self.bg.surface, (0,0))
+
+        # Pascal
+        if self.has_pascal:
+            h_target = int(H * 0.85)
+            pas_scaled = asset_manager.scaled_to_height(self.pascal_path, h_target, alpha=True)
+            image_ops.blit(screen, pas_scaled, (int(W * 0.05), H - h_target))
+
+        # Caixa de Texto
+        d_rect = pygame.Rect(W * 0.1, H * 0.65, W * 0.8, H * 0.3)
+        draw_modern_container(screen, d_rect)
+
+        # Título Pascal
+        draw_text(screen, self.title, self.font_title, (255, 215, 0), (d_rect.centerx, d_rect.y + 30))
+
+        # Typewriter
+        self.typer.draw(screen, d_rect.inflate(-40, -80))
+
+
+class ScoreAct(Scene):
+    """Ato 2: placar final com a dificuldade e uma frase; termina com um clique."""
+
+    def __init__(self, screen, final_score, diff, motivacao, fonts):
+        super().__init__()
+        self.final_score = final_score
+        self.diff = diff
+        self.motivacao = motivacao
+        self.font_title, self.font_huge, self.font_body, self.font_small = fonts
+        # Partículas do Ato 2 (Poucas: ~25)
+        self.particles = star_particles(screen.get_width(), screen.get_height(), 25)
+
+    def handle_event(self, ev):
+        if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
+            audio_manager.play_sfx_if_exists("click")
+            self.finish()
+
+    def update(self, dt):
+        self.particles.step(dt)
+
+    def draw(self, screen):
+        screen.fill((10, 15, 25)) # Fundo sóbrio
+
+        # Partículas AO FUNDO
+        self.particles.draw(screen, interp=scene_manager.alpha)
+
+        W, H = screen.get_size()
+        cx, cy = W//2, H//2
+
+        # Títulos
+        draw_text(screen, "PONTUAÇÃO FINAL DO JOGADOR", self.font_title, (200, 200, 200), (cx, cy - 120))
+
+        # Score Gigante
+        draw_text(screen, str(self.final_score), self.font_huge, (255, 215, 0), (cx, cy), shadow=True)
+
+        # Detalhes
+        draw_text(screen, f"Dificuldade: {self.diff.upper()}", self.font_body, (100, 200, 255), (cx, cy + 80))
+        draw_text(screen, f'"{self.motivacao}"', self.font_body, (150, 150, 150), (cx, cy + 140))
+
+        # Aviso
+        blink = abs(sin(game_clock.ticks() * 0.005)) * 255
+        btn_txt = render_text(self.font_small, "Toque para continuar", (255, 255, 255), alpha=blink)
+        image_ops.blit(screen, btn_txt, btn_txt.get_rect(center=(cx, H - 50)))
+
+
+class CreditsAct(Scene):
+    """Ato 3: créditos subindo; termina quando passam todos ou com um clique."""
+
+    def __init__(self, screen, creditos, fonts):
+        super().__init__()
+        self.creditos = creditos
+        self.font_big, self.font_body, self.font_title = fonts
+        self.scroll_y = screen.get_height() + 50
+        # Partículas do Ato 3 (Poucas: ~25)
+        self.particles = star_particles(screen.get_width(), screen.get_height(), 25)
+
+    def handle_event(self, ev):
+        if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
+            self.finish() # Pula direto
+
+    def update(self, dt):
+        self.particles.step(dt)
+        self.scroll_y -= CREDITS_SPEED * dt
+
+    def draw(self, screen):
+        screen.fill((0, 0, 0)) # Fundo Preto
+
+        # Partículas no fundo dos créditos
+        self.particles.draw(screen, interp=scene_manager.alpha)
+
+        # Renderiza texto subindo
+        W, H = screen.get_size()
+        curr_y = int(self.scroll_y)
+        all_passed = True
+
+        for linha, tipo in self.creditos:
+            if tipo == "header":
+                f, c, off = self.font_big, (255, 215, 0), 90
+            elif tipo == "role":
+                f, c, off = self.font_body, (150, 150, 150), 40
+            elif tipo == "name":
+                f, c, off = self.font_title, (255, 255, 255), 60
+            else:
+                f, c, off = self.font_body, (0,0,0), 40
+
+            if -100 < curr_y < H + 100:
+                draw_text(screen, linha, f, c, (W//2, curr_y))
+
+            if curr_y > -50: all_passed = False
+            curr_y += off
+
+        # Último frame desenhado: termina depois de apresentado
+        if all_passed:
+            self.finish()
+
+
+class GameOverAct(Scene):
+    """Ato 4: GAME OVER em neon; depois de 1,5 s, um clique volta ao menu."""
+
+    def __init__(self, screen, font_huge, font_small):
+        super().__init__()
+        self.font_huge = font_huge
+        self.font_small = font_small
+        # Mais partículas aqui para o final dramático (~40)
+        self.particles = star_particles(screen.get_width(), screen.get_height(), 40)
+        self.t = 0
+
+    def handle_event(self, ev):
+        if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1 and self.t > 1500:
+            audio_manager.play_sfx_if_exists("click")
+            self.finish()
+
+    def update(self, dt):
+        self.t += dt * 1000
+        self.particles.step(dt)
+
+    def draw(self, screen):
+        W, H = screen.get_size()
+        screen.fill((0, 0, 0))
+
+        # Partículas
+        self.particles.draw(screen, interp=scene_manager.alpha)
+
+        # Game Over Neon
+        draw_glowing_text(screen, "GAME OVER", self.font_huge, (W//2, H//2 - 20), self.t)
+
+        # Botão voltar
+        if self.t > 1500: # Delay dramático
+            blink = abs(sin(self.t * 0.003)) * 255
+            back_surf = render_text(self.font_small, "- Clique para voltar ao Menu -", (120, 120, 120), alpha=blink)
+            image_ops.blit(screen, back_surf, back_surf.get_rect(center=(W//2, H - 60)))
 
 
 # ===========================================================
 #             FUNÇÃO PRINCIPAL (ASYNC)
 # ===========================================================
 async def run_cutscene_final(screen, final_score):
-    clock = pygame.time.Clock()
-    
     # Inicia música final
     audio_manager.fade_to_music("cutscene_final", fade_ms=1000)
 
@@ -95,17 +264,7 @@ async def run_cutscene_final(screen, final_score):
     pascal_path = os.path.join(assets, "sprites", "pascal.png")
 
     # Background
-    if os.path.exists(bg_path):
-        raw = pygame.image.load(bg_path).convert()
-        raw = pygame.transform.smoothscale(raw, screen.get_size())
-        bg = _blur_surface(raw, 8)
-    else:
-        bg = pygame.Surface(screen.get_size()); bg.fill((15, 18, 30))
-
-    # Pascal
-    pascal = None
-    if os.path.exists(pascal_path):
-        pascal = pygame.image.load(pascal_path).convert_alpha()
+    bg = derived_assets.background(bg_path, screen.get_size(), blur=performance.blur_strength(8), fallback=(15, 18, 30))
 
     # Texto do Pascal
     if final_score < 250:
@@ -118,47 +277,10 @@ async def run_cutscene_final(screen, final_score):
         p_title = "Extraordinário!"
         p_body = "Sua gestão foi impecável! Os processos estão alinhados e o valor foi entregue. Você é um verdadeiro Mestre da Governança!"
 
-    # Loop Ato 1
+    # Cada ato é uma cena da pilha: eventos, ticks e desenho ficam com ela
     # CORRIGIDO: Adicionado await
     await fade_in(screen)
-    running_act1 = True
-    char_idx = 0
-    full_text = p_body
-    
-    while running_act1:
-        clock.tick(60)
-        screen.blit(bg, (0,0))
-        
-        # Pascal
-        if pascal:
-            h_target = int(H * 0.85)
-            ratio = pascal.get_width() / pascal.get_height()
-            pas_scaled = pygame.transform.smoothscale(pascal, (int(h_target*ratio), h_target))
-            screen.blit(pas_scaled, (int(screen.get_width() * 0.05), H - h_target))
-
-        # Caixa de Texto
-        d_rect = pygame.Rect((screen.get_width() * 0.1), H * 0.65, screen.get_width() * 0.8, H * 0.3)
-        draw_modern_container(screen, d_rect)
-        
-        # Título Pascal
-        draw_text(screen, p_title, font_title, (255, 215, 0), (d_rect.centerx, d_rect.y + 30))
-        
-        # Typewriter
-        if char_idx < len(full_text): char_idx += 1
-        draw_text_wrapped(screen, full_text[:char_idx], font_body, (255,255,255), d_rect.inflate(-40, -80))
-
-        # Input
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if ev.type == pygame.MOUSEBUTTONDOWN:
-                if ev.button == 1:
-                    audio_manager.play_sfx_if_exists("click")
-                    running_act1 = False # Próximo ato
-
-        pygame.display.flip()
-        
-        # PONTO CRÍTICO ATO 1:
-        await asyncio.sleep(0)
+    await scene_manager.call(PascalAct(bg, pascal_path, p_title, p_body, font_title, font_body))
 
     # CORRIGIDO: Adicionado await
     await fade_out(screen)
@@ -175,51 +297,10 @@ async def run_cutscene_final(screen, final_score):
     }
     motivacao = frases.get(diff, "Governança é o caminho.")
 
-    # Partículas do Ato 2 (Poucas: ~25)
-    particles_act2 = [StarParticle(screen.get_width(), screen.get_height()) for _ in range(25)]
-
-    # Loop Ato 2
     # CORRIGIDO: Adicionado await
     await fade_in(screen)
-    running_act2 = True
-    while running_act2:
-        clock.tick(60)
-        screen.fill((10, 15, 25)) # Fundo sóbrio
-
-        # Atualiza e desenha partículas AO FUNDO
-        for p in particles_act2:
-            p.update()
-            p.draw(screen)
-
-        cx, cy = screen.get_width()//2, screen.get_height()//2
-
-        # Títulos
-        draw_text(screen, "PONTUAÇÃO FINAL DO JOGADOR", font_title, (200, 200, 200), (cx, cy - 120))
-        
-        # Score Gigante
-        draw_text(screen, str(final_score), font_huge, (255, 215, 0), (cx, cy), shadow=True)
-
-        # Detalhes
-        draw_text(screen, f"Dificuldade: {diff.upper()}", font_body, (100, 200, 255), (cx, cy + 80))
-        draw_text(screen, f'"{motivacao}"', font_body, (150, 150, 150), (cx, cy + 140))
-
-        # Aviso
-        blink = abs(sin(pygame.time.get_ticks() * 0.005)) * 255
-        btn_txt = font_small.render("Toque para continuar", True, (255, 255, 255))
-        btn_txt.set_alpha(int(blink))
-        screen.blit(btn_txt, btn_txt.get_rect(center=(cx, H - 50)))
-
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if ev.type == pygame.MOUSEBUTTONDOWN:
-                if ev.button == 1:
-                    audio_manager.play_sfx_if_exists("click")
-                    running_act2 = False
-
-        pygame.display.flip()
-        
-        # PONTO CRÍTICO ATO 2:
-        await asyncio.sleep(0)
+    await scene_manager.call(ScoreAct(screen, final_score, diff, motivacao,
+                                      (font_title, font_huge, font_body, font_small)))
     
     # CORRIGIDO: Adicionado await
     await fade_out(screen)
@@ -248,56 +329,7 @@ async def run_cutscene_final(screen, final_score):
         ("Obrigado por jogar!", "header")
     ]
 
-    scroll_y = H + 50
-    running_act3 = True
-    
-    # Partículas do Ato 3 (Poucas: ~25, reaproveitando ou criando novas)
-    particles_act3 = [StarParticle(screen.get_width(), screen.get_height()) for _ in range(25)]
-
-    while running_act3:
-        dt = clock.tick(60)
-        screen.fill((0, 0, 0)) # Fundo Preto
-
-        # Partículas no fundo dos créditos
-        for p in particles_act3:
-            p.update()
-            p.draw(screen)
-
-        # Renderiza texto subindo
-        curr_y = scroll_y
-        all_passed = True
-        
-        for linha, tipo in creditos:
-            if tipo == "header":
-                f, c, off = font_big, (255, 215, 0), 90
-            elif tipo == "role":
-                f, c, off = font_body, (150, 150, 150), 40
-            elif tipo == "name":
-                f, c, off = font_title, (255, 255, 255), 60
-            else:
-                f, c, off = font_body, (0,0,0), 40
-
-            if -100 < curr_y < H + 100:
-                draw_text(screen, linha, f, c, (screen.get_width()//2, curr_y))
-            
-            if curr_y > -50: all_passed = False
-            curr_y += off
-
-        scroll_y -= 1.5 # Velocidade de subida
-
-        # Input
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
-                running_act3 = False # Pula direto
-
-        if all_passed:
-            running_act3 = False
-
-        pygame.display.flip()
-        
-        # PONTO CRÍTICO ATO 3:
-        await asyncio.sleep(0)
+    await scene_manager.call(CreditsAct(screen, creditos, (font_big, font_body, font_title)))
     
     # CORRIGIDO: Adicionado await
     await fade_out(screen)
@@ -305,41 +337,8 @@ async def run_cutscene_final(screen, final_score):
     # ------------------------------------------------------------------
     # ATO 4: GAME OVER (LOOP FINAL)
     # ------------------------------------------------------------------
-    # Mais partículas aqui para o final dramático (~40)
-    particles_act4 = [StarParticle(screen.get_width(), H) for _ in range(40)]
-    t = 0
-    running_act4 = True
-    
-    while running_act4:
-        dt = clock.tick(60)
-        t += dt
-        screen.fill((0, 0, 0))
+    await scene_manager.call(GameOverAct(screen, font_huge, font_small))
 
-        # Partículas
-        for p in particles_act4:
-            p.update()
-            p.draw(screen)
-
-        # Game Over Neon
-        draw_glowing_text(screen, "GAME OVER", font_huge, (screen.get_width()//2, H//2 - 20), t)
-
-        # Botão voltar
-        if t > 1500: # Delay dramático
-            blink = abs(sin(t * 0.003)) * 255
-            back_surf = font_small.render("- Clique para voltar ao Menu -", True, (120, 120, 120))
-            back_surf.set_alpha(int(blink))
-            screen.blit(back_surf, back_surf.get_rect(center=(screen.get_width()//2, H - 60)))
-
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if ev.type == pygame.MOUSEBUTTONDOWN:
-                if ev.button == 1 and t > 1500:
-                    audio_manager.play_sfx_if_exists("click")
-                    # CORRIGIDO: Adicionado await
-                    await fade_out(screen)
-                    return # FIM DO JOGO -> Volta pro Main Menu
-
-        pygame.display.flip()
-        
-        # PONTO CRÍTICO ATO 4:
-        await asyncio.sleep(0)
\ No newline at end of file
+    # CORRIGIDO: Adicionado await
+    await fade_out(screen)
+    # FIM DO JOGO -> Volta pro Main Menu
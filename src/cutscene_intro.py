@@ -4,14 +4,13 @@
 
 import pygame
 import os
-import random
+import math
 from math import sin
-import asyncio  # <--- IMPORTANTE PARA WEB
 
 from src.utils import (
     load_font,
+    render_text,
     draw_text,
-    draw_text_wrapped,
     draw_text_animated,
     draw_modern_container,
     fade_in,
@@ -19,18 +18,18 @@ from src.utils import (
 )
 
 from src.audio_manager import audio_manager
+from src import sprite_cache, performance
+from src.scene_manager import Scene, scene_manager, ease_per_tick
+from src.particle_system import ParticleSystem
+from src.typewriter import Typewriter
+from src.asset_manager import asset_manager
+from src import image_ops, derived_assets
 
 
-# ============================================================
-# Pequeno blur eficiente
-# ============================================================
-def _blur(surface, amount=12):
-    if amount <= 1:
-        return surface
-    w, h = surface.get_size()
-    small = pygame.transform.smoothscale(surface, (w // amount, h // amount))
-    return pygame.transform.smoothscale(small, (w, h))
-
+# Animações ajustadas a 60 FPS, convertidas para o tick fixo
+SKIP_EASE = ease_per_tick(0.2)
+PASCAL_EASE = ease_per_tick(0.12)
+PASCAL_FADE_SPEED = 240   # alpha/s
 
 # ============================================================
 # Botão PULAR (Skip) - Animado
@@ -66,7 +65,8 @@ class SkipButton:
         
         # Lógica de animação (Efeito Mola Suave)
         self.target_scale = 1.1 if is_hovered else 1.0
-        self.scale += (self.target_scale - self.scale) * 0.2
+        for _ in range(scene_manager.ticks):
+            self.scale += (self.target_scale - self.scale) * SKIP_EASE
 
         # Calcula dimensões animadas
         anim_w = int(self.width * self.scale)
@@ -89,9 +89,9 @@ class SkipButton:
         pygame.draw.rect(screen, (255, 255, 255), anim_rect, 2, border_radius=12) # Borda branca
         
         # Renderiza o texto centralizado
-        text_surf = self.font.render(self.text, True, self.text_color)
+        text_surf = render_text(self.font, self.text, self.text_color)
         text_rect = text_surf.get_rect(center=anim_rect.center)
-        screen.blit(text_surf, text_rect)
+        image_ops.blit(screen, text_surf, text_rect)
 
     def is_clicked(self, pos):
         return self.rect.collidepoint(pos)
@@ -101,13 +101,138 @@ class SkipButton:
         self.rect.topright = (screen_w - self.margin, self.margin)
 
 
+# ============================================================
+# Diálogo da Introdução (cena da pilha)
+# ============================================================
+class IntroDialogue(Scene):
+    """Pascal + caixa de diálogo com typewriter; termina no fim do roteiro ou no PULAR."""
+
+    CHAR_MS = 18
+
+    def __init__(self, screen, script, bg, pascal_path, fonts, particles):
+        super().__init__()
+        self.script = script
+        self.bg = bg
+        self.pascal_path = pascal_path
+        self.has_pascal = asset_manager.load(pascal_path, alpha=True) is not None
+        self.font_title, self.font_body, self.font_hint, font_skip = fonts
+        self.particles = particles
+
+        self.index = 0
+        self.typer = Typewriter(script[0][1], self.font_body, (240, 240, 240), align="left")
+        self.skip_btn = SkipButton(screen.get_width(), font_skip)
+
+        # entrada do Pascal
+        self.pas_x = -500
+        self.pas_alpha = 0
+        self.t = 0
+
+    def handle_event(self, ev):
+        if ev.type != pygame.MOUSEBUTTONDOWN or ev.button != 1:
+            return
+        audio_manager.play_sfx_if_exists("click")
+
+        # Botão PULAR
+        if self.skip_btn.is_clicked(pygame.mouse.get_pos()):
+            self.finish()
+            return
+
+        # Avança o texto
+        if not self.typer.done:
+            self.typer.reveal_all()
+            return
+        self.index += 1
+        if self.index >= len(self.script):
+            self.finish()
+            return
+        self.typer = Typewriter(self.script[self.index][1], self.font_body, (240, 240, 240), align="left")
+
+    def update(self, dt):
+        self.t += dt * 1000
+        self.particles.step(dt)
+
+        # entrada suave + fade do Pascal
+        target_x = int(pygame.display.get_surface().get_width() * 0.03)
+        self.pas_x += (target_x - self.pas_x) * PASCAL_EASE
+        self.pas_alpha = min(255, self.pas_alpha + PASCAL_FADE_SPEED * dt)
+
+        # Typewriter: só as letras novas deste frame são desenhadas
+        self.typer.update(dt * 1000, self.CHAR_MS)
+
+    def draw(self, screen):
+        W, H = screen.get_size()
+
+        # ---------------------------------------------------------
+        # FUNDO + GLOW
+        # ---------------------------------------------------------
+        image_ops.blit(screen, self.bg.surface, (0, 0))
+
+        # Superfície sólida em cache (a soma ignora o alpha, como antes)
+        image_ops.blit(screen, image_ops.solid((W, H), (60, 90, 180)), (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+
+        # ---------------------------------------------------------
+        # PARTÍCULAS
+        # ---------------------------------------------------------
+        self.particles.draw(screen, interp=scene_manager.alpha)
+
+        # ---------------------------------------------------------
+        # PASCAL ANIMADO
+        # ---------------------------------------------------------
+        if self.has_pascal:
+            pas = asset_manager.scaled_to_height(self.pascal_path, int(H * 0.86), alpha=True)
+
+            # respiração (só com rotozoom liberado no preset atual)
+            if performance.supports_rotozoom():
+                scale = 1.0 + 0.012 * sin(self.t * 0.005)
+                pas = image_ops.rotozoom(pas, 0, scale)
+                pas.set_alpha(int(self.pas_alpha))
+            else:
+                # Cópia com alpha em cache: não altera a imagem do asset_manager
+                pas = sprite_cache.faded(pas, self.pas_alpha)
+
+            image_ops.blit(screen, pas, (self.pas_x, H - pas.get_height()))
+
+        # ---------------------------------------------------------
+        # CAIXA DE DIÁLOGO (utils)
+        # ---------------------------------------------------------
+        d_w = int(W * 0.88)
+        d_h = int(H * 0.28)
+        d_rect = pygame.Rect((W - d_w)//2, int(H * 0.66), d_w, d_h)
+
+        draw_modern_container(screen, d_rect)
+
+        # Título
+        # Ajustado o Y (+25) para descolar do topo da caixa
+        title = self.script[self.index][0]
+        draw_text(
+            screen,
+            title,
+            self.font_title,
+            (255, 230, 170),
+            (d_rect.x + 30 + self.font_title.size(title)[0]/2, d_rect.y + 25)
+        )
+
+        # Alinhamento justificado (simulado com 'left')
+        self.typer.draw(screen, d_rect.inflate(-40, -80))
+
+        # Hint
+        if (self.t // 400) % 2 == 0:
+            draw_text(screen, "Clique para avançar", self.font_hint,
+                      (230,230,230), (W//2, int(H * 0.97)))
+
+        # ---------------------------------------------------------
+        # BOTÃO PULAR (ANIMADO)
+        # ---------------------------------------------------------
+        self.skip_btn.update_position(W) # Atualiza se a tela redimensionar
+        self.skip_btn.draw(screen)
+
+
 # ============================================================
 # Cutscene Intro (ASYNC)
 # ============================================================
 async def run_cutscene_intro(screen):
 
     pygame.display.set_caption("Party Pascal — Introdução")
-    clock = pygame.time.Clock()
 
     # Música da cutscene
     audio_manager.fade_to_music("cutscene_intro", fade_ms=1100)
@@ -137,18 +262,8 @@ async def run_cutscene_intro(screen):
     # ==================================================================
     # FUNDO COM BLUR
     # ==================================================================
-    if os.path.exists(bg_path):
-        raw = pygame.image.load(bg_path).convert()
-        raw = pygame.transform.smoothscale(raw, screen.get_size())
-        bg = _blur(raw, 10)
-    else:
-        bg = pygame.Surface(screen.get_size())
-        bg.fill((15, 18, 30))
-
-    # Pascal sprite
-    pascal = None
-    if os.path.exists(pascal_path):
-        pascal = pygame.image.load(pascal_path).convert_alpha()
+    # Pronto do cache em disco; com o cache frio é montado aos poucos (pump)
+    bg = derived_assets.background(bg_path, screen.get_size(), blur=performance.blur_strength(10), fallback=(15, 18, 30))
 
     # clique
     click_sfx = pygame.mixer.Sound("click") if os.path.exists("click") else None
@@ -156,15 +271,15 @@ async def run_cutscene_intro(screen):
     # ==================================================================
     # PARTÍCULAS ✦
     # ==================================================================
-    particles = []
-    for i in range(45):
-        particles.append({
-            "x": random.randint(0, screen.get_width()),
-            "y": random.randint(0, screen.get_height()),
-            "spd": random.uniform(0.3, 1.0),
-            "alpha": random.randint(150, 255),
-            "char": random.choice(["✦", "✧", "•", "⋆"])
-        })
+    W0, H0 = screen.get_size()
+    particles = ParticleSystem(
+        performance.particle_count(45),
+        shape="glyph", palette=[(255, 230, 170)],
+        chars=["✦", "✧", "•", "⋆"], font=font_particle,
+        bounds=(-math.inf, -30, math.inf, math.inf),
+        spawn={"x": (0, W0), "y": (0, H0), "vy": (-60, -18), "alpha": (150, 255), "fade": 60},
+        respawn={"y": (H0, H0 + 150)},
+    )
 
     # ==================================================================
     # SCRIPT — INTRO + LORE
@@ -198,172 +313,13 @@ async def run_cutscene_intro(screen):
         "O Reino da Governança depende de você. Vamos começar a Festa!")
     ]
 
-    # ==================================================================
-    # Variáveis de animação
-    # ==================================================================
-    index = 0
-    body_text = script[0][1]
-
-    char_index = 0
-    char_speed = 18
-    last_char = pygame.time.get_ticks()
 
-    # entrada do Pascal
-    pas_x = -500
-    pas_alpha = 0
-    
-    # Instancia o Botão Pular
-    skip_btn = SkipButton(screen.get_width(), font_skip)
+    fonts = (font_title, font_body, font_hint, font_skip)
 
     # CORRIGIDO: Adicionado await
     await fade_in(screen)
 
-    running = True
-    t = 0
-
-    # ==================================================================
-    # LOOP ASYNC
-    # ==================================================================
-    while running:
-        dt = clock.tick(60)
-        t += dt
-        W, H = screen.get_size()
-
-        # ---------------------------------------------------------
-        # FUNDO + GLOW
-        # ---------------------------------------------------------
-        screen.blit(bg, (0, 0))
-
-        glow = pygame.Surface((W, H), pygame.SRCALPHA)
-        glow.fill((60, 90, 180, int(35 + 20 * sin(t * 0.004))))
-        screen.blit(glow, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
-
-        # ---------------------------------------------------------
-        # PARTÍCULAS
-        # ---------------------------------------------------------
-        for p in particles:
-            p["y"] -= p["spd"]
-            p["alpha"] -= 1
-
-            if p["alpha"] <= 0 or p["y"] < -30:
-                p["x"] = random.randint(0, W)
-                p["y"] = random.randint(H, H + 150)
-                p["alpha"] = random.randint(150, 255)
-
-            ps = font_particle.render(p["char"], True, (255, 230, 170))
-            ps.set_alpha(p["alpha"])
-            screen.blit(ps, (p["x"], p["y"]))
+    # Eventos, ticks e desenho ficam com a cena (handle_event / update / draw)
+    await scene_manager.call(IntroDialogue(screen, script, bg, pascal_path, fonts, particles))
 
-        # ---------------------------------------------------------
-        # PASCAL ANIMADO
-        # ---------------------------------------------------------
-        if pascal:
-            target_h = int(H * 0.86)
-            ratio = pascal.get_width() / pascal.get_height()
-            target_w = int(ratio * target_h)
-
-            pas = pygame.transform.smoothscale(pascal, (target_w, target_h))
-
-            # entrada suave
-            target_x = int(W * 0.03)
-            pas_x += (target_x - pas_x) * 0.12
-
-            # respiração
-            scale = 1.0 + 0.012 * sin(t * 0.005)
-            pas = pygame.transform.rotozoom(pas, 0, scale)
-
-            # fade
-            pas_alpha = min(255, pas_alpha + 4)
-            pas.set_alpha(pas_alpha)
-
-            screen.blit(pas, (pas_x, H - pas.get_height()))
-
-        # ---------------------------------------------------------
-        # CAIXA DE DIÁLOGO (utils)
-        # ---------------------------------------------------------
-        d_w = int(W * 0.88)
-        d_h = int(H * 0.28)
-        d_rect = pygame.Rect((W - d_w)//2, int(H * 0.66), d_w, d_h)
-
-        draw_modern_container(screen, d_rect)
-
-        # Título
-        # Ajustado o Y (+25) para descolar do topo da caixa
-        draw_text(
-            screen,
-            script[index][0],
-            font_title,
-            (255, 230, 170),
-            (d_rect.x + 30 + font_title.size(script[index][0])[0]/2, d_rect.y + 25)
-        )
-
-        # Typewriter
-        now = pygame.time.get_ticks()
-        if char_index < len(body_text) and now - last_char >= char_speed:
-            char_index += 1
-            last_char = now
-
-        ta = d_rect.inflate(-40, -80)
-
-        # Alinhamento justificado (simulado com 'left')
-        draw_text_wrapped(
-            screen,
-            body_text[:char_index],
-            font_body,
-            (240,240,240),
-            ta,
-            align="left" 
-        )
-
-        # Hint
-        if (t // 400) % 2 == 0:
-            draw_text(screen, "Clique para avançar", font_hint,
-                      (230,230,230), (W//2, int(H * 0.97)))
-        
-        # ---------------------------------------------------------
-        # BOTÃO PULAR (ANIMADO)
-        # ---------------------------------------------------------
-        skip_btn.update_position(W) # Atualiza se a tela redimensionar
-        skip_btn.draw(screen)
-
-        # ---------------------------------------------------------
-        # EVENTOS
-        # ---------------------------------------------------------
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT:
-                pygame.quit(); exit()
-
-            if ev.type == pygame.KEYDOWN:
-                if ev.key == pygame.K_F11:
-                    pygame.display.toggle_fullscreen()
-
-            if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
-                mouse_pos = pygame.mouse.get_pos()
-                
-                # Verifica clique no botão PULAR
-                if skip_btn.is_clicked(mouse_pos):
-                    audio_manager.play_sfx_if_exists("click")
-                    # CORRIGIDO: Adicionado await
-                    await fade_out(screen)
-                    return
-
-                # Avança o texto
-                audio_manager.play_sfx_if_exists("click")
-
-                if char_index < len(body_text):
-                    char_index = len(body_text)
-                else:
-                    index += 1
-                    if index >= len(script):
-                        # CORRIGIDO: Adicionado await
-                        await fade_out(screen)
-                        return
-
-                    body_text = script[index][1]
-                    char_index = 0
-                    last_char = pygame.time.get_ticks()
-
-        pygame.display.flip()
-        
-        # PONTO CRÍTICO PARA PYBAG:
-        await asyncio.sleep(0)
\ No newline at end of file
+    await fade_out(screen)
@@ -0,0 +1,122 @@
+#=========================================================
+#   DIRTY RECTS (ATUALIZAÇÃO PARCIAL DA TELA)
+#=========================================================
+
+"""
+Modo opcional de atualização parcial para telas quase estáticas.
+
+A cena continua desenhando o frame inteiro na superfície da tela; o que
+muda é a apresentação: em vez de pygame.display.flip() da janela toda, só
+as regiões que mudaram vão para pygame.display.update(rects). Nos builds
+mobile isso reduz a cópia/upload por frame (bateria e temperatura).
+
+Cada widget informa seu retângulo e um "estado" por frame; se algum dos
+dois mudou, o retângulo antigo e o novo entram na lista. Grupos (como
+partículas) informam os retângulos do frame e o tracker soma os do frame
+anterior, para apagar as posições velhas.
+
+Se a área suja passar de `threshold` da tela (ou houver retângulos demais)
+cai para um flip completo. Desligado (preset sem "dirty_rects"), present()
+é só um flip. Sem `enabled` explícito, o estado segue o preset atual
+(o QualityGovernor pode ligar/desligar com a cena aberta).
+"""
+
+import pygame
+
+from src import performance
+
+# Fração da tela a partir da qual um flip completo sai mais barato
+DEFAULT_THRESHOLD = 0.4
+
+# Acima disso junta tudo num flip (update com centenas de rects não compensa)
+MAX_RECTS = 160
+
+
+class DirtyRects:
+    def __init__(self, screen, threshold=DEFAULT_THRESHOLD, enabled=None):
+        self._forced = enabled
+        self._was_enabled = self.enabled
+        self.threshold = threshold
+        self._size = screen.get_size()
+        self._widgets = {}
+        self._groups = {}
+        self._rects = []
+        self._full = True
+        self.stats = {"frames": 0, "full": 0, "partial": 0, "skipped": 0}
+
+    @property
+    def enabled(self):
+        return performance.use_dirty_rects() if self._forced is None else self._forced
+
+    # -----------------------------------------------------
+    # REGISTRO DE MUDANÇAS
+    # -----------------------------------------------------
+    def widget(self, name, rect, state=None):
+        """Rect desenhado por um widget neste frame e seu estado visual."""
+        if not self.enabled or rect is None:
+            return
+        rect = pygame.Rect(rect)
+        prev = self._widgets.get(name)
+        if prev is None or prev[0] != rect or prev[1] != state:
+            if prev is not None:
+                self._rects.append(prev[0])
+            self._rects.append(rect)
+        self._widgets[name] = (rect, state)
+
+    def group(self, name, rects):
+        """Rects de um grupo que se move todo frame (ex.: partículas)."""
+        if not self.enabled:
+            return
+        self._rects.extend(self._groups.get(name, ()))
+        self._rects.extend(rects)
+        self._groups[name] = list(rects)
+
+    def add(self, rect):
+        if self.enabled:
+            self._rects.append(pygame.Rect(rect))
+
+    def invalidate(self):
+        """Próximo present() atualiza a tela inteira."""
+        self._full = True
+
+    # -----------------------------------------------------
+    # APRESENTAÇÃO
+    # -----------------------------------------------------
+    def present(self):
+        self.stats["frames"] += 1
+        enabled = self.enabled
+        if enabled != self._was_enabled:
+            # Preset mudou: o que foi registrado antes não vale mais
+            self._was_enabled = enabled
+            self._widgets.clear()
+            self._groups.clear()
+            self._rects = []
+            self._full = True
+        if not enabled:
+            pygame.display.flip()
+            return
+
+        surface = pygame.display.get_surface()
+        size = surface.get_size()
+        if size != self._size:
+            self._size = size
+            self._full = True
+
+        rects = self._rects
+        self._rects = []
+
+        if not self._full and len(rects) <= MAX_RECTS:
+            screen_rect = surface.get_rect()
+            rects = [r.clip(screen_rect) for r in rects]
+            area = sum(r.width * r.height for r in rects)
+            if area == 0:
+                self.stats["skipped"] += 1
+                return
+            if area <= self.threshold * size[0] * size[1]:
+                pygame.display.update(rects)
+                self.stats["partial"] += 1
+                return
+
+        self._full = False
+        pygame.display.flip()
+        self.stats["full"] += 1
@@ -0,0 +1,111 @@
+#=========================================================
+#   RELÓGIO DO JOGO (REAL / ACELERADO / EM PASSOS)
+#=========================================================
+
+"""
+Um único relógio para tudo o que o jogo cronometra: timers das perguntas,
+transições, pulsos de animação, esperas (scene_manager.wait) e o passo fixo
+da simulação. As cenas leem game_clock.ticks() (ms) ou game_clock.time()
+(s) no lugar de pygame.time.get_ticks() / time.time().
+
+O scene_manager avança o relógio uma vez por frame (frame(dt_real)) e usa
+o dt devolvido em tudo; dentro de um frame o tempo não anda. Modos:
+
+- real:    o tempo do jogo é o tempo real (padrão);
+- scaled:  tempo real multiplicado por `scale` (2.0 = o dobro da
+           velocidade), com o Clock limitando o FPS normalmente;
+- stepped: cada frame vale `step_ms` fixos e o Clock não espera. Sem
+           janela (SDL dummy) a campanha inteira roda em segundos, sempre
+           com os mesmos dt (smoke tests, benchmarks, CI).
+
+Escolha por código (game_clock.set_mode) ou, pelo main.py, com
+PARTY_PASCAL_CLOCK=real | scaled:2 | stepped | stepped:16.67.
+"""
+
+import os
+
+MODES = ("real", "scaled", "stepped")
+
+# Passo padrão do modo stepped (um frame a 60 FPS)
+DEFAULT_STEP_MS = 1000.0 / 60
+
+
+class GameClock:
+    def __init__(self):
+        self.mode = "real"
+        self.scale = 1.0
+        self.step_ms = DEFAULT_STEP_MS
+        self._now = 0.0      # ms desde o início
+        self.frames = 0
+
+    # ==========================================================
+    # CONFIGURAÇÃO
+    # ==========================================================
+    def set_mode(self, mode, scale=None, step_ms=None):
+        if mode not in MODES:
+            raise ValueError(f"Modo de relógio desconhecido: {mode}")
+        self.mode = mode
+        if scale is not None:
+            self.scale = float(scale)
+        if step_ms is not None:
+            self.step_ms = float(step_ms)
+
+    def configure(self, spec):
+        """"real", "scaled:2", "stepped" ou "stepped:16.67"."""
+        name, _, arg = spec.partition(":")
+        name = name.strip().lower()
+        if name == "scaled":
+            self.set_mode("scaled", scale=float(arg) if arg else 2.0)
+        elif name == "stepped":
+            self.set_mode("stepped", step_ms=float(arg) if arg else DEFAULT_STEP_MS)
+        else:
+            self.set_mode(name)
+
+    def configure_from_env(self):
+        spec = os.environ.get("PARTY_PASCAL_CLOCK")
+        if spec:
+            self.configure(spec)
+
+    def snapshot(self):
+        """Modo e tempo atuais (cabeçalho das sessões gravadas, src/replay.py)."""
+        return {"mode": self.mode, "scale": self.scale, "step_ms": self.step_ms,
+                "now": self._now, "frames": self.frames}
+
+    def restore(self, state):
+        """Volta ao estado de snapshot(); gravações antigas não têm o tempo."""
+        self.set_mode(state["mode"], state["scale"], state["step_ms"])
+        self._now = float(state.get("now", self._now))
+        self.frames = int(state.get("frames", self.frames))
+
+    # ==========================================================
+    # AVANÇO (scene_manager, uma vez por frame)
+    # ==========================================================
+    def fps_limit(self, fps):
+        """FPS a passar ao pygame.time.Clock: sem espera no modo stepped."""
+        return 0 if self.mode == "stepped" else fps
+
+    def frame(self, real_dt_ms):
+        """Avança um frame e devolve o dt do jogo (ms)."""
+        if self.mode == "stepped":
+            dt = self.step_ms
+        elif self.mode == "scaled":
+            dt = real_dt_ms * self.scale
+        else:
+            dt = real_dt_ms
+        self._now += dt
+        self.frames += 1
+        return dt
+
+    # ==========================================================
+    # LEITURA (cenas)
+    # ==========================================================
+    def ticks(self):
+        """ms desde o início (substitui pygame.time.get_ticks)."""
+        return int(self._now)
+
+    def time(self):
+        """Segundos desde o início (substitui time.time nos cronômetros)."""
+        return self._now / 1000.0
+
+
+game_clock = GameClock()
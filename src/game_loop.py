@@ -8,17 +8,19 @@ Gerencia o menu, minigames e tela final com pontuação integrada e animada.
 Adaptado para Pygbag/Web (Async/Await).
 """
 
-import asyncio # <--- OBRIGATÓRIO
 import pygame
-import sys
 import os
-import random
 import traceback
 from math import sin
 
-from src.utils import show_pause_screen, load_font
+from src.utils import show_pause_screen, load_font, render_text, glyph_atlas
 from src.score_manager import ScoreManager
 from src.audio_manager import AudioManager
+from src import image_ops
+from src.input_manager import input_manager
+from src.scene_manager import Scene, scene_manager
+from src.asset_manager import asset_manager
+from src.particle_system import rising_particles
 
 # Minigames
 from src.minigames.show_do_bilhao import run_show_do_bilhao
@@ -41,142 +43,132 @@ bg_exit_original = None
 def resize_backgrounds(screen):
     global bg_start, bg_exit, bg_start_original, bg_exit_original
     if bg_start_original:
-        bg_start = pygame.transform.scale(bg_start_original, screen.get_size())
+        bg_start = asset_manager.scale_surface(bg_start_original, screen.get_size(), filter="fast")
     if bg_exit_original:
-        bg_exit = pygame.transform.scale(bg_exit_original, screen.get_size())
+        bg_exit = asset_manager.scale_surface(bg_exit_original, screen.get_size(), filter="fast")
 
 
-async def show_intro_screen(screen, clock):
-    resize_backgrounds(screen)
-    font_big = load_font(60)
+class IntroScreen(Scene):
+    """"Preparando o Palco...": some em `duration` ms ou com ESC / Enter / Espaço."""
 
-    AudioManager.play_music_if_exists("loop_start")
+    def __init__(self, duration=4000):
+        super().__init__()
+        self.duration = duration
+        self.font_big = load_font(60)
+        self.elapsed = 0.0
 
-    start_time = pygame.time.get_ticks()
-    duration = 4000 
+    def handle_event(self, event):
+        if event.type == input_manager.RESIZED:
+            resize_backgrounds(pygame.display.get_surface())
+        if event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_RETURN, pygame.K_SPACE):
+            self.finish()
 
-    running = True
-    while running:
-        elapsed = pygame.time.get_ticks() - start_time
-        if elapsed >= duration:
-            running = False
+    def update(self, dt):
+        self.elapsed += dt * 1000
 
+    def draw(self, screen):
         if bg_start:
-            screen.blit(bg_start, (0, 0))
+            image_ops.blit(screen, bg_start, (0, 0))
         else:
             screen.fill((10, 10, 30))
 
-        alpha = abs(sin(elapsed * 0.005)) * 255
-        surf = font_big.render("Preparando o Palco...", True, (255, 215, 0))
-        surf.set_alpha(int(alpha))
-        screen.blit(surf, surf.get_rect(center=(screen.get_width()//2, screen.get_height() - 80)))
-
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if ev.type == pygame.KEYDOWN:
-                if ev.key == pygame.K_F11:
-                    is_full = pygame.display.get_surface().get_flags() & pygame.FULLSCREEN
-                    if is_full:
-                        screen = pygame.display.set_mode((1024, 600), pygame.RESIZABLE)
-                    else:
-                        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                    resize_backgrounds(screen)
-                elif ev.key in (pygame.K_ESCAPE, pygame.K_RETURN, pygame.K_SPACE):
-                    running = False
-
-        pygame.display.flip()
-        
-        # CORREÇÃO: AWAIT PARA NÃO TRAVAR
-        await asyncio.sleep(0)
-        clock.tick(60)
-
-
-async def show_stage_transition(screen, stage_num, stage_name):
-    clock = pygame.time.Clock()
-    font_big = load_font(80)
-    font_small = load_font(36)
-    font_particle = load_font(24)
-
-    start = pygame.time.get_ticks()
-    duration = 3000
-
-    styles = {
-        "Show do Bilhão": {"bg": (10, 10, 30), "accent": (255, 215, 0), "type": "char", "content": ["$"], "color": (255, 215, 0)},
-        "Batalha Naval": {"bg": (5, 20, 60), "accent": (80, 200, 255), "type": "circle", "color": (120, 180, 255)},
-        "Maleta Certa": {"bg": (40, 0, 0), "accent": (255, 60, 60), "type": "char", "content": ["M"], "color": (255, 200, 100)},
-        "Roleta de Risco": {"bg": (40, 0, 70), "accent": (255, 120, 255), "type": "char", "content": ["!", "?"], "color": (255, 120, 255)},
-        "Perseguição": {"bg": (10, 10, 10), "accent": (255, 220, 50), "type": "char", "content": ["!"], "color": (255, 50, 50)},
-        "STOP": {"bg": (0, 70, 0), "accent": (255, 255, 255), "type": "char", "content": ["S", "T", "O", "P"], "color": (255, 255, 255)},
-    }
-
-    style = styles.get(stage_name, styles["Show do Bilhão"])
-
-    particles = []
-    W, H = screen.get_size()
-    for _ in range(45):
-        p = {"x": random.randint(0, W), "y": random.randint(0, H), "r": random.randint(2, 6), "alpha": random.randint(130, 255), "speed": random.uniform(0.5, 2)}
-        if style["type"] == "char": p["char"] = random.choice(style["content"])
-        particles.append(p)
-
-    running = True
-    while running:
-        elapsed = pygame.time.get_ticks() - start
-        t = elapsed / duration
-        if t >= 1: running = False
-
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if ev.type == pygame.KEYDOWN and ev.key == pygame.K_F11:
-                is_full = pygame.display.get_surface().get_flags() & pygame.FULLSCREEN
-                if is_full: screen = pygame.display.set_mode((1024, 600), pygame.RESIZABLE)
-                else: screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                resize_backgrounds(screen)
+        alpha = abs(sin(self.elapsed * 0.005)) * 255
+        surf = render_text(self.font_big, "Preparando o Palco...", (255, 215, 0), alpha=alpha)
+        image_ops.blit(screen, surf, surf.get_rect(center=(screen.get_width()//2, screen.get_height() - 80)))
 
-        screen.fill(style["bg"])
+        # Último frame desenhado: termina depois de apresentado
+        if self.elapsed >= self.duration:
+            self.finish()
 
-        for p in particles:
-            p["y"] -= p["speed"]; p["alpha"] -= 2
-            if p["y"] < -10 or p["alpha"] <= 0:
-                p["x"] = random.randint(0, W); p["y"] = random.randint(H, H + 80); p["alpha"] = random.randint(150, 255)
-            
-            base = style["color"]
-            col = (base[0], base[1], base[2], int(p["alpha"]))
-
-            if style["type"] == "char":
-                surf = font_particle.render(p["char"], True, col); surf.set_alpha(col[3])
-                screen.blit(surf, (int(p["x"]), int(p["y"])))
-            else:
-                surf = pygame.Surface((p["r"]*2, p["r"]*2), pygame.SRCALPHA)
-                pygame.draw.circle(surf, col, (p["r"], p["r"]), p["r"])
-                screen.blit(surf, (int(p["x"]), int(p["y"])))
-
-        fade = int(255 * min(t * 1.5, 1))
-        title = font_big.render(stage_name, True, style["accent"])
-        title.set_alpha(fade)
-        screen.blit(title, title.get_rect(center=(W//2, H//2 - 50)))
+
+async def show_intro_screen(screen):
+    resize_backgrounds(screen)
+    AudioManager.play_music_if_exists("loop_start")
+    await scene_manager.call(IntroScreen())
+
+
+STAGE_STYLES = {
+    "Show do Bilhão": {"bg": (10, 10, 30), "accent": (255, 215, 0), "type": "char", "content": ["$"], "color": (255, 215, 0)},
+    "Batalha Naval": {"bg": (5, 20, 60), "accent": (80, 200, 255), "type": "circle", "color": (120, 180, 255)},
+    "Maleta Certa": {"bg": (40, 0, 0), "accent": (255, 60, 60), "type": "char", "content": ["M"], "color": (255, 200, 100)},
+    "Roleta de Risco": {"bg": (40, 0, 70), "accent": (255, 120, 255), "type": "char", "content": ["!", "?"], "color": (255, 120, 255)},
+    "Perseguição": {"bg": (10, 10, 10), "accent": (255, 220, 50), "type": "char", "content": ["!"], "color": (255, 50, 50)},
+    "STOP": {"bg": (0, 70, 0), "accent": (255, 255, 255), "type": "char", "content": ["S", "T", "O", "P"], "color": (255, 255, 255)},
+}
+
+
+class StageTransition(Scene):
+    """Cartão "Fase N" entre minigames; enquanto roda, pré-carrega o fundo da fase."""
+
+    def __init__(self, screen, stage_name, bg_path=None, duration=3000):
+        super().__init__()
+        self.stage_name = stage_name
+        self.bg_path = bg_path
+        self.duration = duration
+        self.font_big = load_font(80)
+        self.font_small = load_font(36)
+        font_particle = load_font(24)
+
+        self.style = STAGE_STYLES.get(stage_name, STAGE_STYLES["Show do Bilhão"])
+
+        self.W, self.H = screen.get_size()
+        chars = self.style["content"] if self.style["type"] == "char" else None
+        self.particles = rising_particles(self.W, self.H, 45, self.style["color"], chars, font_particle,
+                                          alpha=(130, 255), respawn_depth=80)
+        self.t = 0
+        self.elapsed = 0.0
+
+    def preload(self):
+        if not self.bg_path:
+            return None
+        return _preload_background(self.bg_path, (self.W, self.H))
+
+    def handle_event(self, event):
+        if event.type == input_manager.RESIZED:
+            resize_backgrounds(pygame.display.get_surface())
+
+    def update(self, dt):
+        self.elapsed += dt * 1000
+        self.t = self.elapsed / self.duration
+        self.particles.step(dt)
+
+    def draw(self, screen):
+        W, H = self.W, self.H
+        screen.fill(self.style["bg"])
+        self.particles.draw(screen, interp=scene_manager.alpha)
+
+        fade = int(255 * min(self.t * 1.5, 1))
+        title = render_text(self.font_big, self.stage_name, self.style["accent"], alpha=fade)
+        image_ops.blit(screen, title, title.get_rect(center=(W//2, H//2 - 50)))
 
         try: sc = ScoreManager.update_displayed_score()
         except: sc = ScoreManager.get_score()
-        score_surf = font_small.render(f"Pontuação total: {sc}", True, (240, 240, 240))
-        score_surf.set_alpha(fade)
-        screen.blit(score_surf, score_surf.get_rect(center=(W//2, H//2 + 60)))
+        # Placar animado: composto a partir do atlas de glyphs
+        glyph_atlas(self.font_small, (240, 240, 240), alpha=fade).draw(screen, f"Pontuação total: {sc}", center=(W//2, H//2 + 60))
+
+        # Último frame desenhado: termina depois de apresentado
+        if self.t >= 1:
+            self.finish()
 
-        pygame.display.flip()
-        
-        # CORREÇÃO: AWAIT PARA NÃO TRAVAR
-        await asyncio.sleep(0)
-        clock.tick(60)
-        
-    # CORREÇÃO: TROCAR TIME.DELAY POR ASYNC SLEEP
-    await asyncio.sleep(0.4)
+
+def _preload_background(path, size):
+    # Mesmas chamadas que o minigame faz no resize: ele abre com o cache quente
+    asset_manager.load(path)
+    yield
+    asset_manager.scaled(path, size, filter="fast")
+
+
+async def show_stage_transition(screen, stage_num, stage_name, bg_path=None):
+    await scene_manager.call(StageTransition(screen, stage_name, bg_path))
+
+    # CORREÇÃO: TROCAR TIME.DELAY POR ESPERA SEM TRAVAR
+    await scene_manager.wait(400)
 
 
 async def start_game_loop(screen):
     global bg_start_original, bg_exit_original
 
     pygame.display.set_caption("Party Pascal - Fases")
-    clock = pygame.time.Clock()
 
     ScoreManager.reset()
     current_stage = 0
@@ -184,38 +176,35 @@ async def start_game_loop(screen):
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     bg_dir = os.path.join(base_dir, "assets", "background")
 
-    try: bg_start_original = pygame.image.load(os.path.join(bg_dir, "loop_start.png")).convert()
-    except: bg_start_original = None
-    try: bg_exit_original = pygame.image.load(os.path.join(bg_dir, "loop_exit.png")).convert()
-    except: bg_exit_original = None
+    bg_start_original = asset_manager.load(os.path.join(bg_dir, "loop_start.png"))
+    bg_exit_original = asset_manager.load(os.path.join(bg_dir, "loop_exit.png"))
 
     resize_backgrounds(screen)
     
     # CORREÇÃO: CHAMADA COM AWAIT
-    await show_intro_screen(screen, clock)
+    await show_intro_screen(screen)
 
     fases = [
-        ("Show do Bilhão", run_show_do_bilhao, "musica_show_do_bilhao"),
-        ("Batalha Naval", run_batalha_naval, "musica_batalha_naval"),
-        ("Maleta Certa", run_maleta_certa, "musica_maleta_certa"),
-        ("Roleta de Risco", roleta_risco, "musica_rodada_bonus"),
-        ("Perseguição", run_perseguicao, "musica_perseguicao"),
-        ("STOP", run_stop, "musica_stop"),
+        ("Show do Bilhão", run_show_do_bilhao, "musica_show_do_bilhao", "background_show_do_bilhao.jpg"),
+        ("Batalha Naval", run_batalha_naval, "musica_batalha_naval", "background_batalha_naval.png"),
+        ("Maleta Certa", run_maleta_certa, "musica_maleta_certa", "background_maleta_certa.png"),
+        ("Roleta de Risco", roleta_risco, "musica_rodada_bonus", "background_roleta_risco.png"),
+        ("Perseguição", run_perseguicao, "musica_perseguicao", "background_perseguicao.png"),
+        ("STOP", run_stop, "musica_stop", "background_stop.png"),
     ]
 
     while True:
         if current_stage < len(fases):
-            nome_fase, funcao, musica_key = fases[current_stage]
+            nome_fase, funcao, musica_key, bg_file = fases[current_stage]
 
             AudioManager.play_music_if_exists(musica_key)
             
-            # CORREÇÃO: CHAMADA COM AWAIT
-            await show_stage_transition(screen, current_stage + 1, nome_fase)
+            # Fundo do minigame é carregado durante o cartão da fase
+            await show_stage_transition(screen, current_stage + 1, nome_fase, os.path.join(bg_dir, bg_file))
 
             try:
-                # CORREÇÃO CRÍTICA: CHAMAR O MINIGAME COM AWAIT
-                # O minigame (funcao) deve ser 'async def'
-                pontos = await funcao(screen)
+                # O minigame entra na pilha de cenas; erros voltam para cá
+                pontos = await scene_manager.call(funcao(screen))
             except Exception as e:
                 print(f"\n========================================")
                 print(f"ERRO CRÍTICO NO MINIGAME: {nome_fase}")
@@ -225,7 +214,7 @@ async def start_game_loop(screen):
                 pontos = 0
                 
                 # CORREÇÃO: PAUSA DE ERRO ASYNC
-                await asyncio.sleep(2)
+                await scene_manager.wait(2000)
 
             if pontos is None: pontos = 0
             
@@ -237,27 +226,21 @@ async def start_game_loop(screen):
             AudioManager.play_music_if_exists("musica_final")
 
             # CORREÇÃO: CHAMADA COM AWAIT
-            await show_pause_screen(screen, clock, "Jogo Concluído!",
+            await show_pause_screen(screen, "Jogo Concluído!",
                               f"Pontuação Total: {final_score}",
                               "Pressione para continuar...", background=bg_exit)
 
             # CORREÇÃO: CHAMADA COM AWAIT
-            await run_cutscene_final(screen, final_score)
+            await scene_manager.call(run_cutscene_final(screen, final_score))
             return
 
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if ev.type == pygame.KEYDOWN:
-                if ev.key == pygame.K_F11:
-                    is_full = pygame.display.get_surface().get_flags() & pygame.FULLSCREEN
-                    if is_full: screen = pygame.display.set_mode((1024, 600), pygame.RESIZABLE)
-                    else: screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                    resize_backgrounds(screen)
-                elif ev.key == pygame.K_ESCAPE:
-                    # Cancela o jogo e volta ao menu
-                    return
-
-        clock.tick(60)
-        
-        # CORREÇÃO: AWAIT NO LOOP PRINCIPAL DE FASES
-        await asyncio.sleep(0)
\ No newline at end of file
+        for ev in input_manager.poll():
+            if ev.type == input_manager.RESIZED:
+                screen = pygame.display.get_surface()
+                resize_backgrounds(screen)
+            if ev.type == pygame.KEYDOWN and ev.key == pygame.K_ESCAPE:
+                # Cancela o jogo e volta ao menu
+                return
+
+        # CORREÇÃO: AWAIT NO LOOP PRINCIPAL DE FASES (nada novo para apresentar)
+        await scene_manager.frame(present=False)
\ No newline at end of file
@@ -5,55 +5,37 @@
 import pygame
 import os
 import math
-import random
-import sys
-import asyncio  # <--- ESSENCIAL
 
 from src.audio_manager import audio_manager
-from src.utils import load_font
-
-# ---------- util helpers ----------
-def _blur_surface(surface, amount=10):
-    if amount < 1:
-        return surface
-    w, h = surface.get_size()
-    scale = 1.0 / amount
-    small = (max(1, int(w * scale)), max(1, int(h * scale)))
-    surf_small = pygame.transform.smoothscale(surface, small)
-    return pygame.transform.smoothscale(surf_small, (w, h))
+from src.utils import load_font, render_text
+from src import performance, image_ops, instrumentation
+from src.particle_system import ParticleSystem
+from src import derived_assets
+from src.dirty_rects import DirtyRects
+from src.input_manager import input_manager
+from src.scene_manager import scene_manager, TICK, ease_per_tick
+
+# Mola do hover dos botões (0.2 por frame a 60 FPS)
+BUTTON_EASE = ease_per_tick(0.2)
 
 # ---------- Partículas ----------
-class Particle:
-    def __init__(self, w, h):
-        self.reset(w, h)
-
-    def reset(self, w, h):
-        self.x = random.uniform(0, w)
-        self.y = random.uniform(0, h)
-        self.size = random.uniform(1.5, 5.0)
-        self.color = random.choice([(255,215,0),(255,223,80),(255,191,0)])
-        self.vx = random.uniform(-0.3, 0.3)
-        self.vy = random.uniform(-0.6, -0.15)
-        self.alpha = random.randint(120, 230)
-        self.decay = random.uniform(0.4, 1.6)
-
-    def update(self, dt, w, h):
-        mul = dt * 0.06
-        self.x += self.vx * mul
-        self.y += self.vy * mul
-        self.alpha -= self.decay * (mul * 0.5)
-        self.size = max(0.2, self.size - 0.01 * mul)
-        if self.y < -10 or self.alpha <= 0 or self.x < -50 or self.x > w + 50:
-            self.reset(w, h)
-            self.y = h + random.uniform(0, 40)
-
-    def draw(self, screen):
-        if self.alpha <= 0 or self.size <= 0:
-            return
-        surf = pygame.Surface((int(self.size*2), int(self.size*2)), pygame.SRCALPHA)
-        col = (self.color[0], self.color[1], self.color[2], int(self.alpha))
-        pygame.draw.circle(surf, col, (int(self.size), int(self.size)), int(self.size))
-        screen.blit(surf, (int(self.x - self.size), int(self.y - self.size)))
+def gold_particles(w, h):
+    return ParticleSystem(
+        performance.particle_count(25),
+        palette=[(255,215,0),(255,223,80),(255,191,0)],
+        anchor="center",
+        bounds=(-50, -10, w + 50, math.inf),
+        min_size=0.2,
+        spawn={
+            "x": (0, w), "y": (0, h),
+            "size": (1.5, 5.0),
+            "vx": (-18, 18), "vy": (-36, -9),
+            "alpha": (120, 230),
+            "fade": (12, 48),
+            "grow": -0.6,
+        },
+        respawn={"y": (h, h + 40)},
+    )
 
 
 # ---------- Botão Animado ----------
@@ -90,9 +72,10 @@ class AnimButton:
         self.rect.center = center
 
     def draw(self, screen, mouse_pos):
-        hover = self.rect.collidepoint(mouse_pos)
+        hover = self.hovering = self.rect.collidepoint(mouse_pos)
         self.target_scale = 1.05 if hover else 1.0
-        self.scale += (self.target_scale - self.scale) * 0.2
+        for _ in range(scene_manager.ticks):
+            self.scale += (self.target_scale - self.scale) * BUTTON_EASE
 
         cur_w = int(self.width * self.scale)
         cur_h = int(self.height * self.scale)
@@ -106,12 +89,13 @@ class AnimButton:
         color = self.hover_color if hover else self.base_color
         pygame.draw.rect(screen, color, r, border_radius=12)
         
-        gloss = pygame.Surface((r.width, r.height // 2), pygame.SRCALPHA)
+        gloss = image_ops.new_surface((r.width, r.height // 2), pygame.SRCALPHA)
         gloss.fill((255, 255, 255, 20))
-        screen.blit(gloss, (r.x, r.y))
+        image_ops.blit(screen, gloss, (r.x, r.y))
 
         pygame.draw.rect(screen, (255, 255, 255), r, 2, border_radius=12)
-        screen.blit(self.text_surf, self.text_surf.get_rect(center=r.center))
+        image_ops.blit(screen, self.text_surf, self.text_surf.get_rect(center=r.center))
+        return r.union(shadow)
 
     def clicked(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -128,6 +112,7 @@ class FreeModeUI:
         self.w, self.h = screen.get_size()
         base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.bg_path = os.path.join(base, "assets", "background", "game_livre.png")
+        self.dirty = DirtyRects(screen)
         
         self._load_resources()
         
@@ -154,20 +139,12 @@ class FreeModeUI:
 
     def _load_resources(self):
         self.w, self.h = self.screen.get_size()
-        try:
-            if os.path.exists(self.bg_path):
-                raw = pygame.image.load(self.bg_path).convert()
-                self.bg = pygame.transform.smoothscale(raw, (self.w, self.h))
-                self.bg = _blur_surface(self.bg, 8)
-            else:
-                raise FileNotFoundError
-        except:
-            self.bg = pygame.Surface((self.w, self.h))
-            self.bg.fill((20, 20, 35))
+        # Fundo borrado vem pronto do cache em disco (ou é montado aos poucos)
+        self.bg = derived_assets.background(self.bg_path, (self.w, self.h), blur=performance.blur_strength(8), fallback=(20, 20, 35))
 
         self.font_title = load_font(int(self.h * 0.08))
         self.font_btn = load_font(int(self.h * 0.035))
-        self.particles = [Particle(self.w, self.h) for _ in range(25)]
+        self.particles = gold_particles(self.w, self.h)
 
     def _create_buttons(self):
         cx = self.w // 2
@@ -205,53 +182,50 @@ class FreeModeUI:
         self.screen = screen
         self._load_resources()
         self._create_buttons()
-
-    def draw(self, dt, mouse_pos):
-        self.screen.blit(self.bg, (0, 0))
-        for p in self.particles:
-            p.update(dt, self.w, self.h)
-            p.draw(self.screen)
+        self.dirty.invalidate()
+
+    def draw(self, mouse_pos):
+        image_ops.blit(self.screen, self.bg.surface, (0, 0))
+        # Fundo do cache frio chegando: tela inteira muda
+        self.dirty.widget("bg", self.screen.get_rect(), self.bg.ready)
+        self.particles.advance(scene_manager.ticks, TICK)
+        drawn = [] if self.dirty.enabled else None
+        self.particles.draw(self.screen, rects=drawn, interp=scene_manager.alpha)
+        self.dirty.group("particles", drawn or ())
             
-        title_surf = self.font_title.render("MODO LIVRE", True, (255, 215, 0))
-        title_shad = self.font_title.render("MODO LIVRE", True, (0, 0, 0))
+        title_surf = render_text(self.font_title, "MODO LIVRE", (255, 215, 0))
+        title_shad = render_text(self.font_title, "MODO LIVRE", (0, 0, 0))
         tr = title_surf.get_rect(center=(self.w // 2, int(self.h * 0.08)))
-        self.screen.blit(title_shad, (tr.x + 4, tr.y + 4))
-        self.screen.blit(title_surf, tr)
+        image_ops.blit(self.screen, title_shad, (tr.x + 4, tr.y + 4))
+        image_ops.blit(self.screen, title_surf, tr)
         
-        for btn in self.game_buttons:
-            btn.draw(self.screen, mouse_pos)
-        self.btn_back_mode.draw(self.screen, mouse_pos)
-        self.btn_menu.draw(self.screen, mouse_pos)
+        for btn in self.game_buttons + [self.btn_back_mode, self.btn_menu]:
+            self.dirty.widget(btn.text, btn.draw(self.screen, mouse_pos), btn.hovering)
 
 
 # ---------- Função Pública: run_minigame_selector (ASYNC) ----------
 async def run_minigame_selector(screen):
     ui = FreeModeUI(screen)
-    clock = pygame.time.Clock()
     audio_manager.fade_to_music("menu")
 
     running = True
     while running:
-        dt = clock.tick(60)
         mouse_pos = pygame.mouse.get_pos()
 
-        ui.draw(dt, mouse_pos)
-        pygame.display.flip()
+        instrumentation.mark("update")
+        ui.draw(mouse_pos)
+        instrumentation.mark("draw")
         
         # OBRIGATÓRIO NA WEB
-        await asyncio.sleep(0)
+        await scene_manager.frame(present=ui.dirty.present)
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-                
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_F11:
-                    pygame.display.toggle_fullscreen()
-                    screen = pygame.display.get_surface()
-                    ui.resize(screen)
-                elif event.key == pygame.K_ESCAPE:
-                    return
+        for event in input_manager.poll():
+            if event.type == input_manager.RESIZED:
+                screen = pygame.display.get_surface()
+                ui.resize(screen)
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                return
 
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 # 1. Botões de Jogo
@@ -261,7 +235,7 @@ async def run_minigame_selector(screen):
                         
                         try:
                             # ATENÇÃO: CHAMADA ASYNC DO MINIGAME
-                            await btn.action(screen)
+                            await scene_manager.call(btn.action(screen))
                         except Exception as e:
                             print(f"Erro no minigame: {e}")
                         
@@ -280,21 +254,14 @@ async def run_minigame_selector(screen):
 
 # ---------- UI da Seleção de Modo (ASYNC) ----------
 async def escolher_modo(screen):
-    clock = pygame.time.Clock()
     w, h = screen.get_size()
     
     font_title = load_font(int(h * 0.08))
     font_btn = load_font(int(h * 0.05))
     
     base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    try:
-        bg_path = os.path.join(base, "assets", "background", "game_modo.png")
-        raw = pygame.image.load(bg_path).convert()
-        bg = pygame.transform.smoothscale(raw, (w, h))
-        bg = _blur_surface(bg, 10)
-    except:
-        bg = pygame.Surface((w, h))
-        bg.fill((20, 20, 40))
+    bg_path = os.path.join(base, "assets", "background", "game_modo.png")
+    bg = derived_assets.background(bg_path, (w, h), blur=performance.blur_strength(10), fallback=(20, 20, 40))
 
     cx = w // 2
     cy = h // 2
@@ -304,41 +271,44 @@ async def escolher_modo(screen):
     btn_livre = AnimButton("Modo Livre", (cx, cy + 60), font_btn, (60, 100, 200), (100, 140, 240), fixed_size=main_btn_size)
     btn_voltar = AnimButton("RETORNAR AO MENU", (cx, h - 80), font_btn, (80, 80, 80), (120, 120, 120), fixed_size=(int(w * 0.3), int(h * 0.08)))
 
+    # Tela estática: com dirty rects só o hover dos botões é apresentado
+    dirty = DirtyRects(screen)
+
+    def relayout():
+        """Relê a tela (resize ou volta do Modo Livre) e redesenha tudo."""
+        nonlocal screen, w, h, bg, cx, cy
+        screen = pygame.display.get_surface()
+        w, h = screen.get_size()
+        bg = derived_assets.background(bg_path, (w, h), blur=performance.blur_strength(10), fallback=(20, 20, 40))
+        dirty.invalidate()
+        cx, cy = w // 2, h // 2
+        main_btn_size = (int(w * 0.4), int(h * 0.12))
+        btn_campanha.update_pos((cx, cy - 60), fixed_size=main_btn_size)
+        btn_livre.update_pos((cx, cy + 60), fixed_size=main_btn_size)
+        btn_voltar.update_pos((cx, h - 80), fixed_size=(int(w * 0.3), int(h * 0.08)))
+
     running = True
     while running:
-        clock.tick(60)
         mouse_pos = pygame.mouse.get_pos()
         
-        screen.blit(bg, (0, 0))
+        instrumentation.mark("update")
+        image_ops.blit(screen, bg.surface, (0, 0))
+        dirty.widget("bg", screen.get_rect(), bg.ready)
         
-        ts = font_title.render("ESCOLHA O MODO DE JOGO", True, (255, 255, 255))
+        ts = render_text(font_title, "ESCOLHA O MODO DE JOGO", (255, 255, 255))
         tr = ts.get_rect(center=(cx, int(h * 0.15)))
-        screen.blit(ts, tr)
-        
-        btn_campanha.draw(screen, mouse_pos)
-        btn_livre.draw(screen, mouse_pos)
-        btn_voltar.draw(screen, mouse_pos)
+        image_ops.blit(screen, ts, tr)
         
-        pygame.display.flip()
+        for btn in (btn_campanha, btn_livre, btn_voltar):
+            dirty.widget(btn.text, btn.draw(screen, mouse_pos), btn.hovering)
+        instrumentation.mark("draw")
         
         # OBRIGATÓRIO NA WEB
-        await asyncio.sleep(0)
+        await scene_manager.frame(present=dirty.present)
         
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
-                pygame.display.toggle_fullscreen()
-                screen = pygame.display.get_surface()
-                w, h = screen.get_size()
-                bg = pygame.transform.smoothscale(raw, (w, h))
-                bg = _blur_surface(bg, 10)
-                cx, cy = w // 2, h // 2
-                main_btn_size = (int(w * 0.4), int(h * 0.12))
-                btn_campanha.update_pos((cx, cy - 60), fixed_size=main_btn_size)
-                btn_livre.update_pos((cx, cy + 60), fixed_size=main_btn_size)
-                btn_voltar.update_pos((cx, h - 80), fixed_size=(int(w * 0.3), int(h * 0.08)))
+        for event in input_manager.poll():
+            if event.type == input_manager.RESIZED:
+                relayout()
 
             if btn_campanha.clicked(event):
                 return "campanha"
@@ -348,7 +318,8 @@ async def escolher_modo(screen):
                 result = await run_minigame_selector(screen)
                 if result == "menu_principal":
                     return None
-                screen = pygame.display.get_surface()
+                # A tela do Modo Livre ficou no buffer (e pode ter mudado de tamanho)
+                relayout()
             
             if btn_voltar.clicked(event):
                 return None
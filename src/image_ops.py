@@ -0,0 +1,238 @@
+#=========================================================
+#   OPERAÇÕES DE IMAGEM VETORIZADAS (COM CACHE)
+#=========================================================
+
+"""
+Recolorir, escurecer e gerar gradientes sem laços por pixel.
+
+Tudo é feito com flags de blend do próprio pygame ou com surfarray/NumPy.
+As funções que devolvem superfícies novas guardam o resultado num LRU
+(por superfície de origem + parâmetros), então chamar de novo no mesmo
+tamanho custa só uma consulta ao dicionário. Os resultados são
+compartilhados: não altere.
+
+shade() é a exceção: escurece a superfície de destino no lugar, para os
+overlays de tela cheia que antes alocavam uma Surface SRCALPHA por frame.
+Ele blita uma superfície sólida em cache com alpha de superfície (fill com
+BLEND_RGB_MULT/ADD parece mais barato, mas não tem caminho SIMD no pygame
+e custa ~8x mais numa tela 720p).
+
+As funções de ALOCAÇÃO E BLIT (new_surface, copy, scale, smoothscale,
+rotate, rotozoom, blit) são os equivalentes diretos do pygame, sem cache,
+que somam "surfaces" / "blits" na instrumentação. Cenas e helpers passam
+por elas para que os contadores do frame cubram o jogo todo; com a
+instrumentação desligada, o custo extra é uma chamada vazia.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from src import instrumentation
+
+# Orçamento dos resultados em cache (bytes)
+MAX_BYTES = 32 * 1024 * 1024
+
+_cache = OrderedDict()
+_bytes = 0
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "evicted": 0,
+}
+
+
+def _surface_bytes(surf):
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+def _cached(key, build):
+    global _bytes
+    surf = _cache.get(key)
+    if surf is not None:
+        _cache.move_to_end(key)
+        _stats["hits"] += 1
+        return surf
+
+    _stats["misses"] += 1
+    surf = build()
+    instrumentation.count("surfaces")
+    _cache[key] = surf
+    _bytes += _surface_bytes(surf)
+    while _bytes > MAX_BYTES and len(_cache) > 1:
+        _, old = _cache.popitem(last=False)
+        _bytes -= _surface_bytes(old)
+        _stats["evicted"] += 1
+    return surf
+
+
+# ---------------------------------------------------------
+# RECOLORIR
+# ---------------------------------------------------------
+def tint(surface, color):
+    """Mesma silhueta (alpha) com todos os pixels em `color`."""
+    color = tuple(color)[:3]
+
+    def build():
+        surf = surface.convert_alpha()
+        if surf is surface:
+            surf = surface.copy()
+        # Zera RGB mantendo o alpha, depois soma a cor
+        surf.fill((0, 0, 0, 255), special_flags=pygame.BLEND_RGBA_MULT)
+        surf.fill(color + (0,), special_flags=pygame.BLEND_RGBA_ADD)
+        return surf
+
+    return _cached(("tint", surface, color), build)
+
+
+def whiten(surface):
+    """Ícone branco com o alpha original (botões do menu)."""
+    return tint(surface, (255, 255, 255))
+
+
+def glow_mask(surface, color, threshold=127):
+    """Silhueta sólida em `color` onde o alpha passa de `threshold`.
+
+    Equivale a mask.from_surface(...).to_surface(setcolor=color), usado
+    como brilho atrás de ícones.
+    """
+    color = tuple(color)
+    if len(color) == 3:
+        color += (255,)
+
+    def build():
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        inside = alpha > threshold
+        del alpha  # libera o lock da superfície de origem
+
+        surf = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        surf.fill(color[:3] + (0,))
+        out = pygame.surfarray.pixels_alpha(surf)
+        out[inside] = color[3]
+        del out
+        return surf
+
+    return _cached(("glow", surface, color, threshold), build)
+
+
+# ---------------------------------------------------------
+# ESCURECER
+# ---------------------------------------------------------
+def solid(size, color):
+    """Superfície opaca de uma cor só (base dos overlays)."""
+    size = (max(1, int(size[0])), max(1, int(size[1])))
+    color = tuple(color)[:3]
+
+    def build():
+        surf = pygame.Surface(size).convert()
+        surf.fill(color)
+        return surf
+
+    return _cached(("solid", size, color), build)
+
+
+def shade(surface, color, alpha, rect=None):
+    """Escurece/tinge `surface` no lugar, como blitar um overlay (cor, alpha).
+
+    A superfície sólida em cache é só deste módulo, então o set_alpha
+    antes do blit é seguro.
+    """
+    alpha = max(0, min(255, int(alpha)))
+    if alpha == 0:
+        return
+    overlay = solid(surface.get_size(), color)
+    overlay.set_alpha(alpha)
+    if rect is None:
+        surface.blit(overlay, (0, 0))
+    else:
+        rect = pygame.Rect(rect)
+        surface.blit(overlay, rect.topleft, pygame.Rect(0, 0, rect.width, rect.height))
+    instrumentation.count("blits")
+
+
+def darken(surface, color=(0, 0, 0), alpha=100):
+    """Cópia em cache de `surface` com shade() aplicado (fundos fixos)."""
+    color = tuple(color)[:3]
+
+    def build():
+        surf = surface.copy()
+        shade(surf, color, alpha)
+        return surf
+
+    return _cached(("darken", surface, color, int(alpha)), build)
+
+
+# ---------------------------------------------------------
+# GRADIENTE
+# ---------------------------------------------------------
+def gradient(size, top, bottom):
+    """Gradiente vertical de `top` para `bottom` (RGB), opaco."""
+    size = (max(1, int(size[0])), max(1, int(size[1])))
+    top, bottom = tuple(top)[:3], tuple(bottom)[:3]
+
+    def build():
+        w, h = size
+        t = np.linspace(0.0, 1.0, h, endpoint=False)[:, None]
+        column = np.array(top) * (1.0 - t) + np.array(bottom) * t
+        pixels = np.broadcast_to(column.astype(np.uint8)[None, :, :], (w, h, 3))
+        return pygame.surfarray.make_surface(np.ascontiguousarray(pixels)).convert()
+
+    return _cached(("gradient", size, top, bottom), build)
+
+
+# ---------------------------------------------------------
+# ALOCAÇÃO E BLIT (CONTADOS NA INSTRUMENTAÇÃO)
+# ---------------------------------------------------------
+def new_surface(size, flags=0):
+    """pygame.Surface(size, flags)."""
+    instrumentation.count("surfaces")
+    return pygame.Surface(size, flags)
+
+
+def copy(surface):
+    instrumentation.count("surfaces")
+    return surface.copy()
+
+
+def scale(surface, size):
+    instrumentation.count("surfaces")
+    return pygame.transform.scale(surface, size)
+
+
+def smoothscale(surface, size):
+    instrumentation.count("surfaces")
+    return pygame.transform.smoothscale(surface, size)
+
+
+def rotate(surface, angle):
+    instrumentation.count("surfaces")
+    return pygame.transform.rotate(surface, angle)
+
+
+def rotozoom(surface, angle, scale):
+    instrumentation.count("surfaces")
+    return pygame.transform.rotozoom(surface, angle, scale)
+
+
+def blit(target, source, dest, area=None, special_flags=0):
+    """target.blit(...); devolve o Rect afetado."""
+    instrumentation.count("blits")
+    return target.blit(source, dest, area, special_flags)
+
+
+# ---------------------------------------------------------
+# CONTADORES
+# ---------------------------------------------------------
+def stats():
+    info = dict(_stats)
+    info["entries"] = len(_cache)
+    info["bytes"] = _bytes
+    return info
+
+
+def clear():
+    global _bytes
+    _cache.clear()
+    _bytes = 0
@@ -0,0 +1,165 @@
+#=========================================================
+#   GERENCIADOR CENTRAL DE ENTRADA (EVENTOS)
+#=========================================================
+
+"""
+InputManager – uma única leitura da fila de eventos por frame
+--------------------------------------------------------------
+- poll(): esvazia a fila do pygame uma vez, junta rajadas de MOUSEMOTION
+  num único evento e trata o que é global (fechar a janela e F11). Cada
+  loop de cena chama poll() uma vez por frame no lugar de
+  pygame.event.get() e trata só o que é seu.
+- F11 e redimensionamento da janela viram um evento RESIZED (com o
+  atributo `size`), para a cena refazer o layout sem copiar o código do
+  toggle em todo loop.
+- Tipos que nenhuma cena usa são bloqueados com pygame.event.set_allowed e
+  nem chegam à fila.
+- add_quit_hook(): algo a fazer antes de fechar (ex.: salvar as
+  configurações abertas).
+- quit(): roda os hooks e fecha o jogo. É a única saída: o QUIT da janela
+  e o ESC / "Sair" do menu passam por aqui.
+- add_key_hook(): tecla global (ex.: F3 do overlay de desempenho),
+  tratada aqui e que não chega às cenas.
+- stats(): eventos processados por frame (e quantos movimentos de mouse
+  foram descartados na junção).
+"""
+
+import sys
+
+import pygame
+
+from src import instrumentation, replay
+
+# Evento sintético: a superfície da tela mudou (F11 / janela redimensionada)
+RESIZED = pygame.event.custom_type()
+
+# Tipos que chegam às cenas (o resto é bloqueado na fila do SDL)
+ALLOWED = [
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEMOTION,
+    pygame.VIDEORESIZE,
+    pygame.WINDOWSIZECHANGED,
+    RESIZED,
+]
+
+
+class _InputManager:
+    RESIZED = RESIZED
+
+    def __init__(self):
+        self._ready = False
+        self._quit_hooks = []
+        self._key_hooks = {}
+        self._stats = {
+            "frames": 0,
+            "events": 0,        # entregues às cenas
+            "raw": 0,           # lidos da fila do pygame
+            "coalesced": 0,     # MOUSEMOTION descartados na junção
+            "last_frame": 0,
+            "max_frame": 0,
+        }
+
+    # ==========================================================
+    # CONFIGURAÇÃO
+    # ==========================================================
+    def init(self):
+        """Filtra a fila do SDL. Chamado no boot (ou no primeiro poll())."""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(ALLOWED)
+        self._ready = True
+
+    # ==========================================================
+    # LEITURA POR FRAME
+    # ==========================================================
+    def poll(self):
+        """Eventos do frame, já filtrados e com o tratamento global feito."""
+        with instrumentation.phase("event"):
+            return self._poll()
+
+    def _poll(self):
+        if not self._ready:
+            self.init()
+
+        # Gravação / replay de sessão (src/replay.py); desligado, repassa a fila
+        raw = replay.events(pygame.event.get())
+        events = []
+        resized = False
+
+        for ev in raw:
+            if ev.type == pygame.QUIT:
+                self.quit()
+
+            if ev.type == pygame.KEYDOWN and ev.key == pygame.K_F11:
+                try:
+                    pygame.display.toggle_fullscreen()
+                    resized = True
+                except pygame.error:
+                    pass  # driver sem suporte (ex.: headless)
+                continue
+
+            if ev.type == pygame.KEYDOWN and ev.key in self._key_hooks:
+                self._key_hooks[ev.key]()
+                continue
+
+            if ev.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED):
+                resized = True
+                continue
+
+            if ev.type == pygame.MOUSEMOTION and events and events[-1].type == pygame.MOUSEMOTION:
+                # Rajada de movimento: fica só a última posição, com o deslocamento somado
+                prev = events[-1]
+                rel = (prev.rel[0] + ev.rel[0], prev.rel[1] + ev.rel[1])
+                events[-1] = pygame.event.Event(pygame.MOUSEMOTION, pos=ev.pos, rel=rel,
+                                                buttons=ev.buttons, touch=getattr(ev, "touch", False))
+                self._stats["coalesced"] += 1
+                continue
+
+            events.append(ev)
+
+        if resized:
+            surface = pygame.display.get_surface()
+            events.append(pygame.event.Event(RESIZED, size=surface.get_size() if surface else (0, 0)))
+
+        n = len(events)
+        self._stats["frames"] += 1
+        self._stats["raw"] += len(raw)
+        self._stats["events"] += n
+        self._stats["last_frame"] = n
+        self._stats["max_frame"] = max(self._stats["max_frame"], n)
+        instrumentation.count("events", n)
+        return events
+
+    def quit(self):
+        """Roda os hooks de saída (mais recentes primeiro) e fecha o jogo."""
+        for hook in reversed(self._quit_hooks):
+            hook()
+        pygame.quit(); sys.exit()
+
+    def add_quit_hook(self, hook):
+        self._quit_hooks.append(hook)
+
+    def remove_quit_hook(self, hook):
+        if hook in self._quit_hooks:
+            self._quit_hooks.remove(hook)
+
+    def add_key_hook(self, key, hook):
+        """hook() roda quando `key` é apertada, em qualquer cena."""
+        self._key_hooks[key] = hook
+
+    # ==========================================================
+    # CONTADORES
+    # ==========================================================
+    def events_last_frame(self):
+        return self._stats["last_frame"]
+
+    def stats(self):
+        info = dict(self._stats)
+        frames = max(1, info["frames"])
+        info["per_frame"] = info["events"] / frames
+        return info
+
+
+input_manager = _InputManager()
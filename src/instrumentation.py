@@ -0,0 +1,319 @@
+#=========================================================
+#   INSTRUMENTAÇÃO (TEMPOS, CONTADORES E TRACE POR FRAME)
+#=========================================================
+
+"""
+Medição leve de onde vai o tempo de cada frame.
+
+- Fases por frame e por cena, registradas pelo scene_manager:
+    event   - input_manager.poll()
+    update  - lógica da cena
+    draw    - Scene.draw(). Os loops em corrotina (CoroutineScene) marcam
+              o próprio desenho: mark("update") onde a lógica do frame
+              termina (partículas, timers e estado avançados antes do
+              primeiro blit) e mark("draw") antes do
+              `await scene_manager.frame()`
+    present - flip / dirty rects
+    pump    - fim de frame dos caches, fundos derivados e preloads
+    sleep   - asyncio.sleep(0) + espera do Clock
+    overlay - overlay de desempenho (F3), só quando aberto
+- count(nome, n): contadores somados por frame (superfícies alocadas,
+  renders de texto, blits...). "surfaces" e "blits" vêm dos helpers
+  contados do image_ops e dos caches (sprite_cache, text_cache,
+  asset_manager); o overlay F3 e a calibração ficam de fora.
+- gauge(nome, valor): último valor de algo (FPS alvo, ticks, bytes...).
+- timer(nome): `with instrumentation.timer("x"):` para trechos avulsos.
+- report(): p50/p95/p99 das janelas móveis de cada fase (e do frame
+  inteiro, "frame") e de cada timer.
+- Trace JSONL: uma linha por frame (fases, contadores do frame, gauges),
+  para comparar builds com diff / scripts.
+
+Desligado (padrão), as funções públicas deste módulo são trocadas por
+versões vazias: o custo em cada ponto de medição é uma chamada que não
+faz nada. Ligar: enable() ou, pelo main.py, as variáveis de ambiente
+PARTY_PASCAL_INSTRUMENT=1 e PARTY_PASCAL_TRACE=arquivo.jsonl.
+"""
+
+import json
+import os
+import time
+from collections import deque
+
+# Frames guardados para os percentis
+WINDOW = 600
+
+# Frames entre cada flush do trace
+TRACE_FLUSH_FRAMES = 60
+
+PHASES = ("event", "update", "draw", "present", "pump", "sleep", "overlay")
+
+enabled = False
+
+_clock = time.perf_counter
+
+
+def percentiles(values, points=(50, 95, 99)):
+    """{"p50": ..., "p95": ..., "p99": ...} por vizinho mais próximo."""
+    if not values:
+        return {f"p{p}": 0.0 for p in points}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {f"p{p}": ordered[min(last, int(round(p / 100.0 * last)))] for p in points}
+
+
+# ---------------------------------------------------------
+# ESTADO (só usado com a instrumentação ligada)
+# ---------------------------------------------------------
+class _State:
+    def __init__(self):
+        self.frames = 0
+        self.scenes = {}          # cena -> fase -> deque(ms)
+        self.timers = {}          # nome -> deque(ms)
+        self.counters = {}        # totais
+        self.frame_counters = {}  # só do frame atual
+        self.last_counters = {}
+        self.last_phases = {}
+        self.gauges = {}
+        self.trace = None
+        self.pending = 0
+        self.current = None
+
+    def series(self, scene, phase):
+        phases = self.scenes.get(scene)
+        if phases is None:
+            phases = self.scenes[scene] = {}
+        values = phases.get(phase)
+        if values is None:
+            values = phases[phase] = deque(maxlen=WINDOW)
+        return values
+
+
+_state = _State()
+
+
+class _Frame:
+    """Um frame em medição: mark(fase) fecha a fase desde a última marca."""
+
+    __slots__ = ("scene", "phases", "_last", "_nested")
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.phases = {}
+        self._last = _clock()
+        self._nested = 0.0
+
+    def mark(self, phase):
+        now = _clock()
+        ms = (now - self._last) * 1000 - self._nested
+        self.phases[phase] = self.phases.get(phase, 0.0) + max(0.0, ms)
+        self._last = now
+        self._nested = 0.0
+
+    def add(self, phase, ms):
+        """Fase medida por dentro de outra (ex.: event dentro de update)."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + ms
+        self._nested += ms
+
+    def end(self, scene=None):
+        s = _state
+        if scene is not None:
+            self.scene = scene
+        s.frames += 1
+        for phase, ms in self.phases.items():
+            s.series(self.scene, phase).append(ms)
+        s.series(self.scene, "frame").append(sum(self.phases.values()))
+        if s.trace is not None:
+            line = {
+                "f": s.frames,
+                "scene": self.scene,
+                "ms": {k: round(v, 4) for k, v in self.phases.items()},
+                "counters": s.frame_counters,
+                "gauges": dict(s.gauges),
+            }
+            s.trace.write(json.dumps(line, separators=(",", ":")) + "\n")
+            s.pending += 1
+            if s.pending >= TRACE_FLUSH_FRAMES:
+                s.trace.flush()
+                s.pending = 0
+        s.last_counters = s.frame_counters
+        s.last_phases = self.phases
+        s.frame_counters = {}
+        s.current = None
+
+
+class _Phase:
+    """Context manager de uma fase aninhada no frame atual."""
+
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._start = _clock()
+        return self
+
+    def __exit__(self, *exc):
+        frame = _state.current
+        if frame is not None:
+            frame.add(self.name, (_clock() - self._start) * 1000)
+        return False
+
+
+class _Timer:
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._start = _clock()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (_clock() - self._start) * 1000
+        values = _state.timers.get(self.name)
+        if values is None:
+            values = _state.timers[self.name] = deque(maxlen=WINDOW)
+        values.append(ms)
+        return False
+
+
+# ---------------------------------------------------------
+# VERSÕES VAZIAS (instrumentação desligada)
+# ---------------------------------------------------------
+class _Null:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mark(self, phase):
+        pass
+
+    def add(self, phase, ms):
+        pass
+
+    def end(self, scene=None):
+        pass
+
+
+_NULL = _Null()
+
+
+def _null_frame(scene):
+    return _NULL
+
+
+def _null_ctx(name):
+    return _NULL
+
+
+def _null_mark(phase):
+    pass
+
+
+def _null_count(name, n=1):
+    pass
+
+
+def _null_gauge(name, value):
+    pass
+
+
+# ---------------------------------------------------------
+# VERSÕES REAIS
+# ---------------------------------------------------------
+def _real_frame(scene):
+    frame = _state.current = _Frame(scene)
+    return frame
+
+
+def _real_mark(phase):
+    frame = _state.current
+    if frame is not None:
+        frame.mark(phase)
+
+
+def _real_count(name, n=1):
+    s = _state
+    s.counters[name] = s.counters.get(name, 0) + n
+    s.frame_counters[name] = s.frame_counters.get(name, 0) + n
+
+
+def _real_gauge(name, value):
+    _state.gauges[name] = value
+
+
+# API pública (trocada por enable()/disable())
+frame = _null_frame
+phase = _null_ctx
+mark = _null_mark
+timer = _null_ctx
+count = _null_count
+gauge = _null_gauge
+
+
+# ---------------------------------------------------------
+# LIGAR / DESLIGAR
+# ---------------------------------------------------------
+def enable(trace_path=None):
+    global enabled, frame, phase, mark, timer, count, gauge
+    enabled = True
+    frame, phase, mark, timer = _real_frame, _Phase, _real_mark, _Timer
+    count, gauge = _real_count, _real_gauge
+    if trace_path and _state.trace is None:
+        _state.trace = open(trace_path, "w", encoding="utf-8")
+
+
+def disable():
+    global enabled, frame, phase, mark, timer, count, gauge
+    enabled = False
+    frame, phase, mark, timer = _null_frame, _null_ctx, _null_mark, _null_ctx
+    count, gauge = _null_count, _null_gauge
+    if _state.trace is not None:
+        _state.trace.close()
+        _state.trace = None
+    _state.current = None
+
+
+def enable_from_env():
+    """PARTY_PASCAL_INSTRUMENT=1 liga; PARTY_PASCAL_TRACE=arquivo grava o JSONL."""
+    trace_path = os.environ.get("PARTY_PASCAL_TRACE")
+    if os.environ.get("PARTY_PASCAL_INSTRUMENT") or trace_path:
+        enable(trace_path)
+
+
+def reset():
+    trace = _state.trace
+    _state.__init__()
+    _state.trace = trace
+
+
+# ---------------------------------------------------------
+# RELATÓRIO
+# ---------------------------------------------------------
+def report():
+    s = _state
+    scenes = {}
+    for scene, phases in s.scenes.items():
+        scenes[scene] = {name: percentiles(values) for name, values in phases.items()}
+    return {
+        "frames": s.frames,
+        "scenes": scenes,
+        "timers": {name: percentiles(values) for name, values in s.timers.items()},
+        "counters": dict(s.counters),
+        "gauges": dict(s.gauges),
+    }
+
+
+def last_frame_counters():
+    return dict(_state.last_counters)
+
+
+def last_frame_phases():
+    """Tempo (ms) de cada fase no último frame fechado."""
+    return dict(_state.last_phases)
@@ -7,45 +7,49 @@
 # ✔ Correção: Loop principal com await asyncio.sleep(0)
 # ===========================================================
 
-import asyncio  # <--- 1. IMPORT OBRIGATÓRIO
 import pygame
-import random
-import sys
 import os
 import math
-from src.utils import show_pause_screen, draw_score_display
+from src.utils import show_pause_screen, draw_score_display, render_text
 from src.score_manager import ScoreManager
 from src.audio_manager import AudioManager
 import src.difficulty_manager as dm
+from src import performance, instrumentation
+from src.input_manager import input_manager
+from src.scene_manager import scene_manager, TICK
+from src.asset_manager import asset_manager
+from src import image_ops
+from src.particle_system import ParticleSystem
+from src.minigames.models import NavalModel
 
 # === SISTEMA DE PARTÍCULAS DE ÁGUA ===
-class WaterParticle:
-    def __init__(self, screen_w, screen_h):
-        self.screen_w = screen_w
-        self.screen_h = screen_h
-        self.x = random.uniform(0, screen_w)
-        self.y = random.uniform(0, screen_h)
-        self.radius = random.randint(2, 5)
-        self.speed = random.uniform(0.15, 0.7)
-        self.alpha = random.randint(30, 110)
-        self.dir_x = random.uniform(-0.25, 0.25)
-        self.dir_y = random.uniform(-0.05, 0.2)
-        self.osc = random.uniform(0, 6.28)
-
-    def update(self):
-        self.x += self.dir_x + math.sin(self.osc) * 0.12
-        self.y += self.dir_y
-        self.osc += 0.04
-        if self.x < -10: self.x = self.screen_w + 10
-        if self.x > self.screen_w + 10: self.x = -10
-        if self.y < -10: self.y = self.screen_h + 10
-        if self.y > self.screen_h + 10: self.y = -10
-
-    def draw(self, surface):
-        water_color = (160, 200, 255, self.alpha)
-        s = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, water_color, (self.radius, self.radius), self.radius)
-        surface.blit(s, (int(self.x - self.radius), int(self.y - self.radius)))
+# Durações dos efeitos foram ajustadas em frames de 60 FPS; a simulação
+# avança pelos ticks fixos do scene_manager
+FRAME_DT = 1 / 60
+
+def water_particles(screen_w, screen_h):
+    return ParticleSystem(
+        performance.particle_count(40),
+        palette=[(160, 200, 255)],
+        anchor="center",
+        bounds=(-10, -10, screen_w + 10, screen_h + 10),
+        wrap=True,
+        spawn={
+            "x": (0, screen_w), "y": (0, screen_h),
+            "size": [2, 3, 4, 5],
+            "alpha": (30, 110),
+            "vx": (-15, 15), "vy": (-3, 12),
+            "sway": 7.2, "sway_freq": 2.4, "phase": (0, 6.28),
+        },
+    )
+
+def splash_particles():
+    # Anéis que se expandem e somem (life/fade em segundos, base 60 FPS)
+    return ParticleSystem(
+        64, shape="ring", palette=[(180, 220, 255)], anchor="center",
+        on_exit="kill", fill=False,
+        spawn={"fade": 750},
+    )
 
 GRID_SIZE = 5
 MARGIN = 10
@@ -74,12 +78,18 @@ BANCO_AMEACAS = [
     ("Bypass de Auth", "Testes de Intrusão (Pentest)")
 ]
 
+# ===========================================================
+#               MODELO (REGRAS SEM PYGAME)
+# ===========================================================
+def criar_modelo(rules, rng=None):
+    """NavalModel com "navio_qtd" ameaças do banco (regras do difficulty_manager)."""
+    return NavalModel(BANCO_AMEACAS, rules["navio_qtd"], GRID_SIZE, rng=rng)
+
 # ===========================================================
 #               FUNÇÃO PRINCIPAL (ASYNC)
 # ===========================================================
 async def run_batalha_naval(screen):  # <--- 2. ASYNC DEF
     pygame.display.set_caption("⚓ Batalha Naval - Controles e Ameaças ⚓")
-    clock = pygame.time.Clock()
 
     # === PATHS ===
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -87,13 +97,9 @@ async def run_batalha_naval(screen):  # <--- 2. ASYNC DEF
     bg_path = os.path.join(assets_dir, "background", "background_batalha_naval.png")
     icon_path = os.path.join(assets_dir, "icons", "naval.png")
     
-    bg_original = None
-    if os.path.exists(bg_path):
-        bg_original = pygame.image.load(bg_path).convert()
+    bg_original = asset_manager.load(bg_path)
     
-    icon_original = None
-    if os.path.exists(icon_path):
-        icon_original = pygame.image.load(icon_path).convert_alpha()
+    icon_original = asset_manager.load(icon_path, alpha=True)
 
     # Variáveis de layout
     layout = {}
@@ -103,14 +109,14 @@ async def run_batalha_naval(screen):  # <--- 2. ASYNC DEF
         w, h = surface.get_size()
         
         if bg_original:
-            layout['bg'] = pygame.transform.scale(bg_original, (w, h))
+            layout['bg'] = asset_manager.scaled(bg_path, (w, h), filter="fast")
         else:
-            layout['bg'] = pygame.Surface((w, h))
+            layout['bg'] = image_ops.new_surface((w, h))
             layout['bg'].fill((5, 20, 40))
             
         if icon_original:
             size = int(h * 0.08)
-            layout['icon'] = pygame.transform.smoothscale(icon_original, (size, size))
+            layout['icon'] = asset_manager.scaled(icon_path, (size, size), alpha=True)
         else:
             layout['icon'] = None
             
@@ -127,21 +133,12 @@ async def run_batalha_naval(screen):  # <--- 2. ASYNC DEF
 
     resize_assets(screen)
     
-    water_particles = [WaterParticle(screen.get_width(), screen.get_height()) for _ in range(40)]
-    splashes = [] 
+    water = water_particles(screen.get_width(), screen.get_height())
+    splashes = splash_particles()
 
-    # === CONFIGURAÇÃO DE DIFICULDADE ===
-    qtd_navios_solicitada = dm.get_batalha_naval_threats()
-    max_possible = min(GRID_SIZE * GRID_SIZE, len(BANCO_AMEACAS))
-    qtd_navios = min(qtd_navios_solicitada, max_possible)
-    
-    # Randomização
-    ameacas_rodada = random.sample(BANCO_AMEACAS, qtd_navios)
-    grid = [[" " for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-    navios_indices = random.sample(range(GRID_SIZE * GRID_SIZE), qtd_navios)
-    navios_pos = {pos: ameacas_rodada[i] for i, pos in enumerate(navios_indices)}
+    # === TABULEIRO (sorteio e pontos ficam no modelo) ===
+    naval = criar_modelo(dm.get_rules())
 
-    reveladas = set()
     efeitos = []
     jogo_ativo = True
     frame = 0
@@ -151,43 +148,29 @@ async def run_batalha_naval(screen):  # <--- 2. ASYNC DEF
         efeitos.append({"tipo": tipo, "pos": pos, "tempo": 0, "max_tempo": 22})
 
     def criar_splash(cx, cy):
-        spl = {"x": cx, "y": cy, "r": 6, "alpha": 200, "life": 0, "max_life": 16, "spread": random.uniform(0.8, 1.6)}
-        splashes.append(spl)
-        for _ in range(6):
-            wp = {"x": cx + random.uniform(-6, 6), "y": cy + random.uniform(-6, 6), "r": random.randint(1, 3),
-                  "alpha": random.randint(160, 240), "dx": random.uniform(-1.6, 1.6), "dy": random.uniform(-0.8, -0.1),
-                  "life": 0, "max_life": random.randint(18, 26), "dx": 0}
-            splashes.append(wp)
+        splashes.emit(1, x=cx, y=cy, size=6, alpha=200, grow=(43.2, 86.4), life=16 * FRAME_DT)
+        splashes.emit(6, x=(cx - 6, cx + 6), y=(cy - 6, cy + 6), size=[1, 2, 3],
+                      alpha=(160, 240), grow=54, life=(18 * FRAME_DT, 26 * FRAME_DT))
 
     # ========================= LOOP PRINCIPAL ================================
     while jogo_ativo:
-        frame += 1
+        ticks = scene_manager.ticks
+        frames = ticks * TICK / FRAME_DT      # frames de 60 FPS neste frame
+        frame += frames
         mouse_pos = pygame.mouse.get_pos()
         
         CELL_SIZE = layout['CELL_SIZE']
         offset_x = layout['offset_x']
         offset_y = layout['offset_y']
 
-        for p in water_particles: p.update()
-
-        new_splashes = []
-        for s in splashes:
-            if "dx" in s and s["dx"] != 0:
-                s["x"] += s["dx"]; s["y"] += s["dy"]; s["dy"] += 0.06
-                s["life"] += 1; s["alpha"] = max(0, s["alpha"] - (255 / s["max_life"]))
-                if s["life"] < s["max_life"]: new_splashes.append(s)
-            else:
-                s["life"] += 1; s["r"] += 0.9 * s.get("spread", 1)
-                s["alpha"] = max(0, s["alpha"] - (200 / s["max_life"]))
-                if s["life"] < s["max_life"]: new_splashes.append(s)
-        splashes = new_splashes
+        water.advance(ticks, TICK)
+        splashes.advance(ticks, TICK)
 
-        screen.blit(layout['bg'], (0, 0))
-        for p in water_particles: p.draw(screen)
+        instrumentation.mark("update")
+        image_ops.blit(screen, layout['bg'], (0, 0))
+        water.draw(screen, interp=scene_manager.alpha)
 
-        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 50, 120))
-        screen.blit(overlay, (0, 0))
+        image_ops.shade(screen, (0, 0, 50), 120)
 
         # Título Animado
         title_animation_time = frame
@@ -195,17 +178,16 @@ async def run_batalha_naval(screen):  # <--- 2. ASYNC DEF
         slide_offset = max(0, 30 - title_animation_time * 0.7)
         alpha = min(255, max(0, title_animation_time * 10))
 
-        title_surf = layout['font_title'].render("Batalha Naval", True, (255, 255, 255))
-        title_shadow = layout['font_title'].render("Batalha Naval", True, (0, 0, 0))
-        title_surf.set_alpha(alpha); title_shadow.set_alpha(alpha)
+        title_surf = render_text(layout['font_title'], "Batalha Naval", (255, 255, 255), alpha=alpha)
+        title_shadow = render_text(layout['font_title'], "Batalha Naval", (0, 0, 0), alpha=alpha)
         
         title_rect = title_surf.get_rect(center=(screen.get_width() // 2, 60 - slide_offset + float_offset))
-        screen.blit(title_shadow, (title_rect.x+3, title_rect.y+3))
-        screen.blit(title_surf, title_rect)
+        image_ops.blit(screen, title_shadow, (title_rect.x+3, title_rect.y+3))
+        image_ops.blit(screen, title_surf, title_rect)
 
         if layout['icon']:
-            screen.blit(layout['icon'], (title_rect.left - layout['icon'].get_width() - 15, title_rect.top))
-            screen.blit(layout['icon'], (title_rect.right + 15, title_rect.top))
+            image_ops.blit(screen, layout['icon'], (title_rect.left - layout['icon'].get_width() - 15, title_rect.top))
+            image_ops.blit(screen, layout['icon'], (title_rect.right + 15, title_rect.top))
 
         # Tabuleiro
         for row in range(GRID_SIZE):
@@ -214,12 +196,12 @@ async def run_batalha_naval(screen):  # <--- 2. ASYNC DEF
                 y = offset_y + row * (CELL_SIZE + MARGIN)
                 rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
 
-                is_interactive = (row, col) not in reveladas and grid[row][col] != "X"
+                is_interactive = naval.aberta(row, col)
                 is_hovered = rect.collidepoint(mouse_pos)
                 
                 color = (40, 80, 160)
-                if (row, col) in reveladas: color = (200, 60, 60)
-                elif grid[row][col] == "X": color = (80, 80, 100)
+                if (row, col) in naval.reveladas: color = (200, 60, 60)
+                elif naval.grid[row][col] == "X": color = (80, 80, 100)
                 elif is_hovered and is_interactive: color = HOVER_COLOR
 
                 pygame.draw.rect(screen, (0, 0, 0, 100), (x+3, y+3, CELL_SIZE, CELL_SIZE), border_radius=6)
@@ -228,47 +210,36 @@ async def run_batalha_naval(screen):  # <--- 2. ASYNC DEF
 
         # Efeitos
         for efeito in efeitos[:]:
-            efeito["tempo"] += 1
-            alpha_fx = int(255 * (1 - efeito["tempo"] / efeito["max_tempo"]))
+            efeito["tempo"] += frames
+            alpha_fx = max(0, int(255 * (1 - efeito["tempo"] / efeito["max_tempo"])))
             (erow, ecol) = efeito["pos"]
             x = offset_x + ecol * (CELL_SIZE + MARGIN)
             y = offset_y + erow * (CELL_SIZE + MARGIN)
             cor = (255, 200, 60, alpha_fx) if efeito["tipo"] == "acerto" else (60, 120, 255, alpha_fx)
-            flash = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+            flash = image_ops.new_surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
             flash.fill(cor)
-            screen.blit(flash, (x, y))
+            image_ops.blit(screen, flash, (x, y))
             if efeito["tempo"] >= efeito["max_tempo"]: efeitos.remove(efeito)
 
         # Splashes
-        for s in splashes:
-            if "dx" in s and s["dx"] != 0:
-                surf = pygame.Surface((s["r"]*2, s["r"]*2), pygame.SRCALPHA)
-                pygame.draw.circle(surf, (200, 230, 255, max(0, int(s.get("alpha", 180)))), (s["r"], s["r"]), s["r"])
-                screen.blit(surf, (int(s["x"]-s["r"]), int(s["y"]-s["r"])))
-            else:
-                surf = pygame.Surface((int(s["r"]*2+4), int(s["r"]*2+4)), pygame.SRCALPHA)
-                pygame.draw.circle(surf, (180, 220, 255, max(0, int(s["alpha"]))), (surf.get_width()//2, surf.get_height()//2), int(s["r"]), 2)
-                screen.blit(surf, (int(s["x"]-surf.get_width()//2), int(s["y"]-surf.get_height()//2)))
+        splashes.draw(screen, interp=scene_manager.alpha)
 
         draw_score_display(screen, ScoreManager.get_score(), layout['font_small'], position="topright")
 
         # Instruções
-        info_s = layout['font_small'].render("Clique nas células para encontrar Riscos (ESC para sair)", True, (255, 255, 255))
-        screen.blit(info_s, info_s.get_rect(center=(screen.get_width()//2, offset_y + layout['total_height'] + 40)))
+        info_s = render_text(layout['font_small'], "Clique nas células para encontrar Riscos (ESC para sair)", (255, 255, 255))
+        image_ops.blit(screen, info_s, info_s.get_rect(center=(screen.get_width()//2, offset_y + layout['total_height'] + 40)))
+        instrumentation.mark("draw")
 
         # === EVENTOS ===
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT: pygame.quit(); sys.exit()
-            
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_F11:
-                    pygame.display.toggle_fullscreen()
-                    screen = pygame.display.get_surface()
-                    resize_assets(screen)
-                    for p in water_particles:
-                        p.screen_w = screen.get_width(); p.screen_h = screen.get_height()
-                elif event.key == pygame.K_ESCAPE:
-                    return ScoreManager.get_score()
+        for event in input_manager.poll():
+            if event.type == input_manager.RESIZED:
+                screen = pygame.display.get_surface()
+                resize_assets(screen)
+                water.bounds = (-10, -10, screen.get_width() + 10, screen.get_height() + 10)
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                return ScoreManager.get_score()
             
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 mx, my = pygame.mouse.get_pos()
@@ -276,40 +247,32 @@ async def run_batalha_naval(screen):  # <--- 2. ASYNC DEF
                     for col in range(GRID_SIZE):
                         x = offset_x + col * (CELL_SIZE + MARGIN)
                         y = offset_y + row * (CELL_SIZE + MARGIN)
-                        if pygame.Rect(x, y, CELL_SIZE, CELL_SIZE).collidepoint(mx, my) and (row, col) not in reveladas and grid[row][col] != "X":
-                            pos = row * GRID_SIZE + col
-                            if pos in navios_pos:
-                                reveladas.add((row, col))
-                                ameaca, controle = navios_pos[pos]
-                                
-                                ScoreManager.add_points(10)
+                        if pygame.Rect(x, y, CELL_SIZE, CELL_SIZE).collidepoint(mx, my) and naval.aberta(row, col):
+                            resultado = naval.apply(("fire", row, col))
+                            ScoreManager.add_points(resultado["points"])
+                            if resultado["hit"]:
+                                ameaca, controle = resultado["ameaca"], resultado["controle"]
                                 AudioManager.play_sfx_if_exists("explosion") 
                                 
                                 adicionar_efeito("acerto", (row, col))
                                 criar_splash(x + CELL_SIZE//2, y + CELL_SIZE//2)
                                 
                                 # CHAMADA ASYNC PARA PAUSE SCREEN
-                                await show_pause_screen(screen, clock, "Risco Detectado!", f"Ameaça: {ameaca}", f"Solução: {controle}", theme="Batalha Naval")
+                                await show_pause_screen(screen, "Risco Detectado!", f"Ameaça: {ameaca}", f"Solução: {controle}", theme="Batalha Naval")
                             else:
-                                grid[row][col] = "X"
-                                ScoreManager.add_points(-5)
                                 AudioManager.play_sfx_if_exists("errado") 
                                 adicionar_efeito("erro", (row, col))
                                 
                                 # CHAMADA ASYNC PARA PAUSE SCREEN
-                                await show_pause_screen(screen, clock, "ERROU!", "Nenhum risco encontrado aqui.", theme="Batalha Naval")
+                                await show_pause_screen(screen, "ERROU!", "Nenhum risco encontrado aqui.", theme="Batalha Naval")
 
-        if len(reveladas) == len(navios_pos):
+        if naval.done:
             AudioManager.play_sfx_if_exists("correto")
             # CHAMADA ASYNC
-            await show_pause_screen(screen, clock, "Ambiente Seguro!", f"Pontuação Total: {ScoreManager.get_score()}", theme="Batalha Naval")
+            await show_pause_screen(screen, "Ambiente Seguro!", f"Pontuação Total: {ScoreManager.get_score()}", theme="Batalha Naval")
             jogo_ativo = False
 
-        pygame.display.flip()
-        
         # 3. LINHA MÁGICA OBRIGATÓRIA
-        await asyncio.sleep(0) 
-        
-        clock.tick(60)
+        await scene_manager.frame()
 
     return ScoreManager.get_score()
\ No newline at end of file
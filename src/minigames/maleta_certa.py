@@ -10,16 +10,20 @@
 # ===========================================================
 
 import pygame
-import random
-import sys
 import os
 import math
-import asyncio  # <--- IMPORTANTE PARA PYBAG
 
-from src.utils import show_pause_screen, draw_text_wrapped, draw_question_container, draw_score_display, load_font
+from src.utils import show_pause_screen, draw_text_wrapped, draw_question_container, draw_score_display, load_font, render_text
 from src.score_manager import ScoreManager
 from src.audio_manager import AudioManager
 import src.difficulty_manager as dm
+from src import performance, instrumentation
+from src.input_manager import input_manager
+from src.scene_manager import scene_manager, TICK
+from src.asset_manager import asset_manager
+from src import image_ops
+from src.particle_system import ParticleSystem
+from src.minigames.models import QuizModel, pontos_por_regras
 
 
 # ===========================================================
@@ -55,28 +59,20 @@ ALL_CHALLENGES = {
 # ===========================================================
 #              SISTEMA DE PARTÍCULAS
 # ===========================================================
-class MalaParticle:
-    def __init__(self, screen_w, screen_h, icon):
-        self.screen_w = screen_w
-        self.screen_h = screen_h
-        self.icon = icon
-        self.x = random.randint(0, screen_w)
-        self.y = random.randint(-screen_h, 0)
-        self.speed = random.uniform(0.7, 1.7)
-        base_size = random.randint(20, 36)
-        self.icon_scaled = pygame.transform.smoothscale(self.icon, (base_size, base_size))
-        self.alpha = random.randint(80, 150)
-
-    def update(self, dt):
-        self.y += self.speed * dt
-        if self.y > self.screen_h + 10:
-            self.x = random.randint(0, self.screen_w)
-            self.y = random.randint(-200, -40)
-
-    def draw(self, screen):
-        icon = self.icon_scaled.copy()
-        icon.set_alpha(self.alpha)
-        screen.blit(icon, (self.x, self.y))
+def mala_particles(screen_w, screen_h, icon):
+    """Maletas caindo ao fundo (ícone reduzido e alpha fixo vêm do sprite_cache)."""
+    return ParticleSystem(
+        performance.particle_count(12),
+        shape="image", image=icon,
+        bounds=(-math.inf, -math.inf, math.inf, screen_h + 10),
+        spawn={
+            "x": (0, screen_w), "y": (-screen_h, 0),
+            "vy": (43.75, 106.25),
+            "size": list(range(20, 37)),
+            "alpha": (80, 150),
+        },
+        respawn={"y": (-200, -40)},
+    )
 
 # ===========================================================
 #   FUNÇÃO DE DESENHO: Maleta Cyber-Glass
@@ -106,7 +102,7 @@ def draw_briefcase_button(surface, base_rect, text, font, is_hovered, anim_offse
     
     # Surface temporária para suportar transparência complexa
     # Criamos um pouco maior para caber a alça e o brilho
-    draw_surf = pygame.Surface((base_rect.width, base_rect.height + 40), pygame.SRCALPHA)
+    draw_surf = image_ops.new_surface((base_rect.width, base_rect.height + 40), pygame.SRCALPHA)
     
     # Coordenadas relativas dentro da surface
     draw_w = base_rect.width
@@ -159,18 +155,27 @@ def draw_briefcase_button(surface, base_rect, text, font, is_hovered, anim_offse
 
     # Blita a maleta final
     final_pos = (base_rect.x, current_y - 30)
-    surface.blit(draw_surf, final_pos)
+    image_ops.blit(surface, draw_surf, final_pos)
 
     # Retorna o rect de colisão
     return pygame.Rect(base_rect.x, current_y, base_rect.width, base_rect.height)
 
 
+# ===========================================================
+#             MODELO (REGRAS SEM PYGAME)
+# ===========================================================
+def criar_modelo(rules, tipo, rng=None):
+    """QuizModel com os desafios do nível `tipo`; a maleta certa troca de lugar a cada rodada."""
+    acerto, erro = pontos_por_regras(rules)
+    return QuizModel(ALL_CHALLENGES.get(tipo, ALL_CHALLENGES["normal"]), acerto, erro, rng,
+                     evitar_repeticao=True)
+
+
 # ===========================================================
 #             FUNÇÃO PRINCIPAL (AGORA ASYNC)
 # ===========================================================
 async def run_maleta_certa(screen):
     pygame.display.set_caption("💼 Qual é a Maleta Certa?")
-    clock = pygame.time.Clock()
 
     # Variáveis de layout e assets
     layout = {}
@@ -179,28 +184,24 @@ async def run_maleta_certa(screen):
     bg_path = os.path.join(assets_dir, "background", "background_maleta_certa.png")
     icon_path = os.path.join(assets_dir, "icons", "mala.png")
 
-    bg_original = None
-    if os.path.exists(bg_path):
-        bg_original = pygame.image.load(bg_path).convert()
+    bg_original = asset_manager.load(bg_path)
     
-    mala_icon_original = None
-    if os.path.exists(icon_path):
-        mala_icon_original = pygame.image.load(icon_path).convert_alpha()
+    mala_icon_original = asset_manager.load(icon_path, alpha=True)
 
     # === FUNÇÃO DE RESIZE ===
     def resize_assets(surface):
         w, h = surface.get_size()
         
         if bg_original:
-            layout['background'] = pygame.transform.scale(bg_original, (w, h))
+            layout['background'] = asset_manager.scaled(bg_path, (w, h), filter="fast")
         else:
-            layout['background'] = pygame.Surface((w, h))
+            layout['background'] = image_ops.new_surface((w, h))
             layout['background'].fill((40, 0, 0))
 
         # Ícones
         if mala_icon_original:
             layout['mala_icon'] = mala_icon_original
-            layout['mala_big'] = pygame.transform.smoothscale(mala_icon_original, (int(h*0.09), int(h*0.09)))
+            layout['mala_big'] = asset_manager.scaled(icon_path, (int(h*0.09), int(h*0.09)), alpha=True)
         else:
             layout['mala_icon'] = None
             layout['mala_big'] = None
@@ -213,81 +214,59 @@ async def run_maleta_certa(screen):
     resize_assets(screen)
 
     # Partículas
-    particles = []
+    particles = None
     if layout['mala_icon']:
-        particles = [MalaParticle(screen.get_width(), screen.get_height(), layout['mala_icon']) for _ in range(12)]
+        particles = mala_particles(screen.get_width(), screen.get_height(), layout['mala_icon'])
 
-    # === LÓGICA DE JOGO ===
-    diff_rules = dm.get_rules()
-    q_type = dm.get_question_set_type()
-    
-    desafios = ALL_CHALLENGES.get(q_type, ALL_CHALLENGES["normal"])
-    random.shuffle(desafios)
-    
-    pontos_acerto = 10 + diff_rules["bonus_acerto"]
-    pontos_erro = -diff_rules["perda_pontos"]
+    # === LÓGICA DE JOGO (ordem, opções e pontos ficam no modelo) ===
+    quiz = criar_modelo(dm.get_rules(), dm.get_question_set_type())
 
-    indice = 0
     efeitos = []
     anim_timer = 0
-    last_correct_pos = -1
 
     # Loop principal
     while True:
-        dt = clock.tick(60) / 16.0
-        anim_timer += 1
+        # Animações contadas em frames de 60 FPS, avançadas pelos ticks do frame
+        frames = scene_manager.ticks * 60 * TICK
+        anim_timer += frames
         sw, sh = screen.get_size()
         mouse_pos = pygame.mouse.get_pos()
+        if particles is not None:
+            particles.advance(scene_manager.ticks, TICK)
 
-        screen.blit(layout['background'], (0, 0))
+        instrumentation.mark("update")
+        image_ops.blit(screen, layout['background'], (0, 0))
         
         # Overlay Global
-        overlay = pygame.Surface((sw, sh), pygame.SRCALPHA)
-        overlay.fill((0, 0, 20, 100))
-        screen.blit(overlay, (0, 0))
+        image_ops.shade(screen, (0, 0, 20), 100)
 
-        for p in particles:
-            p.update(dt)
-            p.draw(screen)
+        if particles is not None:
+            particles.draw(screen, interp=scene_manager.alpha)
 
         # -----------------------------------------------------------
         # TÍTULO (Com flutuação)
         # -----------------------------------------------------------
         float_offset_title = int(math.sin(anim_timer * 0.04) * 4)
         title_text = "Qual é a Maleta Certa?"
-        title = layout['font_title'].render(title_text, True, (255, 215, 0))
-        shadow = layout['font_title'].render(title_text, True, (0, 0, 0))
+        title = render_text(layout['font_title'], title_text, (255, 215, 0))
+        shadow = render_text(layout['font_title'], title_text, (0, 0, 0))
         
         title_rect = title.get_rect(center=(sw // 2, int(sh * 0.10) + float_offset_title))
         
-        screen.blit(shadow, (title_rect.x + 4, title_rect.y + 4))
-        screen.blit(title, title_rect)
+        image_ops.blit(screen, shadow, (title_rect.x + 4, title_rect.y + 4))
+        image_ops.blit(screen, title, title_rect)
 
         if layout['mala_big']:
             icon_float = int(math.sin(anim_timer * 0.06) * 3)
-            screen.blit(layout['mala_big'], (title_rect.left - layout['mala_big'].get_width() - 15, title_rect.y + icon_float))
-            screen.blit(layout['mala_big'], (title_rect.right + 15, title_rect.y + icon_float))
+            image_ops.blit(screen, layout['mala_big'], (title_rect.left - layout['mala_big'].get_width() - 15, title_rect.y + icon_float))
+            image_ops.blit(screen, layout['mala_big'], (title_rect.right + 15, title_rect.y + icon_float))
 
         # -----------------------------------------------------------
         # DESAFIOS E UI
         # -----------------------------------------------------------
-        if indice < len(desafios):
-            desafio = desafios[indice]
-
-            if 'shuffled_opcoes' not in desafio:
-                opcoes = desafio["opcoes"][:]
-                correta = desafio["correta"]
-                attempts = 0
-                while True:
-                    random.shuffle(opcoes)
-                    new_pos = opcoes.index(correta)
-                    if new_pos != last_correct_pos or attempts > 5:
-                        last_correct_pos = new_pos
-                        break
-                    attempts += 1
-                desafio['shuffled_opcoes'] = opcoes
-
-            opcoes_display = desafio['shuffled_opcoes']
+        if not quiz.done:
+            desafio = quiz.atual
+            opcoes_display = desafio["opcoes"]
 
             # --- CONTAINER DE PERGUNTA (CYBER-GLASS) ---
             float_offset_box = int(math.sin(anim_timer * 0.03 + 1) * 3) 
@@ -299,7 +278,7 @@ async def run_maleta_certa(screen):
             final_y_container = base_container_rect.y + float_offset_box
             
             # Surface para o Container
-            glass_surf = pygame.Surface((base_container_rect.width, base_container_rect.height), pygame.SRCALPHA)
+            glass_surf = image_ops.new_surface((base_container_rect.width, base_container_rect.height), pygame.SRCALPHA)
             
             # Fundo Transparente
             pygame.draw.rect(glass_surf, (20, 30, 60, 180), glass_surf.get_rect(), border_radius=15)
@@ -313,7 +292,7 @@ async def run_maleta_certa(screen):
             pygame.draw.circle(glass_surf, (80, 220, 255), (base_container_rect.width-15, base_container_rect.height-15), 4)
 
             # Desenha Container na Tela
-            screen.blit(glass_surf, (base_container_rect.x, final_y_container))
+            image_ops.blit(screen, glass_surf, (base_container_rect.x, final_y_container))
 
             # === CORREÇÃO DO PROBLEMA (BADGE E PADDING) ===
             
@@ -321,7 +300,7 @@ async def run_maleta_certa(screen):
             badge_color = (80, 220, 255) # Ciano
             badge_text_color = (20, 30, 60) # Azul Escuro
             
-            lbl_surf = layout['font_small'].render("PROBLEMA", True, badge_text_color)
+            lbl_surf = render_text(layout['font_small'], "PROBLEMA", badge_text_color)
             
             # Posição da Badge (colada na borda superior esquerda, um pouco para dentro e para fora)
             lbl_x = base_container_rect.x + 20
@@ -333,7 +312,7 @@ async def run_maleta_certa(screen):
             
             pygame.draw.rect(screen, badge_color, badge_bg_rect, border_radius=8)
             # Texto da badge centralizado
-            screen.blit(lbl_surf, lbl_surf.get_rect(center=badge_bg_rect.center))
+            image_ops.blit(screen, lbl_surf, lbl_surf.get_rect(center=badge_bg_rect.center))
 
             # 2. Desenha Texto da Pergunta (Com margem superior para não bater na badge)
             text_rect = base_container_rect.copy()
@@ -378,29 +357,25 @@ async def run_maleta_certa(screen):
 
             # Efeitos de feedback
             for e in efeitos[:]:
-                e["tempo"] += 1
-                alpha = int(255 * (1 - e["tempo"] / e["max_tempo"]))
-                c = (0, 255, 0, alpha) if e["tipo"] == "acerto" else (255, 50, 50, alpha)
-                glow = pygame.Surface((e["rect"].width, e["rect"].height), pygame.SRCALPHA)
-                glow.fill(c)
-                screen.blit(glow, (e["rect"].x, e["rect"].y)) 
+                e["tempo"] += frames
+                alpha = max(0, int(255 * (1 - e["tempo"] / e["max_tempo"])))
+                c = (0, 255, 0) if e["tipo"] == "acerto" else (255, 50, 50)
+                image_ops.shade(screen, c, alpha, rect=e["rect"])
                 if e["tempo"] >= e["max_tempo"]:
                     efeitos.remove(e)
+            instrumentation.mark("draw")
 
             # Eventos
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
-                
+            for event in input_manager.poll():
+                if event.type == input_manager.RESIZED:
+                    # Nota: Em navegadores, fullscreen pode exigir interação do usuário ou não funcionar
+                    screen = pygame.display.get_surface()
+                    resize_assets(screen)
+                    if layout['mala_icon']:
+                        particles = mala_particles(screen.get_width(), screen.get_height(), layout['mala_icon'])
+
                 if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_F11:
-                        # Nota: Em navegadores, fullscreen pode exigir interação do usuário ou não funcionar
-                        pygame.display.toggle_fullscreen()
-                        screen = pygame.display.get_surface()
-                        resize_assets(screen)
-                        if layout['mala_icon']:
-                            particles = [MalaParticle(screen.get_width(), screen.get_height(), layout['mala_icon']) for _ in range(12)]
-                    elif event.key == pygame.K_ESCAPE:
+                    if event.key == pygame.K_ESCAPE:
                         if pygame.display.is_fullscreen():
                             pygame.display.toggle_fullscreen()
                             screen = pygame.display.get_surface()
@@ -411,36 +386,32 @@ async def run_maleta_certa(screen):
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     for final_rect, opcao in maletas_desenhadas:
                         if final_rect.collidepoint(event.pos):
-                            if opcao == desafio["correta"]:
-                                ScoreManager.add_points(pontos_acerto)
+                            resultado = quiz.apply(("answer", opcao))
+                            ScoreManager.add_points(resultado["points"])
+                            if resultado["correct"]:
                                 efeitos.append({"tipo": "acerto", "rect": final_rect, "tempo": 0, "max_tempo": 16})
                                 AudioManager.play_sfx_if_exists("correto")
                             else:
-                                ScoreManager.add_points(pontos_erro)
                                 efeitos.append({"tipo": "erro", "rect": final_rect, "tempo": 0, "max_tempo": 16})
                                 AudioManager.play_sfx_if_exists("errado")
-                            
-                            indice += 1
+
+                            quiz.apply(("next",))
                             break
 
         else:
             AudioManager.play_sfx_if_exists("roleta")
-            # ATENÇÃO: Se show_pause_screen tiver um loop interno,
-            # ele TAMBÉM precisa de await asyncio.sleep(0) lá dentro,
-            # ou deve ser refatorado para não ser blocante.
-            # Como não tenho acesso ao src.utils, mantenho a chamada padrão.
             await show_pause_screen(
-                screen, clock,
+                screen,
                 "Desafio Completo!",
                 f"Pontuação Total: {ScoreManager.get_score()}",
                 theme="Maleta Certa"
             )
             return ScoreManager.get_score()
 
+        instrumentation.mark("update")
         draw_score_display(screen, ScoreManager.get_score(), layout['font_small'], "topright")
-        pygame.display.flip()
-        
+        instrumentation.mark("draw")
         # PONTO CRÍTICO PARA O PYBAG:
-        await asyncio.sleep(0)  # Cede o controle ao navegador
+        await scene_manager.frame()  # Cede o controle ao navegador
 
     return ScoreManager.get_score()
\ No newline at end of file
@@ -0,0 +1,219 @@
+#=========================================================
+#   MODELOS DOS MINIGAMES (REGRAS SEM PYGAME)
+#=========================================================
+
+"""
+Regras dos minigames separadas do desenho: ordem das perguntas, conferência
+da resposta, pontuação, tabuleiro da Batalha Naval, resultado da roleta e
+cronômetro do STOP / Perseguição.
+
+Os modelos não importam pygame nem leem o relógio: o estado só muda por
+apply(acao), e o tempo entra como ação ("tick", segundos). Sem tela, um
+modelo roda milhões de passos por segundo (balanceamento, testes). As
+corrotinas run_* ficam com o desenho, a entrada e os efeitos, e repassam
+ao ScoreManager os pontos que o modelo devolve.
+
+Ações:
+    ("answer", opcao)         quiz: responde a pergunta atual
+    ("tick", segundos)        quiz: avança o cronômetro da pergunta
+    ("next",)                 quiz: passa para a próxima pergunta
+    ("fire", linha, coluna)   Batalha Naval: abre uma casa
+    ("spin",)                 Roleta: sorteia o setor
+
+apply() devolve None quando a ação não vale no estado atual; senão, um dict
+com ao menos "points" (pontos a somar no placar). `score` acumula os pontos
+da fase e `done` indica o fim.
+
+Os bancos de perguntas continuam nos módulos de cada minigame; cada um tem
+um criar_modelo(regras, ...) que monta o modelo a partir deles.
+
+Sem `rng`, cada modelo deriva o seu do `random` global (como o SpinModel da
+roleta): com a semente de uma sessão gravada (src/replay.py) os sorteios
+se repetem.
+"""
+
+import random
+
+# Embaralhadas, no máximo, para tirar a certa da posição anterior
+MAX_EMBARALHAR = 7
+
+
+def pontos_por_regras(rules):
+    """(acerto, erro) dos quizzes para um bloco de regras do difficulty_manager."""
+    return 10 + rules["bonus_acerto"], -rules["perda_pontos"]
+
+
+# ---------------------------------------------------------
+# BASE
+# ---------------------------------------------------------
+class MinigameModel:
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(32))
+        self.score = 0       # pontos desta fase
+        self.done = False
+
+    def apply(self, action):
+        """Aplica uma ação (tupla com o nome primeiro). Devolve o resultado ou None."""
+        handler = getattr(self, "_on_" + action[0], None)
+        if handler is None:
+            raise ValueError(f"Ação desconhecida para {type(self).__name__}: {action[0]}")
+        return handler(*action[1:])
+
+    def _result(self, points, **info):
+        self.score += points
+        info["points"] = points
+        return info
+
+
+# ---------------------------------------------------------
+# QUIZ (SHOW DO BILHÃO, MALETA CERTA, STOP, PERSEGUIÇÃO)
+# ---------------------------------------------------------
+class QuizModel(MinigameModel):
+    """
+    Perguntas de múltipla escolha, uma de cada vez.
+
+    Cada pergunta é um dict com "opcoes" (textos) e "correta" (o texto
+    certo); o resto (enunciado, dica, motivo...) só é repassado. A ordem
+    das perguntas e das opções é sorteada no início; com `evitar_repeticao`
+    a certa não cai na mesma posição da pergunta anterior (até
+    MAX_EMBARALHAR tentativas).
+
+    O cronômetro da pergunta anda com ("tick", s) até ela ser respondida;
+    a resposta leva o tempo gasto ("tempo"). Com `tempo_limite` (s), a
+    pergunta sem resposta expira no tick que alcança o limite e conta como
+    erro ("timeout").
+    """
+
+    def __init__(self, perguntas, acerto, erro, rng=None, evitar_repeticao=False, tempo_limite=None):
+        super().__init__(rng)
+        self.acerto = acerto
+        self.erro = erro
+        self.tempo_limite = tempo_limite
+
+        self.perguntas = [dict(p) for p in perguntas]
+        self.rng.shuffle(self.perguntas)
+        ultima = -1
+        for p in self.perguntas:
+            opcoes = list(p["opcoes"])
+            for _ in range(MAX_EMBARALHAR):
+                self.rng.shuffle(opcoes)
+                pos = opcoes.index(p["correta"])
+                if not evitar_repeticao or pos != ultima:
+                    break
+            ultima = pos
+            p["opcoes"] = opcoes
+
+        self.indice = 0
+        self.tempo = 0.0        # s desde o início da pergunta atual
+        self.resposta = None    # resultado da pergunta atual, depois de respondida
+        self.acertos = 0
+        self.done = not self.perguntas
+
+    @property
+    def atual(self):
+        return None if self.done else self.perguntas[self.indice]
+
+    @property
+    def tempo_restante(self):
+        if self.tempo_limite is None:
+            return None
+        return max(0.0, self.tempo_limite - self.tempo)
+
+    def _responder(self, opcao, certo, **info):
+        self.acertos += certo
+        self.resposta = self._result(self.acerto if certo else self.erro,
+                                     correct=certo, selected=opcao,
+                                     correta=self.perguntas[self.indice]["correta"],
+                                     tempo=round(self.tempo, 2), **info)
+        return self.resposta
+
+    def _on_answer(self, opcao):
+        if self.done or self.resposta is not None:
+            return None
+        return self._responder(opcao, opcao == self.perguntas[self.indice]["correta"])
+
+    def _on_tick(self, dt):
+        if self.done or self.resposta is not None:
+            return None
+        self.tempo += dt
+        if self.tempo_limite is not None and self.tempo >= self.tempo_limite:
+            self.tempo = self.tempo_limite
+            return self._responder(None, False, timeout=True)
+        return None
+
+    def _on_next(self):
+        if self.done:
+            return None
+        self.indice += 1
+        self.tempo = 0.0
+        self.resposta = None
+        self.done = self.indice >= len(self.perguntas)
+        return self._result(0, done=self.done)
+
+
+# ---------------------------------------------------------
+# BATALHA NAVAL
+# ---------------------------------------------------------
+class NavalModel(MinigameModel):
+    """
+    Tabuleiro lado x lado com `qtd` ameaças (pares ameaça / controle)
+    sorteadas do banco, em casas sorteadas.
+
+    grid[linha][coluna] vira "X" nas casas vazias já abertas; `reveladas`
+    guarda as ameaças encontradas. Acabou quando todas foram reveladas.
+    """
+
+    def __init__(self, ameacas, qtd, lado=5, acerto=10, erro=-5, rng=None):
+        super().__init__(rng)
+        self.lado = lado
+        self.acerto = acerto
+        self.erro = erro
+
+        qtd = min(qtd, lado * lado, len(ameacas))
+        sorteadas = self.rng.sample(ameacas, qtd)
+        casas = self.rng.sample(range(lado * lado), qtd)
+        self.navios = dict(zip(casas, sorteadas))
+
+        self.grid = [[" " for _ in range(lado)] for _ in range(lado)]
+        self.reveladas = set()
+        self.done = not self.navios
+
+    def aberta(self, linha, coluna):
+        """A casa ainda pode ser escolhida."""
+        return (linha, coluna) not in self.reveladas and self.grid[linha][coluna] != "X"
+
+    def _on_fire(self, linha, coluna):
+        if self.done or not self.aberta(linha, coluna):
+            return None
+        casa = linha * self.lado + coluna
+        if casa in self.navios:
+            self.reveladas.add((linha, coluna))
+            ameaca, controle = self.navios[casa]
+            self.done = len(self.reveladas) == len(self.navios)
+            return self._result(self.acerto, hit=True, ameaca=ameaca, controle=controle)
+        self.grid[linha][coluna] = "X"
+        return self._result(self.erro, hit=False)
+
+
+# ---------------------------------------------------------
+# ROLETA DO RISCO
+# ---------------------------------------------------------
+class RouletteModel(MinigameModel):
+    """
+    Rodada bônus: um giro só. ("spin",) sorteia um dos `eventos` (dicts com
+    "efeito" em pontos) e a fase acaba; a animação (SpinModel) só leva a
+    roleta até o setor sorteado.
+    """
+
+    def __init__(self, eventos, rng=None):
+        super().__init__(rng)
+        self.eventos = eventos
+        self.indice = None
+
+    def _on_spin(self):
+        if self.done:
+            return None
+        self.indice = self.rng.randrange(len(self.eventos))
+        evento = self.eventos[self.indice]
+        self.done = True
+        return self._result(evento["efeito"], index=self.indice, evento=evento)
@@ -3,16 +3,23 @@
 # ===========================================================
 import pygame
 import random
-import sys
-import time
 import os
 import math
-import asyncio  # <--- NECESSÁRIO PARA PYBAG/WEB
 
-from src.utils import show_pause_screen, draw_text_wrapped, draw_question_container, draw_score_display, load_font
+from src.utils import show_pause_screen, draw_text_wrapped, draw_question_container, draw_score_display, load_font, render_text, glyph_atlas
+from src.text_layout import measure
 from src.score_manager import ScoreManager
 from src.audio_manager import AudioManager
 import src.difficulty_manager as dm
+from src import sprite_cache, performance, instrumentation
+from src.input_manager import input_manager
+from src.scene_manager import scene_manager, TICK
+from src.game_clock import game_clock
+from src.asset_manager import asset_manager
+from src.particle_system import ParticleSystem
+from src.compositor import Compositor
+from src import image_ops
+from src.minigames.models import QuizModel, pontos_por_regras
 
 # ===========================================================
 #            BANCO DE INCIDENTES (6 POR NÍVEL)
@@ -44,28 +51,36 @@ ALL_INCIDENTS = {
     ]
 }
 
+# Queda do tremor de tela (por segundo)
+SHAKE_DECAY = 30
+
 # ===========================================================
 #            CLASSE: Estrada em Movimento (Speed Lines)
 # ===========================================================
-class RoadLine:
-    def __init__(self, screen_w, screen_h):
-        self.w = screen_w
-        self.h = screen_h
-        self.x = random.randint(0, screen_w)
-        self.y = random.randint(-screen_h, 0)
-        self.length = random.randint(20, 60)
-        self.speed = random.uniform(10, 25) # Alta velocidade
-        self.width = random.randint(2, 4)
-        self.color = (40, 40, 60) # Cinza azulado escuro
-
-    def update(self):
-        self.y += self.speed
-        if self.y > self.h:
-            self.y = -self.length
-            self.x = random.randint(0, self.w)
-
-    def draw(self, surface):
-        pygame.draw.line(surface, self.color, (self.x, self.y), (self.x, self.y + self.length), self.width)
+def road_lines(screen_w, screen_h):
+    return ParticleSystem(
+        performance.particle_count(25),
+        shape="line", palette=[(40, 40, 60)], # Cinza azulado escuro
+        bounds=(-math.inf, -math.inf, math.inf, screen_h),
+        spawn={
+            "x": (0, screen_w), "y": (-screen_h, 0),
+            "size": list(range(20, 61)),     # comprimento
+            "vy": (600, 1500),               # Alta velocidade
+            "width": [2, 3, 4],
+        },
+        respawn={"y": (-60, -20)},
+    )
+
+
+# ===========================================================
+#             MODELO (REGRAS SEM PYGAME)
+# ===========================================================
+def criar_modelo(rules, tipo, rng=None):
+    """QuizModel com os incidentes do nível `tipo` e o cronômetro da Perseguição."""
+    tempo = rules.get("perseguicao_tempo", rules.get("tempo_pergunta", 5))
+    acerto, erro = pontos_por_regras(rules)
+    return QuizModel(ALL_INCIDENTS.get(tipo, ALL_INCIDENTS["normal"]), acerto, erro, rng,
+                     evitar_repeticao=True, tempo_limite=tempo)
 
 
 # ===========================================================
@@ -73,7 +88,6 @@ class RoadLine:
 # ===========================================================
 async def run_perseguicao(screen):
     pygame.display.set_caption("🚨 Perseguição — Decisões Rápidas 🚨")
-    clock = pygame.time.Clock()
 
     # === CARREGAMENTO DE ASSETS ===
     layout = {}
@@ -87,22 +101,19 @@ async def run_perseguicao(screen):
     lock_path = os.path.join(assets_dir, "icons", "cadeado.png") 
     
     # Carregamento Inicial
-    bg_original = None
-    if os.path.exists(bg_path):
-        bg_original = pygame.image.load(bg_path).convert()
-
-    img_police = pygame.image.load(police_path).convert_alpha() if os.path.exists(police_path) else None
-    img_hacker = pygame.image.load(hacker_path).convert_alpha() if os.path.exists(hacker_path) else None
-    img_lock = pygame.image.load(lock_path).convert_alpha() if os.path.exists(lock_path) else None
+    bg_original = asset_manager.load(bg_path)
+    img_police = asset_manager.load(police_path, alpha=True)
+    img_hacker = asset_manager.load(hacker_path, alpha=True)
+    img_lock = asset_manager.load(lock_path, alpha=True)
 
     # === FUNÇÃO DE RESIZE ===
     def resize_assets(surface):
         w, h = surface.get_size()
         
         if bg_original:
-            layout['background'] = pygame.transform.scale(bg_original, (w, h))
+            layout['background'] = asset_manager.scaled(bg_path, (w, h), filter="fast")
         else:
-            layout['background'] = pygame.Surface((w, h))
+            layout['background'] = image_ops.new_surface((w, h))
             layout['background'].fill((10, 10, 15)) 
 
         # Fontes
@@ -114,170 +125,125 @@ async def run_perseguicao(screen):
         icon_size = int(h * 0.06)
         
         if img_hacker:
-            layout['icon_hacker'] = pygame.transform.smoothscale(img_hacker, (int(icon_size*1.2), int(icon_size*1.2)))
+            layout['icon_hacker'] = asset_manager.scaled(hacker_path, (int(icon_size*1.2), int(icon_size*1.2)), alpha=True)
         else:
-            s = pygame.Surface((icon_size, icon_size)); s.fill((255, 50, 50))
+            s = image_ops.new_surface((icon_size, icon_size)); s.fill((255, 50, 50))
             layout['icon_hacker'] = s
 
         if img_lock:
             title_icon_size = int(h * 0.085) 
-            layout['icon_title'] = pygame.transform.smoothscale(img_lock, (title_icon_size, title_icon_size))
+            layout['icon_title'] = asset_manager.scaled(lock_path, (title_icon_size, title_icon_size), alpha=True)
         else:
             layout['icon_title'] = None
 
     resize_assets(screen)
 
     # === EFEITOS ===
-    road_lines = [RoadLine(screen.get_width(), screen.get_height()) for _ in range(25)]
+    road = road_lines(screen.get_width(), screen.get_height())
     shake_amount = 0
 
-    # === LÓGICA DE JOGO ===
-    diff_rules = dm.get_rules()
-    q_type = dm.get_question_set_type()
-    
-    tempo_base = diff_rules.get("perseguicao_tempo", diff_rules.get("tempo_pergunta", 5))
-    
-    incidentes = ALL_INCIDENTS.get(q_type, ALL_INCIDENTS["normal"])
-    random.shuffle(incidentes)
-    
-    pontos_acerto = 10 + diff_rules["bonus_acerto"]
-    pontos_erro = -diff_rules["perda_pontos"]
+    # HUD e faixa de feedback reaproveitadas entre frames
+    layers = Compositor(screen.get_size())
+
+    # === LÓGICA DE JOGO (ordem, cronômetro e pontos ficam no modelo) ===
+    quiz = criar_modelo(dm.get_rules(), dm.get_question_set_type())
 
-    indice = 0
     feedback = None
-    start_time = time.time()
+    start_time = game_clock.time()  # entrada dos botões
     frame = 0
-    pontos_desta_fase = 0
     jogo_ativo = True
     
-    last_correct_pos = -1
     transitioning = False
     transition_start_time = 0
     TRANSITION_DURATION = 0.6 
 
     # Loop Principal
     while jogo_ativo:
-        frame += 1
-        dt = clock.tick(60) / 1000.0
+        # `frame` conta em frames de 60 FPS (sirene/pisca), avançado por tick
+        frame += scene_manager.ticks * 60 * TICK
 
         # Transição
         if transitioning:
-            if time.time() - transition_start_time > TRANSITION_DURATION:
+            if game_clock.time() - transition_start_time > TRANSITION_DURATION:
                 transitioning = False
                 feedback = None
-                indice += 1
-                start_time = time.time()
+                quiz.apply(("next",))
+                start_time = game_clock.time()
         
-        # Shake Decay
+        # Shake Decay (30/s, por tick)
         if shake_amount > 0:
-            shake_amount -= 0.5
+            shake_amount -= SHAKE_DECAY * TICK * scene_manager.ticks
             if shake_amount < 0: shake_amount = 0
         
         shake_x = random.randint(-int(shake_amount), int(shake_amount))
         shake_y = random.randint(-int(shake_amount), int(shake_amount))
+        road.advance(scene_manager.ticks, TICK)
         
         # Desenho Background
-        screen.blit(layout['background'], (0, 0))
-        bg_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        for line in road_lines:
-            line.update()
-            line.draw(bg_surface)
-        screen.blit(bg_surface, (shake_x, shake_y))
+        instrumentation.mark("update")
+        image_ops.blit(screen, layout['background'], (0, 0))
+        road.draw(screen, (shake_x, shake_y), interp=scene_manager.alpha)
 
         w, h = screen.get_size()
+        layers.resize((w, h))
 
         # Vignette
         sirene_alpha = int(abs(math.sin(frame * 0.15)) * 120) 
         is_red_phase = (frame // 30) % 2 == 0
         sirene_color = (255, 0, 0) if is_red_phase else (0, 0, 255)
         
-        top_rect = pygame.Surface((w, 30)); top_rect.fill(sirene_color); top_rect.set_alpha(sirene_alpha)
-        bottom_rect = pygame.Surface((w, 30)); bottom_rect.fill(sirene_color); bottom_rect.set_alpha(sirene_alpha)
-        screen.blit(top_rect, (0, 0))
-        screen.blit(bottom_rect, (0, h - 30))
+        image_ops.shade(screen, sirene_color, sirene_alpha, (0, 0, w, 30))
+        image_ops.shade(screen, sirene_color, sirene_alpha, (0, h - 30, w, 30))
         
         # HUD Surface
-        hud_surface = pygame.Surface((w, h), pygame.SRCALPHA)
+        hud_surface = layers.begin("hud")
         
         # --- TÍTULO CENTRAL ---
         float_offset = math.sin(frame * 0.05) * 5
         title_text = "ALERTA DE SEGURANÇA"
         title_color = (255, 215, 0) # Amarelo Ouro Neon
         
-        title_surf = layout['font_title'].render(title_text, True, title_color)
-        title_shadow = layout['font_title'].render(title_text, True, (0, 0, 0))
+        title_surf = render_text(layout['font_title'], title_text, title_color)
+        title_shadow = render_text(layout['font_title'], title_text, (0, 0, 0))
         
         title_rect = title_surf.get_rect(center=(w // 2, int(h * 0.10) + float_offset))
         
         # Desenha Título
-        hud_surface.blit(title_shadow, (title_rect.x + 3, title_rect.y + 3))
-        hud_surface.blit(title_surf, title_rect)
+        image_ops.blit(hud_surface, title_shadow, (title_rect.x + 3, title_rect.y + 3))
+        image_ops.blit(hud_surface, title_surf, title_rect)
 
         # --- ÍCONES CADEADO FLUTUANTES ---
         if layout['icon_title']:
             icon_y = title_rect.centery - (layout['icon_title'].get_height() // 2)
-            glow_intensity = int((math.sin(pygame.time.get_ticks() * 0.008) + 1) * 127.5)
+            glow_intensity = int((math.sin(game_clock.ticks() * 0.008) + 1) * 127.5)
             
-            icon_glow = layout['icon_title'].copy()
-            icon_glow.set_alpha(glow_intensity)
+            icon_glow = sprite_cache.faded(layout['icon_title'], glow_intensity)
 
             left_pos = (title_rect.left - layout['icon_title'].get_width() - 20, icon_y)
             right_pos = (title_rect.right + 20, icon_y)
 
-            hud_surface.blit(layout['icon_title'], left_pos) 
-            hud_surface.blit(icon_glow, left_pos, special_flags=pygame.BLEND_ADD)
+            image_ops.blit(hud_surface, layout['icon_title'], left_pos) 
+            image_ops.blit(hud_surface, icon_glow, left_pos, special_flags=pygame.BLEND_ADD)
 
-            hud_surface.blit(layout['icon_title'], right_pos) 
-            hud_surface.blit(icon_glow, right_pos, special_flags=pygame.BLEND_ADD)
+            image_ops.blit(hud_surface, layout['icon_title'], right_pos) 
+            image_ops.blit(hud_surface, icon_glow, right_pos, special_flags=pygame.BLEND_ADD)
 
         draw_score_display(hud_surface, ScoreManager.get_score(), layout['font_small'], position="topright")
 
-        if indice < len(incidentes):
-            inc = incidentes[indice]
-            
-            # Shuffling Logic
-            if 'shuffled_opcoes' not in inc:
-                opts = inc["opcoes"][:]
-                correta = inc["correta"]
-                attempts = 0
-                while True:
-                    random.shuffle(opts)
-                    try:
-                        new_pos = opts.index(correta)
-                    except ValueError: new_pos = 0 
-                    if new_pos != last_correct_pos or attempts > 5:
-                        last_correct_pos = new_pos
-                        break
-                    attempts += 1
-                inc['shuffled_opcoes'] = opts
-            
-            opcoes_display = inc['shuffled_opcoes']
-            
-            if not transitioning:
-                tempo_restante = max(0, tempo_base - (time.time() - start_time))
-            else:
-                tempo_restante = max(0, tempo_base - (transition_start_time - start_time))
+        if not quiz.done:
+            inc = quiz.atual
+            opcoes_display = inc["opcoes"]
+
+            # Congela na resposta (o modelo ignora ticks depois dela)
+            tempo_restante = quiz.tempo_restante
 
             # --- LAYOUT DINÂMICO ---
             container_x = 100
             container_w = w - 200
             text_margin = 30
             
-            def get_text_height(text, font, max_width):
-                words = text.split(' ')
-                lines = []
-                current_line = []
-                for word in words:
-                    test_line = ' '.join(current_line + [word])
-                    if font.size(test_line)[0] <= max_width:
-                        current_line.append(word)
-                    else:
-                        lines.append(' '.join(current_line))
-                        current_line = [word]
-                lines.append(' '.join(current_line))
-                return len(lines) * font.get_linesize()
-
-            text_h = get_text_height(inc["descricao"], layout['font_text'], container_w - (text_margin * 2))
+            # Altura medida pelo mesmo layout (em cache) que o draw_text_wrapped usa
+            text_h = measure(inc["descricao"], layout['font_text'], container_w - (text_margin * 2))
             
             container_min_h = int(h * 0.18)
             container_calculated_h = 60 + text_h + 40
@@ -290,9 +256,9 @@ async def run_perseguicao(screen):
             pygame.draw.rect(hud_surface, (0, 255, 0), container_rect, 2, border_radius=8) 
             
             if frame % 40 < 20:
-                warn = layout['font_small'].render("> INCIDENTE DETECTADO <", True, (255, 0, 0))
+                warn = render_text(layout['font_small'], "> INCIDENTE DETECTADO <", (255, 0, 0))
                 warn_rect = warn.get_rect(midtop=(container_rect.centerx, container_rect.top + 10))
-                hud_surface.blit(warn, warn_rect)
+                image_ops.blit(hud_surface, warn, warn_rect)
 
             text_area = pygame.Rect(container_rect.left + text_margin, container_rect.top + 60, container_rect.width - (text_margin * 2), text_h)
             draw_text_wrapped(hud_surface, inc["descricao"], layout['font_text'], (200, 255, 200), text_area)
@@ -311,7 +277,7 @@ async def run_perseguicao(screen):
             adj_mouse = (mouse_pos[0] - shake_x, mouse_pos[1] - shake_y)
 
             for i, opcao in enumerate(opcoes_display):
-                offset_anim = max(0, (20 - (time.time() - start_time)*40)) * (-1 if i==0 else 1) 
+                offset_anim = max(0, (20 - (game_clock.time() - start_time)*40)) * (-1 if i==0 else 1) 
                 rect = pygame.Rect(btn_start_x + i * (largura_botao + espaco) + offset_anim, y_base, largura_botao, altura_botao)
                 botoes.append((rect, opcao))
                 
@@ -343,7 +309,7 @@ async def run_perseguicao(screen):
             track_x_end = w * 0.9
             track_width = track_x_end - track_x_start
             
-            ratio = tempo_restante / tempo_base
+            ratio = tempo_restante / quiz.tempo_limite
             progress = 1.0 - ratio
             
             if progress < 0.5: bar_color = (0, 255, 0)
@@ -357,36 +323,36 @@ async def run_perseguicao(screen):
 
             h_icon = layout['icon_hacker']
             h_x = track_x_start + current_bar_width
-            hud_surface.blit(h_icon, (h_x - h_icon.get_width()//2, track_y + track_h//2 - h_icon.get_height()//2))
+            image_ops.blit(hud_surface, h_icon, (h_x - h_icon.get_width()//2, track_y + track_h//2 - h_icon.get_height()//2))
 
             pygame.draw.circle(hud_surface, (50, 100, 255), (int(track_x_end), int(track_y + track_h//2)), 10)
             pygame.draw.circle(hud_surface, (255, 255, 255), (int(track_x_end), int(track_y + track_h//2)), 10, 2)
 
             color_timer = (255, 255, 255)
             if tempo_restante < 2: color_timer = (255, 50, 50)
-            timer_surf = layout['font_timer'].render(f"IMPACTO EM: {tempo_restante:.2f}s", True, color_timer)
+            # Cronômetro muda todo frame: composto a partir do atlas de glyphs
+            timer_atlas = glyph_atlas(layout['font_timer'], color_timer)
             
             # AJUSTE 2: Subi o texto do timer (de -35 para -60)
-            hud_surface.blit(timer_surf, (w//2 - timer_surf.get_width()//2, track_y - 60))
+            timer_atlas.draw(hud_surface, f"IMPACTO EM: {tempo_restante:.2f}s", midtop=(w//2, track_y - 60))
 
-            screen.blit(hud_surface, (shake_x, shake_y))
+            layers.blit(screen, "hud", (shake_x, shake_y))
+            instrumentation.mark("draw")
 
             # Eventos
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: pygame.quit(); sys.exit()
-                
+            for event in input_manager.poll():
+                if event.type == input_manager.RESIZED:
+                    screen = pygame.display.get_surface()
+                    resize_assets(screen)
+                    road = road_lines(screen.get_width(), screen.get_height())
+
                 if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_F11:
-                        pygame.display.toggle_fullscreen()
-                        screen = pygame.display.get_surface()
-                        resize_assets(screen)
-                        road_lines = [RoadLine(screen.get_width(), screen.get_height()) for _ in range(25)]
-                    elif event.key == pygame.K_ESCAPE:
+                    if event.key == pygame.K_ESCAPE:
                         if pygame.display.is_fullscreen():
                             pygame.display.toggle_fullscreen()
                             screen = pygame.display.get_surface()
                             resize_assets(screen)
-                        else: return pontos_desta_fase
+                        else: return quiz.score
 
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not transitioning:
                     pos = pygame.mouse.get_pos()
@@ -394,52 +360,54 @@ async def run_perseguicao(screen):
                     for rect, opcao in botoes:
                         if rect.collidepoint(adj_click):
                             transitioning = True
-                            transition_start_time = time.time()
-                            if opcao == inc["correta"]:
-                                pontos_desta_fase += pontos_acerto
-                                ScoreManager.add_points(pontos_acerto)
+                            transition_start_time = game_clock.time()
+                            resultado = quiz.apply(("answer", opcao))
+                            ScoreManager.add_points(resultado["points"])
+                            if resultado["correct"]:
                                 feedback = ("AMEAÇA NEUTRALIZADA", True)
                                 AudioManager.play_sfx_if_exists("correto")
                                 shake_amount = 0 
                             else:
-                                pontos_desta_fase += pontos_erro
-                                ScoreManager.add_points(pontos_erro)
                                 feedback = ("FALHA NA RESPOSTA", False)
                                 AudioManager.play_sfx_if_exists("errado")
                                 shake_amount = 15 
-
-            if tempo_restante <= 0 and not transitioning:
-                transitioning = True
-                transition_start_time = time.time()
-                pontos_desta_fase += pontos_erro
-                ScoreManager.add_points(pontos_erro)
-                feedback = ("SISTEMA COMPROMETIDO", False)
-                shake_amount = 20
-                AudioManager.play_sfx_if_exists("errado")
+                            break
 
         else:
             AudioManager.play_sfx_if_exists("roleta")
             # ATENÇÃO: show_pause_screen deve ser NON-BLOCKING ou ter seu próprio await
-            await show_pause_screen(screen, clock, "Relatório de Incidente", f"Pontuação Final: {ScoreManager.get_score()}", theme="Perseguição")
+            await show_pause_screen(screen, "Relatório de Incidente", f"Pontuação Final: {ScoreManager.get_score()}", theme="Perseguição")
             jogo_ativo = False
 
         if feedback and transitioning:
+            instrumentation.mark("update")
             msg, acerto = feedback
-            bg_col = (0, 100, 0, 220) if acerto else (140, 0, 0, 220)
-            fb_surf = pygame.Surface((w, 80), pygame.SRCALPHA)
-            fb_surf.fill(bg_col)
-            txt = layout['font_title'].render(msg, True, (255, 255, 255))
-            if txt.get_height() > 60:
-                scale = 60 / txt.get_height()
-                txt = pygame.transform.scale(txt, (int(txt.get_width()*scale), int(txt.get_height()*scale)))
-            fb_surf.blit(txt, txt.get_rect(center=(w//2, 40)))
-            screen.blit(fb_surf, (0, h//2 - 40))
-
-        pygame.display.flip()
-        
+            # Faixa só é redesenhada quando a mensagem muda
+            fb_surf = layers.begin("feedback", key=feedback, size=(w, 80))
+            if fb_surf is not None:
+                bg_col = (0, 100, 0, 220) if acerto else (140, 0, 0, 220)
+                fb_surf.fill(bg_col)
+                txt = render_text(layout['font_title'], msg, (255, 255, 255))
+                if txt.get_height() > 60:
+                    scale = 60 / txt.get_height()
+                    txt = image_ops.scale(txt, (int(txt.get_width()*scale), int(txt.get_height()*scale)))
+                image_ops.blit(fb_surf, txt, txt.get_rect(center=(w//2, 40)))
+            layers.blit(screen, "feedback", (0, h//2 - 40))
+            instrumentation.mark("draw")
+
         if shake_amount > 0 and shake_amount < 2: shake_amount = 0
         
         # PONTO CRÍTICO PARA PYBAG:
-        await asyncio.sleep(0)
-
-    return pontos_desta_fase
\ No newline at end of file
+        await scene_manager.frame()
+
+        # Cronômetro anda com o tempo do frame que passou; estourou = erro
+        resultado = quiz.apply(("tick", scene_manager.dt / 1000))
+        if resultado is not None:
+            transitioning = True
+            transition_start_time = game_clock.time()
+            ScoreManager.add_points(resultado["points"])
+            feedback = ("SISTEMA COMPROMETIDO", False)
+            shake_amount = 20
+            AudioManager.play_sfx_if_exists("errado")
+
+    return quiz.score
\ No newline at end of file
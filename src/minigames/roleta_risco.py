@@ -5,72 +5,68 @@
 import pygame
 import random
 import math
-import sys
 import os
-import asyncio  # <--- IMPORTANTE PARA WEB/PYBAG
-from src.utils import draw_question_container, draw_text_wrapped, draw_score_display, show_pause_screen, load_font, draw_text
+from src.utils import draw_question_container, draw_text_wrapped, draw_score_display, show_pause_screen, load_font, draw_text, render_text
 from src.score_manager import ScoreManager
 from src.audio_manager import AudioManager
 import src.difficulty_manager as dm
+from src import sprite_cache, performance, instrumentation
+from src.input_manager import input_manager
+from src.scene_manager import scene_manager, TICK
+from src.game_clock import game_clock
+from src.asset_manager import asset_manager
+from src import image_ops
+from src.particle_system import ParticleSystem
+from src.minigames.models import RouletteModel
 
 # ===========================================================
 #        PARTÍCULAS
 # ===========================================================
-class SparkParticle:
-    def __init__(self, cx, cy):
-        self.x = cx; self.y = cy
-        ang = random.uniform(0, math.pi * 2); vel = random.uniform(3.5, 8.5)
-        self.vx = math.cos(ang) * vel; self.vy = math.sin(ang) * vel
-        self.life = random.randint(380, 620); self.alpha = 255; self.size = random.randint(3, 6)
-    def update(self, dt_ms):
-        dt = dt_ms / 1000.0; self.x += self.vx * dt; self.y += self.vy * dt
-        self.vx *= 0.96; self.vy *= 0.96; self.life -= dt_ms; self.alpha = max(0, int(self.life / 3))
-    def draw(self, surf):
-        if self.alpha > 0:
-            s = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (255, 60, 60, self.alpha), (self.size, self.size), self.size)
-            surf.blit(s, (int(self.x - self.size), int(self.y - self.size)))
-
-class SparkGold:
-    def __init__(self, x, y):
-        self.x = x + random.uniform(-6, 6); self.y = y + random.uniform(-6, 6)
-        self.angle = random.uniform(0, 2 * math.pi); self.speed = random.uniform(1.5, 3.0)
-        self.size = random.randint(2, 5); self.life = random.randint(18, 28); self.alpha = 255
-    def update(self):
-        self.x += math.cos(self.angle) * self.speed; self.y += math.sin(self.angle) * self.speed * 0.75
-        self.life -= 1; self.alpha = max(0, int(255 * (self.life / 28.0)))
-    def draw(self, screen):
-        if self.life > 0 and self.alpha > 0:
-            s = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (255, 215, 80, self.alpha), (self.size, self.size), self.size)
-            screen.blit(s, (int(self.x - self.size), int(self.y - self.size)))
+def spark_particles():
+    """Faíscas vermelhas (resultado negativo): lentas e com arrasto forte."""
+    return ParticleSystem(
+        performance.particle_count(30) * 2, palette=[(255, 60, 60)], anchor="center",
+        on_exit="kill", fill=False, drag=0.96 ** 60,
+        spawn={
+            "speed": (3.5, 8.5),
+            "life": (0.38, 0.62),
+            "alpha": lambda ps, idx: ps.life[idx] * 1000 / 3,
+            "fade": 1000 / 3,
+            "size": [3, 4, 5, 6],
+        },
+    )
+
+def gold_sparks():
+    """Faíscas douradas (resultado positivo)."""
+    return ParticleSystem(
+        performance.particle_count(20) * 2, palette=[(255, 215, 80)], anchor="center",
+        on_exit="kill", fill=False,
+        spawn={
+            "speed": (90, 180), "vy_scale": 0.75,
+            "life": (18 / 60, 28 / 60),
+            "alpha": lambda ps, idx: 255 * ps.life[idx] / (28 / 60),
+            "fade": 255 * 60 / 28,
+            "size": [2, 3, 4, 5],
+        },
+    )
 
 # ===========================================================
 #        VISUAIS: ORBIT SPARKS & BACKLIGHT
 # ===========================================================
 
-class OrbitSpark:
+def orbit_sparks(centro, raio):
     """Fagulhas que orbitam suavemente ao redor da roleta"""
-    def __init__(self, centro, raio):
-        self.centro = centro
-        self.base_raio = raio + 15
-        self.raio = self.base_raio + random.uniform(-5, 5)
-        self.ang = random.uniform(0, math.pi * 2)
-        self.vel = random.uniform(0.015, 0.025) * (1 if random.random() > 0.5 else -1)
-        self.size = random.randint(2, 4)
-        self.alpha = random.randint(160, 230)
-
-    def update(self):
-        self.ang += self.vel
-        if self.ang > math.pi * 2: self.ang -= math.pi * 2
-        if self.ang < 0: self.ang += math.pi * 2
-
-    def draw(self, screen):
-        x = self.centro[0] + math.cos(self.ang) * self.raio
-        y = self.centro[1] + math.sin(self.ang) * self.raio
-        s = pygame.Surface((self.size*2, self.size*2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (255, 255, 160, self.alpha), (self.size, self.size), self.size)
-        screen.blit(s, (int(x - self.size), int(y - self.size)))
+    return ParticleSystem(
+        performance.particle_count(16), palette=[(255, 255, 160)], anchor="center",
+        center=centro,
+        spawn={
+            "radius": (raio + 10, raio + 20),
+            "theta": (0, math.pi * 2),
+            "omega": lambda ps, idx: ps.rng.uniform(0.9, 1.5, len(idx)) * ps.rng.choice([-1, 1], len(idx)),
+            "size": [2, 3, 4],
+            "alpha": (160, 230),
+        },
+    )
 
 def draw_neon_backlight(screen, centro, raio, timer):
     """
@@ -89,30 +85,234 @@ def draw_neon_backlight(screen, centro, raio, timer):
     # Intensidade pulsante (Senoide)
     # Varia de 0.2 (escuro) a 1.0 (brilhante)
     pulse = (math.sin(timer * 0.005) + 1) / 2 
-    max_alpha = 180
-    alpha = int(40 + pulse * (max_alpha - 40))
+    min_alpha, max_alpha = 40, 180
+    alpha = int(min_alpha + pulse * (max_alpha - min_alpha))
 
-    # Cria superfície para o brilho
     glow_radius = int(raio * 1.4) # Um pouco maior que a roleta
-    s_size = glow_radius * 2
-    s = pygame.Surface((s_size, s_size), pygame.SRCALPHA)
-    
-    # Desenha 2 camadas de brilho para ficar "suave" e "neon"
-    # Camada 1: Halo externo difuso
-    pygame.draw.circle(s, (*base_color, int(alpha * 0.4)), (glow_radius, glow_radius), glow_radius)
-    # Camada 2: Núcleo mais forte (perto da borda da roleta)
-    pygame.draw.circle(s, (*base_color, int(alpha * 0.8)), (glow_radius, glow_radius), int(raio * 1.1))
-    
+
+    # 2 camadas de brilho para ficar "suave" e "neon" (halo em cache por nível de alpha)
+    # Camada 1: Halo externo difuso / Camada 2: Núcleo mais forte (perto da borda da roleta)
+    s = sprite_cache.halo(glow_radius, base_color, alpha,
+                          rings=[(glow_radius, 0.4), (raio * 1.1, 0.8)],
+                          alpha_range=(min_alpha, max_alpha))
+
     # Blit centralizado atrás da roleta
-    screen.blit(s, (centro[0] - glow_radius, centro[1] - glow_radius), special_flags=pygame.BLEND_RGBA_ADD)
+    image_ops.blit(screen, s, (centro[0] - glow_radius, centro[1] - glow_radius), special_flags=pygame.BLEND_RGBA_ADD)
+
+
+# ===========================================================
+#        TEXTURA DA ROLETA (PRÉ-RENDERIZADA)
+# ===========================================================
+
+# Resolução angular dos quadros girados (graus; divisor de 360)
+WHEEL_ANGLE_STEP = 6
+
+# Quadros de uma volta completa
+WHEEL_FRAMES = 360 // WHEEL_ANGLE_STEP
+
+
+class WheelTexture:
+    """
+    Roleta (setores, contornos, rótulos e centro) desenhada uma vez por raio.
+
+    Os WHEEL_FRAMES quadros girados (passos de WHEEL_ANGLE_STEP graus) ficam
+    todos na memória: uma volta inteira, sem LRU (~50 MB a 720p, ~110 MB a
+    1080p). São gerados aos poucos no preload do scene_manager assim que a
+    textura é criada, e prerender() completa o que faltar no início do giro;
+    girando, a roleta custa um blit por frame e nenhum rotate. Um quadro
+    gerado na hora do desenho conta em "wheel_misses" na instrumentação.
+    """
+
+    def __init__(self, eventos, raio, font):
+        self.raio = raio
+        self.font = font
+        self.base = self._build(eventos, raio, font)
+        self._frames = [None] * WHEEL_FRAMES
+        self._frames[0] = self.base
+        scene_manager.preload(self._prerender_job())
+
+    @staticmethod
+    def _build(eventos, raio, font):
+        size = int(raio) * 2 + 4
+        surf = image_ops.new_surface((size, size), pygame.SRCALPHA)
+        centro = (size // 2, size // 2)
+        angulo_por_setor = 360.0 / len(eventos)
+
+        pygame.draw.circle(surf, (0, 0, 0), centro, raio)  # Fundo preto da pizza
+
+        for i, ev in enumerate(eventos):
+            a_i = math.radians(i * angulo_por_setor)
+            a_f = math.radians((i + 1) * angulo_por_setor)
+            p2 = (centro[0] + raio * math.cos(a_i), centro[1] + raio * math.sin(a_i))
+            p3 = (centro[0] + raio * math.cos(a_f), centro[1] + raio * math.sin(a_f))
+
+            pygame.draw.polygon(surf, ev["cor"], [centro, p2, p3])
+            pygame.draw.polygon(surf, (0, 0, 0), [centro, p2, p3], 2)  # Linha preta
+
+            # Texto com contorno preto (4 passadas + preenchimento)
+            nome_split = ev["nome"].split(" ")
+            ang_txt = math.radians(i * angulo_por_setor + angulo_por_setor / 2)
+            dist_txt = raio * 0.68
+
+            for idx, palavra in enumerate(nome_split):
+                offset = (idx - len(nome_split) / 2) * 18
+                tx = centro[0] + math.cos(ang_txt) * (dist_txt - offset)
+                ty = centro[1] + math.sin(ang_txt) * (dist_txt - offset)
+
+                txt_s = render_text(font, palavra, (255, 255, 255))
+                txt_sh = render_text(font, palavra, (0, 0, 0))
+                for ox in [-1, 1]:
+                    for oy in [-1, 1]:
+                        image_ops.blit(surf, txt_sh, (tx - txt_s.get_width() // 2 + ox, ty - txt_s.get_height() // 2 + oy))
+                image_ops.blit(surf, txt_s, (tx - txt_s.get_width() // 2, ty - txt_s.get_height() // 2))
+
+        # Centro
+        pygame.draw.circle(surf, (30, 30, 30), centro, raio * 0.15)
+        pygame.draw.circle(surf, (255, 215, 0), centro, raio * 0.15, 4)
+        return surf
+
+    @staticmethod
+    def snap(angle):
+        """Ângulo efetivamente desenhado para `angle`."""
+        return round(angle / WHEEL_ANGLE_STEP) * WHEEL_ANGLE_STEP
+
+    def _render(self, bucket):
+        # Ângulos crescem no sentido horário na tela; rotate() gira no anti-horário.
+        # O círculo cabe no quadrado original: recorta o centro do resultado.
+        rotated = image_ops.rotate(self.base, -bucket * WHEEL_ANGLE_STEP)
+        rect = self.base.get_rect(center=rotated.get_rect().center)
+        self._frames[bucket] = image_ops.copy(rotated.subsurface(rect))
+        return self._frames[bucket]
+
+    def _prerender_job(self):
+        for bucket in range(WHEEL_FRAMES):
+            if self._frames is None:
+                return  # textura trocada (resize) antes de terminar
+            if self._frames[bucket] is None:
+                self._render(bucket)
+                yield
+
+    def prerender(self):
+        """Gera agora os quadros que o preload ainda não fez (início do giro)."""
+        for _ in self._prerender_job():
+            pass
+
+    def release(self):
+        """Solta os quadros e para o preload pendente."""
+        self._frames = None
+
+    def frame(self, angle):
+        bucket = int(round(angle / WHEEL_ANGLE_STEP)) % WHEEL_FRAMES
+        surf = self._frames[bucket]
+        if surf is None:
+            instrumentation.count("wheel_misses")
+            surf = self._render(bucket)
+        return surf
+
+    def draw(self, screen, centro, angle):
+        surf = self.frame(angle)
+        image_ops.blit(screen, surf, surf.get_rect(center=centro))
+
+
+# ===========================================================
+#        MODELO DO GIRO (POR TEMPO, RESULTADO SORTEADO NO INÍCIO)
+# ===========================================================
+
+# Ângulo (graus) em que fica a seta: topo da roleta
+POINTER_ANGLE = 270
+
+# Duração do giro e "força" do freio da curva de desaceleração
+SPIN_DURATION_MS = 10000
+SPIN_EASE = math.log(250)
+
+# Entrada do painel de resultado (alpha/s)
+RESULT_FADE_SPEED = 900
+
+
+class SpinModel:
+    """
+    Giro da roleta como função do tempo.
+
+    O setor vencedor vem do RouletteModel em start() e o ângulo final já é
+    calculado para cair nele; cada frame só avalia a curva (custo O(1), sem
+    integrar velocidade), então a duração não depende do FPS. Com a mesma
+    `seed` o giro se repete (testes headless).
+    """
+
+    def __init__(self, num_setores, seed=None):
+        self.num_setores = num_setores
+        self.angulo_por_setor = 360.0 / num_setores
+        # Sem seed, deriva do random global (sessões gravadas repetem o giro)
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(32))
+        self.index = None
+        self._start_ms = 0
+        self._from = 0.0
+        self._to = 0.0
+
+    def start(self, angulo_atual, now_ms, index):
+        """Monta a curva de `angulo_atual` até o setor `index`."""
+        self.index = index
+        # Ponto dentro do setor, longe das bordas, alinhado aos quadros da textura
+        dentro = self.rng.uniform(0.2, 0.8) * self.angulo_por_setor
+        alvo = WheelTexture.snap(POINTER_ANGLE - (self.index * self.angulo_por_setor + dentro))
+        voltas = self.rng.randint(7, 8)
+
+        self._start_ms = now_ms
+        self._from = angulo_atual
+        self._to = angulo_atual + voltas * 360 + (alvo - angulo_atual) % 360
+        return self.index
+
+    def angle(self, now_ms):
+        p = min(1.0, max(0.0, (now_ms - self._start_ms) / SPIN_DURATION_MS))
+        # Freio exponencial normalizado: parecido com o antigo "velocidade *= 0.991"
+        ease = (1 - math.exp(-SPIN_EASE * p)) / (1 - math.exp(-SPIN_EASE))
+        return self._from + (self._to - self._from) * ease
+
+    def done(self, now_ms):
+        return now_ms - self._start_ms >= SPIN_DURATION_MS
+
+    @property
+    def final_angle(self):
+        return self._to
+
+
+# ===========================================================
+#        MODELO (REGRAS SEM PYGAME)
+# ===========================================================
+
+# Pontos de cada tipo de setor por dificuldade
+EFEITOS_ROLETA = {
+    "facil": {"penalidade_baixa": -15, "penalidade_alta": -25, "bonus_baixo": 25, "bonus_alto": 40},
+    "normal": {"penalidade_baixa": -30, "penalidade_alta": -50, "bonus_baixo": 30, "bonus_alto": 50},
+    "dificil": {"penalidade_baixa": -50, "penalidade_alta": -80, "bonus_baixo": 60, "bonus_alto": 100},
+}
+
+# Setores da roleta: (nome, tipo de efeito, descrição)
+SETORES = [
+    ("Falha em Servidor", "penalidade_baixa", "Servidor caiu!"),
+    ("Treinamento", "bonus_baixo", "Equipe capacitada!"),
+    ("Ransomware", "penalidade_alta", "Dados sequestrados!"),
+    ("Auditoria capacitada", "bonus_alto", "Compliance total!"),
+    ("Erro Humano", "penalidade_baixa", "Falha operacional!"),
+    ("Automação de processos", "bonus_baixo", "Processos rápidos!"),
+    ("Comunicação pessima", "penalidade_baixa", "Ruído na gestão!"),
+    ("Nova Política", "bonus_baixo", "Governança OK!"),
+]
+
+
+def criar_modelo(dificuldade, rng=None):
+    """RouletteModel com os SETORES valendo os pontos da `dificuldade`."""
+    efeitos = EFEITOS_ROLETA.get(dificuldade, EFEITOS_ROLETA["dificil"])
+    eventos = [{"nome": nome, "efeito": efeitos[tipo], "descricao": descricao}
+               for nome, tipo, descricao in SETORES]
+    return RouletteModel(eventos, rng)
 
 
 # ===========================================================
 #                    FUNÇÃO PRINCIPAL (ASYNC)
 # ===========================================================
-async def roleta_risco(screen):
+async def roleta_risco(screen, seed=None):
     pygame.display.set_caption("Roleta do Risco - Rodada Bônus")
-    clock = pygame.time.Clock()
 
     # Caminhos
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -121,54 +321,34 @@ async def roleta_risco(screen):
     perigo_icon_path = os.path.join(assets_dir, "icons", "perigo.png")
     seta_path = os.path.join(assets_dir, "icons", "seta.png")
 
-    bg_original = None
-    if os.path.exists(bg_path):
-        bg_original = pygame.image.load(bg_path).convert()
+    bg_original = asset_manager.load(bg_path)
 
-    # === CONFIGURAÇÃO DE DIFICULDADE ===
-    diff = dm.get_difficulty()
-    if diff == 'facil':
-        penalidade_baixa = -15; penalidade_alta = -25; bonus_baixo = 25; bonus_alto = 40
-    elif diff == 'normal':
-        penalidade_baixa = -30; penalidade_alta = -50; bonus_baixo = 30; bonus_alto = 50
-    else:
-        penalidade_baixa = -50; penalidade_alta = -80; bonus_baixo = 60; bonus_alto = 100
+    # === REGRAS (setores, pontos e sorteio ficam no modelo) ===
+    modelo = criar_modelo(dm.get_difficulty(), random.Random(seed) if seed is not None else None)
 
     # === CORES NEON ===
     COLOR_ROSA = (207, 46, 57)  # #cf2e39
     COLOR_AZUL = (32, 18, 204)  # #2012cc
 
-    # Dados da roleta
-    eventos_raw = [
-        {"nome": "Falha em Servidor", "efeito": penalidade_baixa, "descricao": "Servidor caiu!"},
-        {"nome": "Treinamento", "efeito": bonus_baixo, "descricao": "Equipe capacitada!"},
-        {"nome": "Ransomware", "efeito": penalidade_alta, "descricao": "Dados sequestrados!"},
-        {"nome": "Auditoria capacitada", "efeito": bonus_alto, "descricao": "Compliance total!"},
-        {"nome": "Erro Humano", "efeito": penalidade_baixa, "descricao": "Falha operacional!"},
-        {"nome": "Automação de processos", "efeito": bonus_baixo, "descricao": "Processos rápidos!"},
-        {"nome": "Comunicação pessima", "efeito": penalidade_baixa, "descricao": "Ruído na gestão!"},
-        {"nome": "Nova Política", "efeito": bonus_baixo, "descricao": "Governança OK!"},
-    ]
-
+    # Dados da roleta (cor alternada por setor)
     eventos = []
-    for i, ev in enumerate(eventos_raw):
-        ev["cor"] = COLOR_AZUL if i % 2 == 0 else COLOR_ROSA
-        eventos.append(ev)
+    for i, ev in enumerate(modelo.eventos):
+        eventos.append(dict(ev, cor=COLOR_AZUL if i % 2 == 0 else COLOR_ROSA))
 
     num_setores = len(eventos)
     angulo_por_setor = 360.0 / num_setores
     
     # Estados
     angulo_atual = 0.0
-    velocidade = 0.0
+    spin = SpinModel(num_setores, seed)
     girando = False
     is_tension_phase = False
     tension_start_time = 0
+    giro = None        # resultado do modelo, revelado depois do suspense
     resultado = None
-    
-    pontos_desta_fase = 0
-    sparks = []; gold_sparks = []
-    orbit_sparks = [] 
+    sparks = spark_particles(); golds = gold_sparks()
+    orbit = None
+    roda = None
     
     # Efeitos visuais
     result_fade_alpha = 0
@@ -180,9 +360,9 @@ async def roleta_risco(screen):
         w, h = surface.get_size()
         
         if bg_original:
-            layout['bg'] = pygame.transform.scale(bg_original, (w, h))
+            layout['bg'] = asset_manager.scaled(bg_path, (w, h), filter="fast")
         else:
-            layout['bg'] = pygame.Surface((w, h)); layout['bg'].fill((12, 2, 10))
+            layout['bg'] = image_ops.new_surface((w, h)); layout['bg'].fill((12, 2, 10))
 
         title_size = min(int(h * 0.08), int(w * 0.045)) 
         layout['font_title'] = load_font(title_size)
@@ -195,19 +375,23 @@ async def roleta_risco(screen):
         layout['raio'] = min(w, h) // 3.2
 
         # Recria partículas orbitais
-        nonlocal orbit_sparks
-        orbit_sparks = [OrbitSpark(layout['centro'], layout['raio']) for _ in range(16)]
+        nonlocal orbit, roda
+        orbit = orbit_sparks(layout['centro'], layout['raio'])
+
+        # Textura da roleta só é refeita quando o raio (ou a fonte) muda
+        if roda is None or roda.raio != layout['raio'] or roda.font is not layout['font_roleta']:
+            if roda is not None:
+                roda.release()
+            roda = WheelTexture(eventos, layout['raio'], layout['font_roleta'])
+            if girando:
+                roda.prerender()
 
         icon_size = int(h * 0.11)
-        layout['icon_warning'] = None
-        if os.path.exists(perigo_icon_path):
-            img = pygame.image.load(perigo_icon_path).convert_alpha()
-            layout['icon_warning'] = pygame.transform.smoothscale(img, (icon_size, icon_size))
-
-        layout['seta_indicador'] = None
-        if os.path.exists(seta_path):
-            img = pygame.image.load(seta_path).convert_alpha()
-            layout['seta_indicador'] = pygame.transform.smoothscale(img, (int(h*0.06), int(h*0.08)))
+        # Ícones lidos do disco uma vez só; o resize só pega a variante escalada
+        layout['icon_warning'] = asset_manager.scaled(perigo_icon_path, (icon_size, icon_size), alpha=True)
+
+        layout['seta_indicador'] = asset_manager.scaled(seta_path, (int(h*0.06), int(h*0.08)), alpha=True)
+        if layout['seta_indicador']:
             layout['seta_rect'] = layout['seta_indicador'].get_rect(midbottom=(layout['centro'][0], layout['centro'][1] - layout['raio']))
         else:
              c = layout['centro']; r = layout['raio']
@@ -222,84 +406,21 @@ async def roleta_risco(screen):
     float_timer = 0
 
     while running:
-        dt_ms = clock.tick(60)
-        dt = dt_ms / 1000.0
-        float_timer += dt
+        ticks = scene_manager.ticks
+        interp = scene_manager.alpha
+        float_timer += ticks * TICK
         W, H = screen.get_size()
-        current_ticks = pygame.time.get_ticks()
-
-        # 1. Background
-        screen.blit(layout['bg'], (0, 0))
-        
-        # === TÍTULO ===
-        float_y = math.sin(float_timer * 2.5) * 6 
-        titulo_texto = "RODADA BÔNUS   ►   ROLETA DO RISCO"
-        t_surf = layout['font_title'].render(titulo_texto, True, (255, 215, 0))
-        t_shadow = layout['font_title'].render(titulo_texto, True, (0, 0, 0))
-        t_rect = t_surf.get_rect(center=(W // 2, int(H * 0.12) + float_y))
-        screen.blit(t_shadow, (t_rect.x + 3, t_rect.y + 3))
-        screen.blit(t_surf, t_rect)
-
-        if layout['icon_warning']:
-            screen.blit(layout['icon_warning'], (t_rect.left - layout['icon_warning'].get_width() - 20, t_rect.centery - layout['icon_warning'].get_height()//2))
-            screen.blit(layout['icon_warning'], (t_rect.right + 20, t_rect.centery - layout['icon_warning'].get_height()//2))
-
-        # === EFEITO PISCA-PISCA TRAS (BACKLIGHT NEON) ===
-        draw_neon_backlight(screen, layout['centro'], layout['raio'], current_ticks)
-
-        # === DESENHA A ROLETA (FRENTE) ===
+        current_ticks = game_clock.ticks()
         centro = layout['centro']; raio = layout['raio']
-        pygame.draw.circle(screen, (0,0,0), centro, raio) # Fundo preto da pizza
-
-        for i, ev in enumerate(eventos):
-            a_i = math.radians(i * angulo_por_setor + angulo_atual)
-            a_f = math.radians((i + 1) * angulo_por_setor + angulo_atual)
-            p2 = (centro[0] + raio * math.cos(a_i), centro[1] + raio * math.sin(a_i))
-            p3 = (centro[0] + raio * math.cos(a_f), centro[1] + raio * math.sin(a_f))
-            
-            pygame.draw.polygon(screen, ev["cor"], [centro, p2, p3])
-            pygame.draw.polygon(screen, (0, 0, 0), [centro, p2, p3], 2) # Linha preta
-
-            # Texto
-            nome_split = ev["nome"].split(" ")
-            ang_txt = math.radians(i * angulo_por_setor + angulo_atual + angulo_por_setor / 2)
-            dist_txt = raio * 0.68
-            
-            for idx, palavra in enumerate(nome_split):
-                offset = (idx - len(nome_split)/2) * 18
-                tx = centro[0] + math.cos(ang_txt) * (dist_txt - offset)
-                ty = centro[1] + math.sin(ang_txt) * (dist_txt - offset)
-
-                txt_s = layout['font_roleta'].render(palavra, True, (255, 255, 255))
-                for ox in [-1, 1]:
-                    for oy in [-1, 1]:
-                         screen.blit(layout['font_roleta'].render(palavra, True, (0,0,0)), (tx - txt_s.get_width()//2 + ox, ty - txt_s.get_height()//2 + oy))
-                screen.blit(txt_s, (tx - txt_s.get_width()//2, ty - txt_s.get_height()//2))
-
-        # Centro
-        pygame.draw.circle(screen, (30, 30, 30), centro, raio * 0.15)
-        pygame.draw.circle(screen, (255, 215, 0), centro, raio * 0.15, 4)
-
-        # Orbit Sparks (Fagulhas girando em volta)
-        for ospark in orbit_sparks:
-            ospark.update()
-            ospark.draw(screen)
-
-        # Seta
-        if layout['seta_indicador']:
-            screen.blit(layout['seta_indicador'], layout['seta_rect'])
-        else:
-            pygame.draw.polygon(screen, (255, 255, 0), layout['indicador_poly'])
-            pygame.draw.polygon(screen, (0, 0, 0), layout['indicador_poly'], 2)
 
         # === LÓGICA DE GIRO ===
         if girando:
-            angulo_atual += velocidade
-            velocidade *= 0.991 
+            angulo_atual = spin.angle(current_ticks)
             
             # PARADA -> INICIA SUSPENSE
-            if abs(velocidade) < 0.1:
+            if spin.done(current_ticks):
                 girando = False
+                angulo_atual = spin.final_angle
                 is_tension_phase = True
                 tension_start_time = current_ticks
 
@@ -308,31 +429,68 @@ async def roleta_risco(screen):
             if current_ticks - tension_start_time > 1500:
                 is_tension_phase = False
                 
-                idx = int(((270 - angulo_atual) % 360) // angulo_por_setor)
+                idx = giro["index"]
                 resultado = eventos[idx]
-                pontos_desta_fase = resultado["efeito"]
-                ScoreManager.add_points(pontos_desta_fase)
+                ScoreManager.add_points(giro["points"])
                 
                 result_fade_alpha = 0 
                 
-                ang_s = math.radians(idx * angulo_por_setor + angulo_por_setor / 2.0)
+                ang_s = math.radians(idx * angulo_por_setor + angulo_por_setor / 2.0 + angulo_atual)
                 sx = centro[0] + math.cos(ang_s) * (raio * 0.70)
                 sy = centro[1] + math.sin(ang_s) * (raio * 0.70)
                 
                 if resultado["efeito"] < 0:
                     AudioManager.play_sfx_if_exists("errado")
-                    for _ in range(30): sparks.append(SparkParticle(sx, sy))
+                    sparks.emit(performance.particle_count(30), x=sx, y=sy)
                 else:
                     AudioManager.play_sfx_if_exists("correto")
-                    for _ in range(20): gold_sparks.append(SparkGold(sx, sy))
+                    golds.emit(performance.particle_count(20), x=(sx - 6, sx + 6), y=(sy - 6, sy + 6))
+
+        # Partículas (fagulhas em órbita e as do resultado)
+        orbit.advance(ticks, TICK)
+        sparks.advance(ticks, TICK)
+        golds.advance(ticks, TICK)
+
+        if resultado and not girando and not is_tension_phase:
+            result_fade_alpha = min(255, result_fade_alpha + RESULT_FADE_SPEED * TICK * ticks)
+        displayed = ScoreManager.update_displayed_score()
+
+        # 1. Background
+        instrumentation.mark("update")
+        image_ops.blit(screen, layout['bg'], (0, 0))
+        
+        # === TÍTULO ===
+        float_y = math.sin(float_timer * 2.5) * 6 
+        titulo_texto = "RODADA BÔNUS   ►   ROLETA DO RISCO"
+        t_surf = render_text(layout['font_title'], titulo_texto, (255, 215, 0))
+        t_shadow = render_text(layout['font_title'], titulo_texto, (0, 0, 0))
+        t_rect = t_surf.get_rect(center=(W // 2, int(H * 0.12) + float_y))
+        image_ops.blit(screen, t_shadow, (t_rect.x + 3, t_rect.y + 3))
+        image_ops.blit(screen, t_surf, t_rect)
 
-        # Atualiza Partículas de Resultado
-        if sparks:
-            for s in sparks[:]: s.update(dt_ms); s.draw(screen); 
-            if s.life <= 0: sparks.remove(s)
-        if gold_sparks:
-            for g in gold_sparks[:]: g.update(); g.draw(screen); 
-            if g.life <= 0: gold_sparks.remove(g)
+        if layout['icon_warning']:
+            image_ops.blit(screen, layout['icon_warning'], (t_rect.left - layout['icon_warning'].get_width() - 20, t_rect.centery - layout['icon_warning'].get_height()//2))
+            image_ops.blit(screen, layout['icon_warning'], (t_rect.right + 20, t_rect.centery - layout['icon_warning'].get_height()//2))
+
+        # === EFEITO PISCA-PISCA TRAS (BACKLIGHT NEON) ===
+        draw_neon_backlight(screen, layout['centro'], layout['raio'], current_ticks)
+
+        # === DESENHA A ROLETA (FRENTE) ===
+        roda.draw(screen, centro, angulo_atual)
+
+        # Orbit Sparks (Fagulhas girando em volta)
+        orbit.draw(screen, interp=interp)
+
+        # Seta
+        if layout['seta_indicador']:
+            image_ops.blit(screen, layout['seta_indicador'], layout['seta_rect'])
+        else:
+            pygame.draw.polygon(screen, (255, 255, 0), layout['indicador_poly'])
+            pygame.draw.polygon(screen, (0, 0, 0), layout['indicador_poly'], 2)
+
+        # Partículas de Resultado
+        sparks.draw(screen, interp=interp)
+        golds.draw(screen, interp=interp)
 
         # === UI (Botão Girar) ===
         if not girando and not is_tension_phase and resultado is None:
@@ -346,12 +504,9 @@ async def roleta_risco(screen):
 
         # === RESULTADO (APARECE SUAVE) ===
         if resultado and not girando and not is_tension_phase:
-            result_fade_alpha = min(255, result_fade_alpha + 15)
             glow_color = (255, 200, 100) if resultado["efeito"] > 0 else (255, 100, 100)
 
-            overlay = pygame.Surface((W, H), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, int(result_fade_alpha * 0.7)))
-            screen.blit(overlay, (0,0))
+            image_ops.shade(screen, (0, 0, 0), result_fade_alpha * 0.7)
             
             rect = pygame.Rect(0, 0, min(W * 0.8, 600), min(H * 0.4, 300))
             rect.center = (W//2, H//2)
@@ -361,9 +516,8 @@ async def roleta_risco(screen):
                                     border_color=(glow_color[0], glow_color[1], glow_color[2], result_fade_alpha))
             
             if result_fade_alpha > 200:
-                glow_surf = pygame.Surface((rect.width+10, rect.height+10), pygame.SRCALPHA)
-                pygame.draw.rect(glow_surf, (*glow_color, 50), glow_surf.get_rect(), border_radius=20, width=4)
-                screen.blit(glow_surf, (rect.x-5, rect.y-5), special_flags=pygame.BLEND_RGBA_ADD)
+                glow_surf = sprite_cache.glow_outline((rect.width+10, rect.height+10), glow_color, 50, width=4, border_radius=20)
+                image_ops.blit(screen, glow_surf, (rect.x-5, rect.y-5), special_flags=pygame.BLEND_RGBA_ADD)
 
             sinal = "+" if resultado["efeito"] > 0 else ""
             texto = f"{resultado['nome']}\n\n{resultado['descricao']}\n\nImpacto: {sinal}{resultado['efeito']} Pontos"
@@ -371,36 +525,34 @@ async def roleta_risco(screen):
             if result_fade_alpha > 100:
                 draw_text_wrapped(screen, texto, layout['font_text'], (255, 255, 255), rect.inflate(-40,-60))
                 blink = int(math.sin(current_ticks * 0.01) * 100 + 155)
-                txt_cont = layout['font_small'].render("Toque para continuar", True, (200, 200, 200))
-                txt_cont.set_alpha(blink)
-                screen.blit(txt_cont, txt_cont.get_rect(center=(W//2, rect.bottom + 40)))
+                txt_cont = render_text(layout['font_small'], "Toque para continuar", (200, 200, 200), alpha=blink)
+                image_ops.blit(screen, txt_cont, txt_cont.get_rect(center=(W//2, rect.bottom + 40)))
 
         # Score
-        displayed = ScoreManager.update_displayed_score()
         draw_score_display(screen, displayed, layout['font_small'], position="topright")
+        instrumentation.mark("draw")
 
         # === INPUTS ===
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if e.type == pygame.KEYDOWN and e.key == pygame.K_F11:
-                pygame.display.toggle_fullscreen()
+        for e in input_manager.poll():
+            if e.type == input_manager.RESIZED:
                 screen = pygame.display.get_surface()
                 resize_layout(screen)
 
             if e.type == pygame.MOUSEBUTTONDOWN:
                 if e.button == 1: 
                     if resultado and not girando and result_fade_alpha > 150:
-                        await show_pause_screen(screen, clock, "Fim da Rodada Bônus", f"Pontuação Total: {ScoreManager.get_score()}", theme="Roleta de Risco")
-                        return pontos_desta_fase
+                        await show_pause_screen(screen, "Fim da Rodada Bônus", f"Pontuação Total: {ScoreManager.get_score()}", theme="Roleta de Risco")
+                        roda.release()
+                        return modelo.score
                     
                     if not girando and not is_tension_phase and resultado is None:
                         AudioManager.play_sfx_if_exists("roleta") 
-                        velocidade = random.uniform(22.0, 28.0)
+                        giro = modelo.apply(("spin",))
+                        roda.prerender()
+                        spin.start(angulo_atual, game_clock.ticks(), giro["index"])
                         girando = True
 
-        pygame.display.flip()
-        
         # PONTO CRÍTICO PARA PYBAG:
-        await asyncio.sleep(0) 
+        await scene_manager.frame()
 
-    return pontos_desta_fase
\ No newline at end of file
+    return modelo.score
\ No newline at end of file
@@ -2,17 +2,27 @@
 #           MINIGAME SHOW DO BILHÃO 
 # ===========================================================
 
-import asyncio  # <--- 1. IMPORT ESSENCIAL
 import pygame
-import sys
 import os
 import random
 import math
-import time
-from src.utils import draw_text_wrapped, draw_score_display, load_font, show_pause_screen
+from src.utils import draw_text_wrapped, draw_score_display, load_font, show_pause_screen, render_text
+from src.text_layout import fit_text
 from src.score_manager import ScoreManager
 from src.audio_manager import AudioManager
 import src.difficulty_manager as dm
+from src import performance, instrumentation
+from src.input_manager import input_manager
+from src.scene_manager import scene_manager, TICK
+from src.game_clock import game_clock
+from src.asset_manager import asset_manager
+from src import image_ops
+from src.particle_system import ParticleSystem
+from src.compositor import Compositor
+from src.minigames.models import QuizModel, pontos_por_regras
+
+# Queda do tremor de tela (por segundo)
+SHAKE_DECAY = 30
 
 # ===========================================================
 #            BANCO DE PERGUNTAS (MANTIDO)
@@ -137,97 +147,49 @@ ALL_QUESTIONS = {
 # ===========================================================
 #        SISTEMA DE PARTÍCULAS: MONEY RAIN (FUNDO)
 # ===========================================================
-class MoneyParticle:
+def money_particles(w, h, font):
     """Partículas financeiras que flutuam no fundo"""
-    def __init__(self, w, h, font):
-        self.w, self.h = w, h
-        self.font = font
-        self.reset(first_time=True)
-
-    def reset(self, first_time=False):
-        self.char = "$"
-        self.x = random.randint(20, self.w - 20)
-        
-        if first_time:
-            self.y = random.randint(0, self.h)
-        else:
-            self.y = random.randint(self.h, self.h + 100)
-            
-        self.speed = random.uniform(0.5, 2.5)
-        self.base_alpha = random.randint(50, 150)
-        self.scale = random.uniform(0.5, 1.2)
-        self.rotation = random.uniform(0, 360)
-        self.rot_speed = random.uniform(-1.5, 1.5)
-        
-        self.color = random.choice([
+    return ParticleSystem(
+        performance.particle_count(35),
+        shape="glyph", chars=["$"], font=font, anchor="center",
+        palette=[
             (255, 215, 0),   # Gold
             (0, 255, 0),     # Green
             (0, 255, 255),   # Cyan
             (180, 180, 180)  # Platinum
-        ])
-
-    def update(self, dt):
-        self.y -= self.speed * dt
-        self.rotation += self.rot_speed * dt
-        
-        if self.y < -50:
-            self.reset()
-
-    def draw(self, screen):
-        surf = self.font.render(self.char, True, self.color)
-        w = int(surf.get_width() * self.scale)
-        h = int(surf.get_height() * self.scale)
-        if w <= 0 or h <= 0: return
-        surf = pygame.transform.scale(surf, (w, h))
-        surf = pygame.transform.rotate(surf, self.rotation)
-        surf.set_alpha(self.base_alpha)
-        
-        rect = surf.get_rect(center=(int(self.x), int(self.y)))
-        screen.blit(surf, rect)
+        ],
+        bounds=(-math.inf, -50, math.inf, math.inf),
+        spawn={
+            "x": (20, w - 20), "y": (0, h),
+            "vy": (-156.25, -31.25),
+            "alpha": (50, 150),
+            "scale": (0.5, 1.2),
+            "angle": (0, 360),
+            "spin": (-93.75, 93.75),
+        },
+        respawn={"y": (h, h + 100)},
+    )
 
 
 # ===========================================================
 #        SISTEMA DE PARTÍCULAS: CLICK EXPLOSION (NOVO)
 # ===========================================================
-class ExplosionParticle:
+def explosion_particles(font):
     """Partículas que explodem ao clicar no botão"""
-    def __init__(self, x, y, font):
-        self.x, self.y = x, y
-        self.font = font
-        self.char = "$"
-        
-        # Física de Explosão
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(3, 9)
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
-        
-        self.life = 255
-        self.decay = random.uniform(5, 12)
-        self.size = random.uniform(0.4, 0.8)
-        self.gravity = 0.2
-        
+    return ParticleSystem(
+        performance.particle_count(25) * 4,
+        shape="glyph", chars=["$"], font=font,
         # Cores Dourado e Verde
-        self.color = random.choice([(255, 215, 0), (50, 255, 50), (255, 255, 200)])
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += self.gravity # Cai um pouco
-        self.life -= self.decay
-
-    def draw(self, screen):
-        if self.life <= 0: return
-        
-        surf = self.font.render(self.char, True, self.color)
-        
-        # Escala
-        w = int(surf.get_width() * self.size)
-        h = int(surf.get_height() * self.size)
-        if w > 0 and h > 0:
-            surf = pygame.transform.scale(surf, (w, h))
-            surf.set_alpha(int(self.life))
-            screen.blit(surf, (self.x, self.y))
+        palette=[(255, 215, 0), (50, 255, 50), (255, 255, 200)],
+        on_exit="kill", fill=False,
+        gravity=720, # Cai um pouco
+        spawn={
+            "speed": (180, 540),
+            "alpha": 255,
+            "fade": (300, 720),
+            "scale": (0.4, 0.8),
+        },
+    )
 
 
 # ===========================================================
@@ -237,9 +199,9 @@ def draw_cyber_vault_container(surface, rect, title_idx, total):
     """Desenha a caixa da pergunta parecendo um cofre digital holográfico"""
     
     # 1. Fundo Glass (Vidro Escuro)
-    s = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
+    s = image_ops.new_surface((rect.width, rect.height), pygame.SRCALPHA)
     s.fill((10, 15, 30, 200)) # Azul/Preto muito escuro e transparente
-    surface.blit(s, rect.topleft)
+    image_ops.blit(surface, s, rect.topleft)
     
     # 2. Borda Principal (Dourado Neon Fino)
     pygame.draw.rect(surface, (180, 160, 50), rect, 1, border_radius=2)
@@ -266,8 +228,8 @@ def draw_cyber_vault_container(surface, rect, title_idx, total):
     
     # Label
     font = load_font(18)
-    lbl = font.render(f"PERGUNTA {title_idx}/{total}", True, (10, 10, 10))
-    surface.blit(lbl, (rect.left + 10, rect.top - 25))
+    lbl = render_text(font, f"PERGUNTA {title_idx}/{total}", (10, 10, 10))
+    image_ops.blit(surface, lbl, (rect.left + 10, rect.top - 25))
 
 def draw_option_button(surface, rect, text, font, is_hover, feedback_color=None):
     """Desenha botão estilo barra de ouro digital ou vidro"""
@@ -293,9 +255,9 @@ def draw_option_button(surface, rect, text, font, is_hover, feedback_color=None)
     pygame.draw.rect(surface, (0, 0, 0, 150), shadow_rect, border_radius=10)
 
     # Draw Button Body
-    surf = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
+    surf = image_ops.new_surface((rect.width, rect.height), pygame.SRCALPHA)
     pygame.draw.rect(surf, bg_color, surf.get_rect(), border_radius=10)
-    surface.blit(surf, rect.topleft)
+    image_ops.blit(surface, surf, rect.topleft)
 
     # Draw Border
     pygame.draw.rect(surface, border_color, rect, 2 if not is_hover else 3, border_radius=10)
@@ -305,24 +267,34 @@ def draw_option_button(surface, rect, text, font, is_hover, feedback_color=None)
     pygame.draw.circle(surface, hex_color, (rect.left + 25, rect.centery), 6)
     pygame.draw.circle(surface, border_color, (rect.left + 25, rect.centery), 10, 1)
 
-    # Text Rendering
-    txt_surf = font.render(text, True, text_color)
-    
-    # Ajuste de texto
-    available_w = rect.width - 60
-    if txt_surf.get_width() > available_w:
-        scale = available_w / txt_surf.get_width()
-        txt_surf = pygame.transform.smoothscale(txt_surf, (int(txt_surf.get_width() * scale), int(txt_surf.get_height() * scale)))
+    # Text Rendering (reduzido para caber; versão reduzida fica em cache)
+    txt_surf = fit_text(font, text, text_color, rect.width - 60)
     
     text_rect = txt_surf.get_rect(midleft=(rect.left + 50, rect.centery))
-    surface.blit(txt_surf, text_rect)
+    image_ops.blit(surface, txt_surf, text_rect)
+
+# ===========================================================
+#               MODELO (REGRAS SEM PYGAME)
+# ===========================================================
+def criar_modelo(rules, tipo, rng=None):
+    """QuizModel com as perguntas do nível `tipo` (regras do difficulty_manager)."""
+    perguntas = []
+    for q in ALL_QUESTIONS.get(tipo, ALL_QUESTIONS["normal"]):
+        key_correta = q["resposta"]
+        perguntas.append({
+            "pergunta": q["pergunta"],
+            "opcoes": list(q["opcoes"].values()),
+            "correta": q["opcoes"][key_correta],
+            "motivo": q["motivos"][key_correta],
+        })
+    acerto, erro = pontos_por_regras(rules)
+    return QuizModel(perguntas, acerto, erro, rng)
 
 # ===========================================================
 #               FUNÇÃO PRINCIPAL DO MINIGAME (ASYNC)
 # ===========================================================
 async def run_show_do_bilhao(screen): # <--- 2. ASYNC DEF
     pygame.display.set_caption("Show do Bilhão - Cyber Edition")
-    clock = pygame.time.Clock()
 
     layout = {}
     base = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -330,14 +302,10 @@ async def run_show_do_bilhao(screen): # <--- 2. ASYNC DEF
     bg_path = os.path.join(assets, "background", "background_show_do_bilhao.jpg") 
     icon_path = os.path.join(assets, "icons", "money.png")
     
-    bg_original = None
-    if os.path.exists(bg_path):
-        bg_original = pygame.image.load(bg_path).convert()
+    bg_original = asset_manager.load(bg_path)
 
     # Carrega o ícone original
-    icon_original = None
-    if os.path.exists(icon_path):
-        icon_original = pygame.image.load(icon_path).convert_alpha()
+    icon_original = asset_manager.load(icon_path, alpha=True)
 
     # === FUNÇÃO DE RESIZE ===
     def resize_assets(surface):
@@ -345,31 +313,20 @@ async def run_show_do_bilhao(screen): # <--- 2. ASYNC DEF
         
         # Gera um background cyber
         if bg_original:
-            layout['background'] = pygame.transform.scale(bg_original, (w, h))
             # Escurecer para destacar o neon
-            dark = pygame.Surface((w, h))
-            dark.fill((0, 0, 0))
-            dark.set_alpha(100)
-            layout['background'].blit(dark, (0,0))
+            layout['background'] = image_ops.darken(asset_manager.scaled(bg_path, (w, h), filter="fast"), (0, 0, 0), 100)
         else:
-            layout['background'] = pygame.Surface((w, h))
-            for y in range(h):
-                c = int(20 * (1 - y/h))
-                pygame.draw.line(layout['background'], (c, c, c+10), (0, y), (w, y))
+            layout['background'] = image_ops.gradient((w, h), (20, 20, 30), (0, 0, 10))
 
         # Configura ícone e Efeito Glow
         if icon_original:
             icon_size = int(h * 0.12)
-            icon_surf = pygame.transform.smoothscale(icon_original, (icon_size, icon_size))
+            icon_surf = asset_manager.scaled(icon_path, (icon_size, icon_size), alpha=True)
             layout['icon_money'] = icon_surf
             
             # CRIAÇÃO DO GLOW (MÁSCARA DOURADA)
-            try:
-                mask = pygame.mask.from_surface(icon_surf)
-                glow_surf = mask.to_surface(setcolor=(255, 215, 0, 255), unsetcolor=(0, 0, 0, 0))
-                layout['icon_glow'] = glow_surf
-            except:
-                layout['icon_glow'] = None
+            # Cópia própria: o alpha dela pulsa a cada frame (set_alpha)
+            layout['icon_glow'] = image_ops.copy(image_ops.glow_mask(icon_surf, (255, 215, 0)))
         else:
             layout['icon_money'] = None
             layout['icon_glow'] = None
@@ -383,88 +340,76 @@ async def run_show_do_bilhao(screen): # <--- 2. ASYNC DEF
     resize_assets(screen)
     
     # Listas de Partículas
-    bg_particles = [MoneyParticle(screen.get_width(), screen.get_height(), layout['font_particle']) for _ in range(35)]
-    explosion_particles = [] # Lista para as explosões de clique
+    bg_particles = money_particles(screen.get_width(), screen.get_height(), layout['font_particle'])
+    explosions = explosion_particles(layout['font_particle']) # Explosões de clique
 
-    # === CONFIGURAÇÃO DE DIFICULDADE ===
-    diff_rules = dm.get_rules()
-    questions_type = dm.get_question_set_type() 
-    raw_questions = ALL_QUESTIONS.get(questions_type, ALL_QUESTIONS["normal"])
-    
-    # Prepara perguntas
-    perguntas = []
-    for q in raw_questions:
-        opcoes_texto = list(q["opcoes"].values())
-        key_correta = q["resposta"]
-        texto_correto = q["opcoes"][key_correta]
-        motivo_correto = q["motivos"][key_correta]
-        random.shuffle(opcoes_texto)
-        perguntas.append({
-            "pergunta": q["pergunta"],
-            "opcoes_embaralhadas": opcoes_texto,
-            "texto_correto": texto_correto,
-            "motivo_correto": motivo_correto
-        })
-    random.shuffle(perguntas)
+    # === REGRAS (ordem, opções e pontos ficam no modelo) ===
+    quiz = criar_modelo(dm.get_rules(), dm.get_question_set_type())
 
-    pontos_acerto = 10 + diff_rules["bonus_acerto"]
-    pontos_erro = -diff_rules["perda_pontos"]
-    
-    pergunta_idx = 0
     feedback = None
     FEEDBACK_DURATION = 2500
     
     shake_amount = 0
 
+    # Camada da interface reaproveitada entre frames (só limpa, não realoca)
+    layers = Compositor(screen.get_size())
+
     while True:
-        dt = clock.tick(60) / 16.0
+        ticks = scene_manager.ticks
         w, h = screen.get_size()
+        layers.resize((w, h))
 
-        # Shake Decay
+        # Shake Decay (30/s, por tick)
         if shake_amount > 0:
-            shake_amount -= 0.5
+            shake_amount -= SHAKE_DECAY * TICK * ticks
             if shake_amount < 0: shake_amount = 0
         
         shake_x = random.randint(-int(shake_amount), int(shake_amount))
         shake_y = random.randint(-int(shake_amount), int(shake_amount))
 
-        # 1. Background
-        screen.blit(layout['background'], (0, 0))
-        
-        # 2. Partículas de Fundo
-        for p in bg_particles:
-            p.update(dt)
-            p.draw(screen)
+        bg_particles.advance(ticks, TICK)
+        explosions.advance(ticks, TICK)
 
-        if pergunta_idx >= len(perguntas):
+        # Fim do feedback: passa para a próxima pergunta
+        if feedback and game_clock.ticks() - feedback["start"] >= feedback["dur"]:
+            quiz.apply(("next",))
+            feedback = None
+
+        if quiz.done:
             AudioManager.play_sfx_if_exists("roleta")
             # CHAMADA ASYNC
-            await show_pause_screen(screen, clock, "Fim do Show!", f"Saldo Final: {ScoreManager.get_score()}", theme="Show do Bilhão")
+            await show_pause_screen(screen, "Fim do Show!", f"Saldo Final: {ScoreManager.get_score()}", theme="Show do Bilhão")
             return 0
 
-        pergunta_atual = perguntas[pergunta_idx]
+        pergunta_atual = quiz.atual
+
+        # 1. Background
+        instrumentation.mark("update")
+        image_ops.blit(screen, layout['background'], (0, 0))
+        
+        # 2. Partículas de Fundo
+        bg_particles.draw(screen, interp=scene_manager.alpha)
 
         # === INTERFACE FLUTUANTE ===
-        float_y = math.sin(pygame.time.get_ticks() * 0.003) * 5
-        game_surf = pygame.Surface((w, h), pygame.SRCALPHA)
+        float_y = math.sin(game_clock.ticks() * 0.003) * 5
+        game_surf = layers.begin("game")
 
         # Cabeçalho
         title_txt = "SHOW DO BILHÃO"
-        title_surf = layout['font_titulo'].render(title_txt, True, (255, 255, 255))
+        title_surf = render_text(layout['font_titulo'], title_txt, (255, 255, 255))
         
         # Efeito Neon
         neon_color = (255, 215, 0)
-        current_ticks = pygame.time.get_ticks()
+        current_ticks = game_clock.ticks()
         glow_alpha = 150 + int(50 * math.sin(current_ticks * 0.01))
         
-        glow_title = layout['font_titulo'].render(title_txt, True, neon_color)
-        glow_title.set_alpha(glow_alpha)
+        glow_title = render_text(layout['font_titulo'], title_txt, neon_color, alpha=glow_alpha)
         
         title_rect = title_surf.get_rect(center=(w // 2, int(h * 0.08)))
         
-        game_surf.blit(glow_title, (title_rect.x - 2, title_rect.y - 2))
-        game_surf.blit(glow_title, (title_rect.x + 2, title_rect.y + 2))
-        game_surf.blit(title_surf, title_rect)
+        image_ops.blit(game_surf, glow_title, (title_rect.x - 2, title_rect.y - 2))
+        image_ops.blit(game_surf, glow_title, (title_rect.x + 2, title_rect.y + 2))
+        image_ops.blit(game_surf, title_surf, title_rect)
 
         # Ícones com Glow
         if layout['icon_money']:
@@ -476,14 +421,14 @@ async def run_show_do_bilhao(screen): # <--- 2. ASYNC DEF
 
             if icon_glow:
                 icon_glow.set_alpha(glow_alpha)
-                game_surf.blit(icon_glow, (pos_left[0]-2, pos_left[1]-2))
-                game_surf.blit(icon_glow, (pos_left[0]+2, pos_left[1]+2))
-            game_surf.blit(icon, pos_left)
+                image_ops.blit(game_surf, icon_glow, (pos_left[0]-2, pos_left[1]-2))
+                image_ops.blit(game_surf, icon_glow, (pos_left[0]+2, pos_left[1]+2))
+            image_ops.blit(game_surf, icon, pos_left)
 
             if icon_glow:
-                game_surf.blit(icon_glow, (pos_right[0]-2, pos_right[1]-2))
-                game_surf.blit(icon_glow, (pos_right[0]+2, pos_right[1]+2))
-            game_surf.blit(icon, pos_right)
+                image_ops.blit(game_surf, icon_glow, (pos_right[0]-2, pos_right[1]-2))
+                image_ops.blit(game_surf, icon_glow, (pos_right[0]+2, pos_right[1]+2))
+            image_ops.blit(game_surf, icon, pos_right)
 
         # Score
         draw_score_display(game_surf, ScoreManager.get_score(), layout['font_ui'], position="topright")
@@ -496,7 +441,7 @@ async def run_show_do_bilhao(screen): # <--- 2. ASYNC DEF
         
         container_rect = pygame.Rect(c_x, c_y, c_width, c_height)
         
-        draw_cyber_vault_container(game_surf, container_rect, pergunta_idx + 1, len(perguntas))
+        draw_cyber_vault_container(game_surf, container_rect, quiz.indice + 1, len(quiz.perguntas))
         
         padding = 30
         text_area = container_rect.inflate(-padding*2, -padding*1.5)
@@ -511,7 +456,7 @@ async def run_show_do_bilhao(screen): # <--- 2. ASYNC DEF
         mouse_pos = pygame.mouse.get_pos()
         buttons = []
         
-        for i, texto_opcao in enumerate(pergunta_atual["opcoes_embaralhadas"]):
+        for i, texto_opcao in enumerate(pergunta_atual["opcoes"]):
             btn_w = w * 0.7
             btn_x = (w - btn_w) // 2
             btn_float = math.sin(current_ticks * 0.003 + i) * 3
@@ -530,21 +475,15 @@ async def run_show_do_bilhao(screen): # <--- 2. ASYNC DEF
             buttons.append((btn_rect, texto_opcao))
 
         # Desenha Interface com Shake
-        screen.blit(game_surf, (shake_x, shake_y))
+        layers.blit(screen, "game", (shake_x, shake_y))
 
         # === DESENHA EXPLOSÃO DE PARTÍCULAS ===
         # (Desenhamos aqui para ficar por cima dos botões)
-        for ep in explosion_particles[:]:
-            ep.update()
-            ep.draw(screen)
-            if ep.life <= 0:
-                explosion_particles.remove(ep)
+        explosions.draw(screen, interp=scene_manager.alpha)
 
         # Overlay de Feedback
         if feedback:
-            overlay_surf = pygame.Surface((w, h), pygame.SRCALPHA)
-            overlay_surf.fill((0, 0, 0, 180))
-            screen.blit(overlay_surf, (0,0))
+            image_ops.shade(screen, (0, 0, 0), 180)
             
             msg_w, msg_h = w * 0.6, h * 0.4
             msg_rect = pygame.Rect((w-msg_w)//2, (h-msg_h)//2, msg_w, msg_h)
@@ -554,8 +493,8 @@ async def run_show_do_bilhao(screen): # <--- 2. ASYNC DEF
             pygame.draw.rect(screen, color_res, msg_rect, 3, border_radius=20)
             
             res_txt = "EXCELENTE!" if feedback["correto"] else "ACESSO NEGADO!"
-            txt_surf = layout['font_titulo'].render(res_txt, True, color_res)
-            screen.blit(txt_surf, txt_surf.get_rect(center=(w//2, msg_rect.top + 50)))
+            txt_surf = render_text(layout['font_titulo'], res_txt, color_res)
+            image_ops.blit(screen, txt_surf, txt_surf.get_rect(center=(w//2, msg_rect.top + 50)))
             
             reason_rect = msg_rect.inflate(-60, -100)
             reason_rect.top += 60
@@ -567,29 +506,20 @@ async def run_show_do_bilhao(screen): # <--- 2. ASYNC DEF
             
             draw_text_wrapped(screen, motivo_full, layout['font_opcao'], (220, 220, 220), reason_rect)
 
-            elapsed = pygame.time.get_ticks() - feedback["start"]
-            if elapsed >= feedback["dur"]:
-                pergunta_idx += 1
-                feedback = None
-
-        pygame.display.flip()
-        
-        # 3. LINHA MÁGICA: Devolve controle ao navegador
-        await asyncio.sleep(0) 
+        # 3. LINHA MÁGICA: fecha o frame e devolve controle ao navegador
+        instrumentation.mark("draw")
+        await scene_manager.frame()
 
         # Eventos
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_F11:
-                    pygame.display.toggle_fullscreen()
-                    screen = pygame.display.get_surface()
-                    resize_assets(screen)
-                    bg_particles = [MoneyParticle(screen.get_width(), screen.get_height(), layout['font_particle']) for _ in range(35)]
-                elif event.key == pygame.K_ESCAPE:
-                    return 0
+        for event in input_manager.poll():
+            if event.type == input_manager.RESIZED:
+                screen = pygame.display.get_surface()
+                resize_assets(screen)
+                bg_particles = money_particles(screen.get_width(), screen.get_height(), layout['font_particle'])
+                explosions.font = layout['font_particle']
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                return 0
 
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and feedback is None:
                 mx, my = pygame.mouse.get_pos()
@@ -597,28 +527,26 @@ async def run_show_do_bilhao(screen): # <--- 2. ASYNC DEF
                     if rect.collidepoint(mx, my):
                         
                         # --- TRIGGER DO EFEITO DE EXPLOSÃO ---
-                        for _ in range(25): # Cria 25 partículas no ponto do clique
-                            explosion_particles.append(ExplosionParticle(mx, my, layout['font_particle']))
+                        explosions.emit(performance.particle_count(25), x=mx, y=my) # Partículas no ponto do clique
                         # -------------------------------------
 
-                        correta_str = pergunta_atual["texto_correto"]
-                        acertou = (texto_clicado == correta_str)
-                        
+                        resultado = quiz.apply(("answer", texto_clicado))
+                        ScoreManager.add_points(resultado["points"])
+                        acertou = resultado["correct"]
+
                         if acertou:
-                            ScoreManager.add_points(pontos_acerto)
                             AudioManager.play_sfx_if_exists("correto")
                         else:
-                            ScoreManager.add_points(pontos_erro)
                             AudioManager.play_sfx_if_exists("errado")
                             shake_amount = 20
 
                         feedback = {
-                            "start": pygame.time.get_ticks(),
+                            "start": game_clock.ticks(),
                             "dur": FEEDBACK_DURATION,
                             "correto": acertou,
-                            "correct_text": correta_str,
+                            "correct_text": resultado["correta"],
                             "selected_text": texto_clicado,
-                            "correct_reason": pergunta_atual["motivo_correto"],
+                            "correct_reason": pergunta_atual["motivo"],
                         }
                         break
     return 0
\ No newline at end of file
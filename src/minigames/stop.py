@@ -3,16 +3,25 @@
 # ===========================================================
 
 import pygame
-import sys
-import time
 import os
 import random
 import math
-import asyncio  # <--- ESSENCIAL PARA PYBAG
-from src.utils import show_pause_screen, draw_text_wrapped, draw_question_container, draw_score_display, load_font
+from src.utils import show_pause_screen, draw_text_wrapped, draw_question_container, draw_score_display, load_font, render_text
 from src.score_manager import ScoreManager
 from src.audio_manager import AudioManager
 import src.difficulty_manager as dm
+from src import performance, instrumentation
+from src.input_manager import input_manager
+from src.scene_manager import scene_manager, TICK
+from src.game_clock import game_clock
+from src.asset_manager import asset_manager
+from src import image_ops
+from src.particle_system import ParticleSystem
+from src.compositor import Compositor
+from src.minigames.models import QuizModel, pontos_por_regras
+
+# Queda do tremor de tela (por segundo)
+SHAKE_DECAY = 30
 
 
 # ===========================================================
@@ -49,68 +58,36 @@ ALL_QUESTIONS = {
 # ===========================================================
 #             SISTEMA DE PARTÍCULAS (STOP 2.0)
 # ===========================================================
-class StopParticle:
+def stop_particles(w, h, font):
     """Letras flutuantes com rotação e escala (Efeito 3D fake)"""
-    def __init__(self, w, h, font):
-        self.w, self.h = w, h
-        self.font = font
-        self.reset(first_time=True)
-
-    def reset(self, first_time=False):
-        self.char = random.choice(["S", "T", "O", "P", "?", "!", "$"])
-        self.x = random.randint(20, self.w - 20)
-        
-        if first_time:
-            self.y = random.randint(0, self.h)
-        else:
-            self.y = random.randint(self.h, self.h + 100)
-            
-        self.speed = random.uniform(0.5, 2.0)
-        self.base_alpha = random.randint(40, 100)
-        self.scale = random.uniform(0.6, 1.4)
-        self.rotation = random.uniform(0, 360)
-        self.rot_speed = random.uniform(-1, 1)
-        
+    return ParticleSystem(
+        performance.particle_count(30),
+        shape="glyph", chars=["S", "T", "O", "P", "?", "!", "$"], font=font,
+        anchor="center",
         # Cores Neon
-        self.color = random.choice([
+        palette=[
             (255, 80, 80),   # Vermelho Neon
             (80, 255, 255),  # Ciano Neon
             (255, 255, 80),  # Amarelo Neon
             (180, 80, 255)   # Roxo Neon
-        ])
-
-    def update(self, dt):
-        self.y -= self.speed * dt
-        self.rotation += self.rot_speed * dt
-        
-        if self.y < -50:
-            self.reset()
-
-    def draw(self, screen):
-        # Renderiza texto
-        surf = self.font.render(self.char, True, self.color)
-        
-        # Escala
-        w = int(surf.get_width() * self.scale)
-        h = int(surf.get_height() * self.scale)
-        if w <= 0 or h <= 0: return # Evita crash
-        surf = pygame.transform.scale(surf, (w, h))
-        
-        # Rotação
-        surf = pygame.transform.rotate(surf, self.rotation)
-        
-        # Alpha
-        surf.set_alpha(self.base_alpha)
-        
-        # Centraliza para desenhar
-        rect = surf.get_rect(center=(int(self.x), int(self.y)))
-        screen.blit(surf, rect)
+        ],
+        bounds=(-math.inf, -50, math.inf, math.inf),
+        spawn={
+            "x": (20, w - 20), "y": (0, h),
+            "vy": (-125, -31.25),
+            "alpha": (40, 100),
+            "scale": (0.6, 1.4),
+            "angle": (0, 360),
+            "spin": (-62.5, 62.5),
+        },
+        respawn={"y": (h, h + 100)},
+    )
 
 
 # ===========================================================
 #        ANIMAÇÃO DE ROLETA (ESTILO CASSINO) - ASYNC
 # ===========================================================
-async def animar_roleta(screen, letra_alvo, layout, clock):
+async def animar_roleta(screen, letra_alvo, layout):
     """Gira letras rapidamente e para na letra alvo com impacto"""
     letras_random = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
     w, h = screen.get_size()
@@ -118,20 +95,9 @@ async def animar_roleta(screen, letra_alvo, layout, clock):
     # 1. Aceleração inicial
     velocidade = 50 # ms por frame
     total_giros = 20
+    layers = Compositor((w, h))
     
     for i in range(total_giros):
-        screen.fill((15, 15, 30)) # Limpa tela
-        
-        # Desenha Fundo Estático (Grade)
-        grid_surf = pygame.Surface((w, h), pygame.SRCALPHA)
-        for x in range(0, w, 40):
-            pygame.draw.line(grid_surf, (255, 255, 255, 10), (x, 0), (x, h))
-        screen.blit(grid_surf, (0,0))
-        
-        # Texto "Sorteando..."
-        txt_sorteio = layout['font_text'].render("Sorteando Letra...", True, (200, 200, 200))
-        screen.blit(txt_sorteio, txt_sorteio.get_rect(center=(w//2, h*0.3)))
-        
         # Letra Atual (Aleatória)
         if i < total_giros - 1:
             char_atual = random.choice(letras_random)
@@ -142,49 +108,66 @@ async def animar_roleta(screen, letra_alvo, layout, clock):
             cor = (255, 215, 0)
             scale = 1.5
 
+        # Controle de tempo (Desacelera no final)
+        if i > total_giros - 8:
+            velocidade += 40 # Fica mais lento
+
+        instrumentation.mark("update")
+        screen.fill((15, 15, 30)) # Limpa tela
+        
+        # Desenha Fundo Estático (Grade): desenhada só no primeiro giro
+        grid_surf = layers.begin("grid", key="grid")
+        if grid_surf is not None:
+            for x in range(0, w, 40):
+                pygame.draw.line(grid_surf, (255, 255, 255, 10), (x, 0), (x, h))
+        layers.blit(screen, "grid")
+        
+        # Texto "Sorteando..."
+        txt_sorteio = render_text(layout['font_text'], "Sorteando Letra...", (200, 200, 200))
+        image_ops.blit(screen, txt_sorteio, txt_sorteio.get_rect(center=(w//2, h*0.3)))
+
         # Renderiza letra gigante
         font_big = layout['font_letra']
-        letra_surf = font_big.render(char_atual, True, cor)
+        letra_surf = render_text(font_big, char_atual, cor)
         
         # Se for a última, aplica escala
         if scale != 1.0:
             nw = int(letra_surf.get_width() * scale)
             nh = int(letra_surf.get_height() * scale)
-            letra_surf = pygame.transform.scale(letra_surf, (nw, nh))
+            letra_surf = image_ops.scale(letra_surf, (nw, nh))
 
         rect = letra_surf.get_rect(center=(w//2, h//2))
         
         # Sombra
-        sombra = font_big.render(char_atual, True, (0,0,0))
-        if scale != 1.0: sombra = pygame.transform.scale(sombra, (nw, nh))
-        screen.blit(sombra, (rect.x+5, rect.y+5))
-        screen.blit(letra_surf, rect)
-        
-        pygame.display.flip()
-        
-        # Controle de tempo (Desacelera no final)
-        if i > total_giros - 8:
-            velocidade += 40 # Fica mais lento
-        
-        await asyncio.sleep(velocidade / 1000.0)
+        sombra = render_text(font_big, char_atual, (0,0,0))
+        if scale != 1.0: sombra = image_ops.scale(sombra, (nw, nh))
+        image_ops.blit(screen, sombra, (rect.x+5, rect.y+5))
+        image_ops.blit(screen, letra_surf, rect)
+
+        instrumentation.mark("draw")
+        await scene_manager.wait(velocidade)
 
     # 2. Impacto Final (Screen Flash)
-    flash = pygame.Surface((w, h))
-    flash.fill((255, 255, 255))
-    screen.blit(flash, (0,0))
-    pygame.display.flip()
-    
-    await asyncio.sleep(0.05) # Delay do flash
+    screen.fill((255, 255, 255))
+    await scene_manager.wait(50) # Delay do flash
     
     AudioManager.play_sfx_if_exists("explosion") # Som de impacto ao parar
 
 
+# ===========================================================
+#             MODELO (REGRAS SEM PYGAME)
+# ===========================================================
+def criar_modelo(rules, tipo, rng=None):
+    """QuizModel com as perguntas do nível `tipo`; cada resposta leva o tempo gasto."""
+    acerto, erro = pontos_por_regras(rules)
+    return QuizModel(ALL_QUESTIONS.get(tipo, ALL_QUESTIONS["normal"]), acerto, erro, rng)
+
+
 # ===========================================================
 #             FUNÇÃO PRINCIPAL (ASYNC)
 # ===========================================================
 async def run_stop(screen):
     pygame.display.set_caption("STOP - Governança de TI")
-    clock = pygame.time.Clock()
 
     # Variáveis de layout
     layout = {}
@@ -192,18 +175,16 @@ async def run_stop(screen):
     assets_dir = os.path.join(base_dir, "assets")
     bg_path = os.path.join(assets_dir, "background", "background_stop.png")
     
-    bg_original = None
-    if os.path.exists(bg_path):
-        bg_original = pygame.image.load(bg_path).convert()
+    bg_original = asset_manager.load(bg_path)
 
     # === FUNÇÃO DE RESIZE ===
     def resize_assets(surface):
         w, h = surface.get_size()
         
         if bg_original:
-            layout['background'] = pygame.transform.scale(bg_original, (w, h))
+            layout['background'] = asset_manager.scaled(bg_path, (w, h), filter="fast")
         else:
-            layout['background'] = pygame.Surface((w, h))
+            layout['background'] = image_ops.new_surface((w, h))
             layout['background'].fill((15, 15, 35))
 
         # Fontes
@@ -211,87 +192,77 @@ async def run_stop(screen):
         layout['font_text'] = load_font(max(24, int(h * 0.05)))
         layout['font_small'] = load_font(max(20, int(h * 0.04)))
         layout['font_letra'] = load_font(max(180, int(h * 0.35))) # Para Roleta
-        layout['font_particle'] = load_font(max(40, int(h * 0.08)))
+        # Limitada a 96px: as letras giradas cabem no teto de glyphs do sprite_cache
+        layout['font_particle'] = load_font(min(96, max(40, int(h * 0.08))))
 
     resize_assets(screen)
 
     # === PARTÍCULAS ===
-    particles = [StopParticle(screen.get_width(), screen.get_height(), layout['font_particle']) for _ in range(30)]
+    particles = stop_particles(screen.get_width(), screen.get_height(), layout['font_particle'])
+
+    # === LÓGICA DE JOGO (ordem, tempo e pontos ficam no modelo) ===
+    quiz = criar_modelo(dm.get_rules(), dm.get_question_set_type())
 
-    # === LÓGICA DE JOGO ===
-    diff_rules = dm.get_rules()
-    q_type = dm.get_question_set_type()
-    
-    perguntas = ALL_QUESTIONS.get(q_type, ALL_QUESTIONS["normal"])
-    random.shuffle(perguntas)
-    
-    pontos_acerto = 10 + diff_rules["bonus_acerto"]
-    pontos_erro = -diff_rules["perda_pontos"]
-    
-    pontos_desta_fase = 0
-    
     # Efeito de Shake
     shake_amount = 0
 
+    # Camada do jogo reaproveitada entre frames
+    layers = Compositor(screen.get_size())
+
     # === Loop de Perguntas ===
-    for pergunta in perguntas:
+    while not quiz.done:
+        pergunta = quiz.atual
         letra = pergunta["letra"]
         categoria = pergunta["categoria"]
         dica = pergunta["dica"]
-        opcoes = pergunta["opcoes"][:]
-        correta = pergunta["correta"]
-        
-        random.shuffle(opcoes)
+        opcoes = pergunta["opcoes"]
 
         # 1. Animação de Entrada (Roleta)
-        await animar_roleta(screen, letra, layout, clock)
+        await animar_roleta(screen, letra, layout)
 
         # Inicia rodada
         rodada_ativa = True
         selecionada_rect = None
-        start_time = time.time()
         feedback_color = None
 
         while rodada_ativa:
-            dt = clock.tick(60) / 16.0
+            ticks = scene_manager.ticks
             w, h = screen.get_size()
+            layers.resize((w, h))
             
-            # Shake Decay
+            # Shake Decay (30/s, por tick)
             if shake_amount > 0:
-                shake_amount -= 0.5
+                shake_amount -= SHAKE_DECAY * TICK * ticks
                 if shake_amount < 0: shake_amount = 0
             
             shake_x = random.randint(-int(shake_amount), int(shake_amount))
             shake_y = random.randint(-int(shake_amount), int(shake_amount))
+            particles.advance(ticks, TICK)
 
             # Desenha Fundo
-            screen.blit(layout['background'], (0, 0))
+            instrumentation.mark("update")
+            image_ops.blit(screen, layout['background'], (0, 0))
             
             # Partículas
-            for p in particles:
-                p.update(dt)
-                p.draw(screen)
+            particles.draw(screen, interp=scene_manager.alpha)
 
             # Overlay Escuro
-            overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-            overlay.fill((10, 10, 20, 140))
-            screen.blit(overlay, (0, 0))
+            image_ops.shade(screen, (10, 10, 20), 140)
             
             # Surface do Jogo com Shake
-            game_surf = pygame.Surface((w, h), pygame.SRCALPHA)
+            game_surf = layers.begin("game")
             
             # Cálculo de Flutuação (Senoide do Tempo)
-            float_offset = math.sin(pygame.time.get_ticks() * 0.003) * 6
+            float_offset = math.sin(game_clock.ticks() * 0.003) * 6
             
             # Título
-            title = layout['font_title'].render("STOP - Governança de TI", True, (255, 215, 0))
-            glow_val = abs(math.sin(pygame.time.get_ticks() * 0.005)) * 255
-            title_glow = layout['font_title'].render("STOP - Governança de TI", True, (255, 215, 0))
-            title_glow.set_alpha(int(glow_val * 0.6))
+            title = render_text(layout['font_title'], "STOP - Governança de TI", (255, 215, 0))
+            glow_val = abs(math.sin(game_clock.ticks() * 0.005)) * 255
+            title_glow = render_text(layout['font_title'], "STOP - Governança de TI", (255, 215, 0), alpha=glow_val * 0.6)
             
             rect_title = title.get_rect(center=(w // 2, int(h * 0.07)))
-            game_surf.blit(title_glow, (rect_title.x-2, rect_title.y-2))
-            game_surf.blit(title, rect_title)
+            image_ops.blit(game_surf, title_glow, (rect_title.x-2, rect_title.y-2))
+            image_ops.blit(game_surf, title, rect_title)
 
             draw_score_display(game_surf, ScoreManager.get_score(), layout['font_text'], position="topright")
 
@@ -308,15 +279,15 @@ async def run_stop(screen):
             cy = container_rect.top + 20
             
             # Letra em Destaque
-            letra_surf = layout['font_title'].render(letra, True, (255, 215, 0))
+            letra_surf = render_text(layout['font_title'], letra, (255, 215, 0))
             pygame.draw.circle(game_surf, (255, 215, 0), (cx + 30, cy + 30), 40, 3)
             letra_rect = letra_surf.get_rect(center=(cx + 30, cy + 30))
-            game_surf.blit(letra_surf, letra_rect)
+            image_ops.blit(game_surf, letra_surf, letra_rect)
             
             # Textos
             text_x = cx + 90
-            cat_surf = layout['font_text'].render(f"Categoria: {categoria}", True, (230, 230, 255))
-            game_surf.blit(cat_surf, (text_x, cy))
+            cat_surf = render_text(layout['font_text'], f"Categoria: {categoria}", (230, 230, 255))
+            image_ops.blit(game_surf, cat_surf, (text_x, cy))
             
             dica_rect = pygame.Rect(text_x, cy + 40, container_rect.width - 120, container_rect.height - 60)
             draw_text_wrapped(game_surf, f"Dica: {dica}", layout['font_small'], (180, 200, 220), dica_rect, align="left")
@@ -362,29 +333,26 @@ async def run_stop(screen):
                 pygame.draw.rect(game_surf, border_color, draw_rect, 2 if not is_hover else 3, border_radius=12)
                 draw_text_wrapped(game_surf, opcao, layout['font_small'], (255, 255, 255), draw_rect.inflate(-16, -16))
 
-            screen.blit(game_surf, (shake_x, shake_y))
+            layers.blit(screen, "game", (shake_x, shake_y))
             
             if feedback_color:
-                flash_surf = pygame.Surface((w, h), pygame.SRCALPHA)
-                flash_surf.fill(feedback_color + (50,)) 
-                screen.blit(flash_surf, (0,0))
+                image_ops.shade(screen, feedback_color, 50)
 
-            pygame.display.flip()
-            await asyncio.sleep(0)
+            instrumentation.mark("draw")
+            await scene_manager.frame()
+
+            # Cronômetro da rodada anda com o tempo do frame que passou
+            quiz.apply(("tick", scene_manager.dt / 1000))
 
             # Eventos
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
-                
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_F11:
-                        pygame.display.toggle_fullscreen()
-                        screen = pygame.display.get_surface()
-                        resize_assets(screen)
-                        particles = [StopParticle(screen.get_width(), screen.get_height(), layout['font_particle']) for _ in range(30)]
-                    elif event.key == pygame.K_ESCAPE:
-                        return pontos_desta_fase
+            for event in input_manager.poll():
+                if event.type == input_manager.RESIZED:
+                    screen = pygame.display.get_surface()
+                    resize_assets(screen)
+                    particles = stop_particles(screen.get_width(), screen.get_height(), layout['font_particle'])
+
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return quiz.score
 
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not selecionada_rect:
                     pos = pygame.mouse.get_pos()
@@ -392,42 +360,40 @@ async def run_stop(screen):
                     for rect, opcao in botoes:
                         if rect.collidepoint(pos):
                             selecionada_rect = rect
-                            tempo_total = round(time.time() - start_time, 2)
-                            pontos_ganhos = 0
+                            resultado = quiz.apply(("answer", opcao))
+                            tempo_total = resultado["tempo"]
 
-                            if opcao == correta:
-                                pontos_ganhos = pontos_acerto
+                            if resultado["correct"]:
                                 feedback_msg = "Resposta correta!"
                                 feedback_color = (50, 255, 50) 
                                 AudioManager.play_sfx_if_exists("correto")
                             else:
-                                pontos_ganhos = pontos_erro
                                 feedback_msg = "Resposta incorreta!"
                                 feedback_color = (255, 50, 50) 
                                 AudioManager.play_sfx_if_exists("errado")
                                 shake_amount = 15
                             
-                            pontos_desta_fase += pontos_ganhos
-                            ScoreManager.add_points(pontos_ganhos)
+                            ScoreManager.add_points(resultado["points"])
                             
                             # Pequena pausa visual no botão (Async)
-                            await asyncio.sleep(0.5)
+                            await scene_manager.wait(500)
 
                             # --- VOLTANDO A USAR show_pause_screen (COM AWAIT) ---
                             # Isso restaura o feedback visual completo que você queria
                             await show_pause_screen(
-                                screen, clock,
+                                screen,
                                 feedback_msg,
                                 f"Pontuação total: {ScoreManager.get_score()} | Tempo: {tempo_total}s",
                                 f"Categoria: {categoria}",
                                 theme="STOP"
                             )
                             
+                            quiz.apply(("next",))
                             rodada_ativa = False
                             break
 
     # Tela Final (Async Loop via show_pause_screen)
     AudioManager.play_sfx_if_exists("roleta")
-    await show_pause_screen(screen, clock, "Fim do Desafio STOP!", f"Pontuação Final: {ScoreManager.get_score()}", theme="STOP")
+    await show_pause_screen(screen, "Fim do Desafio STOP!", f"Pontuação Final: {ScoreManager.get_score()}", theme="STOP")
     
-    return pontos_desta_fase
\ No newline at end of file
+    return quiz.score
\ No newline at end of file
@@ -0,0 +1,389 @@
+#=========================================================
+#   SISTEMA DE PARTÍCULAS VETORIZADO (NUMPY)
+#=========================================================
+
+"""
+Motor de partículas em "estrutura de arrays".
+
+Posição, velocidade, alpha, vida e demais atributos ficam em arrays NumPy
+e são atualizados com um único passo vetorizado por frame. O desenho usa
+os carimbos do sprite_cache e um único `Surface.blits()` com os índices
+visíveis, então o custo por partícula em Python é só montar a lista de blits.
+
+Unidades: posições em pixels, velocidades em px/s, `fade` em alpha/s,
+`life` em segundos, `spin` em graus/s. `step(dt)` recebe segundos.
+
+Com o passo fixo do scene_manager, a cena chama `advance(ticks, TICK)` e
+desenha com `draw(..., interp=scene_manager.alpha)`: a posição desenhada é
+interpolada entre o tick anterior e o atual.
+
+Valores de emissão (dicionários `spawn`/`respawn`) aceitam:
+    número            -> constante
+    (min, max)        -> uniforme
+    [a, b, c]         -> escolha aleatória
+    callable(ps, idx) -> array calculado pelo próprio sistema (os campos são
+                         sorteados na ordem de _FIELDS, então pode ler os anteriores)
+"""
+
+import math
+import random
+
+import numpy as np
+
+from src import sprite_cache, performance, instrumentation
+
+_FIELDS = (
+    "x", "y", "vx", "vy", "life", "alpha", "fade", "size", "grow", "width",
+    "sway", "sway_freq", "phase", "angle", "spin", "scale",
+    "theta", "radius", "omega",
+)
+
+_DEFAULTS = {
+    "x": 0.0, "y": 0.0, "vx": 0.0, "vy": 0.0, "alpha": 255.0, "fade": 0.0,
+    "life": math.inf, "size": 2.0, "grow": 0.0, "width": 2.0,
+    "sway": 0.0, "sway_freq": 0.0, "phase": 0.0, "angle": 0.0, "spin": 0.0,
+    "scale": 1.0, "theta": 0.0, "radius": 0.0, "omega": 0.0,
+}
+
+_INF = math.inf
+
+# Passo da sequência que espalha a escala dos glyphs pelos slots (razão áurea)
+_GOLDEN = 0.6180339887498949
+
+
+class ParticleSystem:
+    def __init__(self, capacity, shape="circle", palette=((255, 255, 255),),
+                 chars=None, font=None, image=None, anchor="topleft",
+                 bounds=(-_INF, -_INF, _INF, _INF), on_exit="respawn", wrap=False,
+                 gravity=0.0, drag=1.0, min_size=0.0, center=None,
+                 spawn=None, respawn=None, fill=True):
+        self.capacity = int(capacity)
+        self.shape = shape
+        self.palette = [tuple(c) for c in palette]
+        self.chars = list(chars or ["*"])
+        self.font = font
+        self.image = image
+        self.anchor = anchor
+        self.bounds = bounds
+        self.on_exit = on_exit          # "respawn" (recicla) ou "kill" (explosões)
+        self.wrap = wrap                # atravessa as bordas (água)
+        self.gravity = gravity
+        self.drag = drag                # fator multiplicativo por segundo
+        self.min_size = min_size
+        self.center = center            # se definido, partículas orbitam o centro
+        self.spawn_spec = dict(spawn or {})
+        self.respawn_spec = dict(respawn or {})
+
+        # Semente derivada do `random` global: seed única reproduz tudo
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+        # Escala de partículas do preset na criação (ver draw)
+        self.built_scale = performance.particle_scale()
+
+        n = self.capacity
+        for name in _FIELDS:
+            setattr(self, name, np.full(n, _DEFAULTS[name], dtype=np.float64))
+        self.color = np.zeros(n, dtype=np.int32)
+        self.char = np.zeros(n, dtype=np.int32)
+        self.alive = np.zeros(n, dtype=bool)
+        # Posição no tick anterior (interpolação no desenho)
+        self.px = self.x.copy()
+        self.py = self.y.copy()
+
+        if fill and self.on_exit == "respawn":
+            self._emit_into(np.arange(n), self.spawn_spec)
+        if shape == "glyph":
+            self._prewarm_glyphs()
+
+    # -----------------------------------------------------
+    # AMOSTRAGEM
+    # -----------------------------------------------------
+    def _sample(self, value, idx):
+        n = len(idx)
+        if callable(value):
+            return np.asarray(value(self, idx), dtype=np.float64)
+        if isinstance(value, tuple):
+            return self.rng.uniform(value[0], value[1], n)
+        if isinstance(value, list):
+            return np.asarray(value, dtype=np.float64)[self.rng.integers(0, len(value), n)]
+        return np.full(n, value, dtype=np.float64)
+
+    def _emit_into(self, idx, spec):
+        if len(idx) == 0:
+            return
+        spec = dict(spec)
+        speed = spec.pop("speed", None)
+        direction = spec.pop("direction", (0.0, 2 * math.pi))
+        vy_scale = spec.pop("vy_scale", 1.0)
+
+        for name in _FIELDS:
+            value = spec.get(name, _DEFAULTS[name])
+            getattr(self, name)[idx] = self._sample(value, idx)
+
+        if speed is not None:
+            ang = self._sample(direction, idx)
+            vel = self._sample(speed, idx)
+            self.vx[idx] = np.cos(ang) * vel
+            self.vy[idx] = np.sin(ang) * vel * vy_scale
+
+        self.color[idx] = spec.get("color", self.rng.integers(0, len(self.palette), len(idx)))
+        self.char[idx] = spec.get("char", self.rng.integers(0, len(self.chars), len(idx)))
+        if self.shape == "glyph":
+            self._glyph_identity(idx, spec)
+        self.alive[idx] = True
+
+        if self.center is not None:
+            self._place_orbit(idx)
+        # Partícula nova não interpola a partir da posição antiga
+        self.px[idx] = self.x[idx]
+        self.py[idx] = self.y[idx]
+
+    def _glyph_identity(self, idx, spec):
+        """
+        Caractere, cor e escala fixos por slot (o sorteio acima só consome o
+        rng). Girando, um slot passa pelos ângulos do sprite_cache sempre
+        com a mesma variante, e qualquer instância do mesmo efeito reaproveita
+        as mesmas surfaces: reciclar a partícula ou reabrir a cena não aloca.
+        """
+        if "char" not in spec:
+            self.char[idx] = idx % len(self.chars)
+        if "color" not in spec:
+            self.color[idx] = (idx // len(self.chars)) % len(self.palette)
+        scale = spec.get("scale", _DEFAULTS["scale"])
+        if isinstance(scale, tuple):
+            self.scale[idx] = scale[0] + (scale[1] - scale[0]) * ((idx * _GOLDEN) % 1.0)
+        elif isinstance(scale, list):
+            self.scale[idx] = np.asarray(scale, dtype=np.float64)[idx % len(scale)]
+
+    def _prewarm_glyphs(self):
+        """
+        Renderiza de uma vez as variantes que os slots vão usar: cada
+        identidade em todos os ângulos do sprite_cache (se a partícula gira)
+        ou só em 0°. Sem isso, o giro lento visita os ângulos raros só depois
+        de milhares de frames e a cena nunca para de alocar.
+        """
+        specs = (self.spawn_spec, self.respawn_spec)
+        turns = any("spin" in s or "angle" in s for s in specs)
+        angles = range(0, 360, sprite_cache.ANGLE_STEP) if turns else (0,)
+        self._glyph_identity(np.arange(self.capacity), self.spawn_spec)
+        variants = set(zip(self.char.tolist(), self.color.tolist(), self.scale.tolist()))
+        for ch, c, sc in variants:
+            for ang in angles:
+                sprite_cache.glyph(self.font, self.chars[ch], self.palette[c], sc, ang)
+
+    def _place_orbit(self, idx):
+        cx, cy = self.center
+        self.x[idx] = cx + np.cos(self.theta[idx]) * self.radius[idx]
+        self.y[idx] = cy + np.sin(self.theta[idx]) * self.radius[idx]
+
+    # -----------------------------------------------------
+    # API
+    # -----------------------------------------------------
+    def emit(self, n, **overrides):
+        """Ativa até `n` partículas livres (explosões / splashes)."""
+        free = np.nonzero(~self.alive)[0][:n]
+        spec = dict(self.spawn_spec)
+        spec.update(overrides)
+        self._emit_into(free, spec)
+        return len(free)
+
+    def resize(self, bounds, spawn=None, respawn=None, center=None):
+        """Atualiza limites/regras após F11 e redistribui as partículas."""
+        self.bounds = bounds
+        if spawn is not None: self.spawn_spec = dict(spawn)
+        if respawn is not None: self.respawn_spec = dict(respawn)
+        if center is not None: self.center = center
+        if self.on_exit == "respawn":
+            self._emit_into(np.arange(self.capacity), self.spawn_spec)
+        else:
+            self.alive[:] = False
+
+    def clear(self):
+        self.alive[:] = False
+
+    @property
+    def count(self):
+        return int(np.count_nonzero(self.alive))
+
+    def step(self, dt):
+        """Avança a simulação `dt` segundos em um único passo vetorizado."""
+        np.copyto(self.px, self.x)
+        np.copyto(self.py, self.y)
+        if self.center is not None:
+            self.theta += self.omega * dt
+            self._place_orbit(slice(None))
+        else:
+            if self.gravity:
+                self.vy += self.gravity * dt
+            if self.drag != 1.0:
+                f = self.drag ** dt
+                self.vx *= f
+                self.vy *= f
+            if self.sway.any():
+                self.x += (self.vx + self.sway * np.sin(self.phase)) * dt
+                self.phase += self.sway_freq * dt
+            else:
+                self.x += self.vx * dt
+            self.y += self.vy * dt
+
+        self.alpha -= self.fade * dt
+        self.life -= dt
+        if self.grow.any():
+            self.size += self.grow * dt
+            np.maximum(self.size, self.min_size, out=self.size)
+        if self.spin.any():
+            self.angle += self.spin * dt
+
+        xmin, ymin, xmax, ymax = self.bounds
+        if self.wrap:
+            for pos, prev, lo, hi in ((self.x, self.px, xmin, xmax), (self.y, self.py, ymin, ymax)):
+                low, high = pos < lo, pos > hi
+                pos[low] = hi
+                pos[high] = lo
+                jumped = low | high
+                prev[jumped] = pos[jumped]
+            outside = False
+        else:
+            outside = (self.x < xmin) | (self.x > xmax) | (self.y < ymin) | (self.y > ymax)
+
+        dead = self.alive & ((self.alpha <= 0) | (self.life <= 0) | outside)
+        if dead.any():
+            idx = np.nonzero(dead)[0]
+            if self.on_exit == "respawn":
+                spec = dict(self.spawn_spec)
+                spec.update(self.respawn_spec)
+                self._emit_into(idx, spec)
+            else:
+                self.alive[idx] = False
+
+    def advance(self, ticks, dt):
+        """`ticks` passos fixos de `dt` segundos (um frame do scene_manager)."""
+        for _ in range(ticks):
+            self.step(dt)
+
+    def visible(self, limit=None):
+        """Índices das partículas vivas e visíveis (alpha >= 1)."""
+        idx = np.nonzero(self.alive & (self.alpha >= 1))[0]
+        if limit is not None:
+            idx = idx[:limit]
+        return idx
+
+    def draw(self, surface, offset=(0, 0), limit=None, rects=None, interp=1.0):
+        # rects: lista que recebe os retângulos desenhados (dirty rects)
+        # interp: 0 = posição do tick anterior, 1 = posição atual
+        if limit is None:
+            # Preset baixou depois da criação: desenha só a fração atual
+            scale = performance.particle_scale()
+            if scale < self.built_scale:
+                limit = max(1, int(self.capacity * scale / self.built_scale))
+        idx = self.visible(limit)
+        if len(idx) == 0:
+            return 0
+
+        ox, oy = offset
+        if interp >= 1.0:
+            xs = self.x[idx].tolist()
+            ys = self.y[idx].tolist()
+        else:
+            px, py = self.px[idx], self.py[idx]
+            xs = (px + (self.x[idx] - px) * interp).tolist()
+            ys = (py + (self.y[idx] - py) * interp).tolist()
+        alphas = self.alpha[idx].tolist()
+        sizes = self.size[idx].tolist()
+        colors = [self.palette[c] for c in self.color[idx].tolist()]
+        centered = self.anchor == "center"
+        shape = self.shape
+        seq = []
+
+        if shape == "circle" or shape == "ring":
+            make = sprite_cache.circle if shape == "circle" else sprite_cache.ring
+            for x, y, a, s, c in zip(xs, ys, alphas, sizes, colors):
+                if s < 1:
+                    continue
+                stamp = make(s, c, a)
+                if centered:
+                    half = stamp.get_width() // 2
+                    seq.append((stamp, (int(x) - half + ox, int(y) - half + oy)))
+                else:
+                    seq.append((stamp, (int(x) + ox, int(y) + oy)))
+
+        elif shape == "glyph":
+            # A surface do glyph é compartilhada entre os alphas
+            # (sprite_cache.glyph): o alpha é aplicado aqui, na hora do blit
+            chars = [self.chars[i] for i in self.char[idx].tolist()]
+            scales = self.scale[idx].tolist()
+            angles = self.angle[idx].tolist()
+            font = self.font
+            blit = surface.blit
+            count = 0
+            for x, y, a, c, ch, sc, ang in zip(xs, ys, alphas, colors, chars, scales, angles):
+                stamp = sprite_cache.glyph(font, ch, c, sc, ang)
+                if stamp is None:
+                    continue
+                stamp.set_alpha(sprite_cache.alpha_bucket(a))
+                if centered:
+                    pos = (int(x) - stamp.get_width() // 2 + ox, int(y) - stamp.get_height() // 2 + oy)
+                else:
+                    pos = (int(x) + ox, int(y) + oy)
+                r = blit(stamp, pos)
+                if rects is not None:
+                    rects.append(r)
+                count += 1
+            instrumentation.count("blits", count)
+            instrumentation.count("particles", count)
+            return count
+
+        elif shape == "line":
+            widths = self.width[idx].tolist()
+            for x, y, a, s, c, wd in zip(xs, ys, alphas, sizes, colors, widths):
+                stamp = sprite_cache.line(s, wd, c, a)
+                seq.append((stamp, (int(x) - int(wd) // 2 + ox, int(y) + oy)))
+
+        elif shape == "image":
+            # Mesmo caso do glyph: alpha aplicado na hora do blit
+            img = self.image
+            blit = surface.blit
+            count = 0
+            for x, y, a, s in zip(xs, ys, alphas, sizes):
+                stamp = sprite_cache.image(img, s)
+                stamp.set_alpha(sprite_cache.alpha_bucket(a))
+                r = blit(stamp, (int(x) + ox, int(y) + oy))
+                if rects is not None:
+                    rects.append(r)
+                count += 1
+            instrumentation.count("blits", count)
+            instrumentation.count("particles", count)
+            return count
+
+        if rects is None:
+            surface.blits(seq, doreturn=False)
+        else:
+            rects.extend(surface.blits(seq))
+        instrumentation.count("blits", len(seq))
+        instrumentation.count("particles", len(seq))
+        return len(seq)
+
+
+# ---------------------------------------------------------
+# EFEITOS PRONTOS
+# ---------------------------------------------------------
+def rising_particles(w, h, base, color, chars=None, font=None,
+                     alpha=(100, 255), respawn_depth=50):
+    """
+    Partículas que sobem e desaparecem (telas de pausa e de transição).
+    Com `chars` vira chuva de caracteres do tema; sem, bolinhas.
+    """
+    return ParticleSystem(
+        performance.particle_count(base),
+        shape="glyph" if chars else "circle",
+        palette=[color], chars=chars, font=font,
+        bounds=(-math.inf, -10, math.inf, math.inf),
+        spawn={
+            "x": (0, w), "y": (0, h),
+            "size": [2, 3, 4, 5, 6],
+            "alpha": alpha,
+            "vy": (-120, -30),
+            "fade": 120,
+        },
+        respawn={"y": (h, h + respawn_depth), "alpha": (150, 255)},
+    )
@@ -0,0 +1,253 @@
+#=========================================================
+#   OVERLAY DE DESEMPENHO (F3)
+#=========================================================
+
+"""
+Painel de diagnóstico que liga e desliga com F3 em qualquer cena.
+
+Mostra FPS, um gráfico rolante do tempo de cada frame (empilhado pelas
+fases da instrumentação: event / update / draw / present / pump / sleep),
+o preset atual do QualityGovernor, partículas e blits do frame, acerto do
+cache de texto, memória das superfícies em cache e eventos por frame.
+
+Para não distorcer o que mede:
+- usa a própria fonte e as próprias superfícies (painel e gráfico), sem
+  passar pelo text_cache, glyph_atlas ou sprite_cache, e sem os
+  contadores da instrumentação;
+- o texto só é refeito TEXT_REFRESH_MS em TEXT_REFRESH_MS; nos outros
+  frames o painel é um blit pronto;
+- o gráfico rola com Surface.scroll e desenha só a coluna nova;
+- o scene_manager mede o desenho dele numa fase própria ("overlay");
+- o pedaço da tela que ele cobre é guardado antes e devolvido depois do
+  present (restore), então cenas com dirty rects, que não redesenham a
+  tela inteira, não acumulam o painel translúcido.
+
+Ao abrir, liga a instrumentação (se estava desligada) para ter as fases
+de cada frame; ao fechar, desliga de novo só se foi ele quem ligou.
+"""
+
+import os
+from collections import deque
+
+import pygame
+
+from src import instrumentation, performance, sprite_cache, text_cache
+from src.asset_manager import asset_manager
+from src.input_manager import input_manager
+
+OVERLAY_KEY = pygame.K_F3
+
+# Frames no gráfico e largura (px) de cada coluna
+GRAPH_FRAMES = 120
+GRAPH_COLUMN = 2
+GRAPH_HEIGHT = 64
+
+# Tempo (ms) no topo do gráfico
+GRAPH_MAX_MS = 50.0
+
+# Intervalo entre cada atualização do texto (ms)
+TEXT_REFRESH_MS = 250
+
+FONT_SIZE = 14
+MARGIN = 8
+PANEL_BG = (10, 10, 20, 200)
+TEXT_COLOR = (230, 230, 230)
+WARN_COLOR = (255, 120, 90)
+
+# Cor de cada fase no gráfico (sleep = espera do Clock, fica apagada)
+PHASE_COLORS = (
+    ("event", (180, 120, 255)),
+    ("update", (100, 200, 255)),
+    ("draw", (120, 230, 120)),
+    ("present", (255, 215, 0)),
+    ("pump", (255, 140, 60)),
+    ("overlay", (255, 90, 160)),
+    ("sleep", (70, 70, 90)),
+)
+BUDGET_COLOR = (255, 255, 255)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_PATH = os.path.join(BASE_DIR, "assets", "fonts", "NotoSans-Regular.ttf")
+
+
+def _mb(n):
+    return n / (1024 * 1024)
+
+
+class PerfOverlay:
+    def __init__(self):
+        self.visible = False
+        self.frame_ms = deque(maxlen=GRAPH_FRAMES)
+        self._owns_instrumentation = False
+        self._font = None
+        self._panel = None
+        self._graph = None
+        self._under = None
+        self._covered = None
+        self._clear = None
+        self._since_refresh = TEXT_REFRESH_MS
+        self._text_hits = (0, 0)
+        self._events = 0
+        self._events_max = 0
+        self._frames = 0
+
+    # ==========================================================
+    # LIGAR / DESLIGAR
+    # ==========================================================
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            if not instrumentation.enabled:
+                instrumentation.enable()
+                self._owns_instrumentation = True
+            self._graph = None
+            self._since_refresh = TEXT_REFRESH_MS
+        else:
+            # Próximo frame apresenta a área limpa uma última vez
+            self._clear = self._covered
+            if self._owns_instrumentation:
+                instrumentation.disable()
+                self._owns_instrumentation = False
+
+    # ==========================================================
+    # AMOSTRA (uma por frame, chamada pelo scene_manager)
+    # ==========================================================
+    def sample(self, dt_ms):
+        self.frame_ms.append(dt_ms)
+        if not self.visible:
+            return
+        events = input_manager.events_last_frame()
+        self._events += events
+        self._events_max = max(self._events_max, events)
+        self._frames += 1
+        self._since_refresh += dt_ms
+        if self._graph is not None:
+            self._push_column(dt_ms)
+
+    # ==========================================================
+    # SUPERFÍCIES PRÓPRIAS
+    # ==========================================================
+    def _get_font(self):
+        if self._font is None:
+            try:
+                self._font = pygame.font.Font(FONT_PATH, FONT_SIZE)
+            except Exception:
+                self._font = pygame.font.Font(None, FONT_SIZE + 4)
+        return self._font
+
+    def _new_graph(self):
+        self._graph = pygame.Surface((GRAPH_FRAMES * GRAPH_COLUMN, GRAPH_HEIGHT))
+        self._graph.fill(PANEL_BG[:3])
+        for ms in self.frame_ms:
+            self._push_column(ms, phases={})
+
+    def _push_column(self, dt_ms, phases=None):
+        """Rola o gráfico uma coluna e desenha o frame novo na direita."""
+        g = self._graph
+        g.scroll(-GRAPH_COLUMN, 0)
+        x = g.get_width() - GRAPH_COLUMN
+        g.fill(PANEL_BG[:3], (x, 0, GRAPH_COLUMN, GRAPH_HEIGHT))
+
+        scale = GRAPH_HEIGHT / GRAPH_MAX_MS
+        if phases is None:
+            phases = instrumentation.last_frame_phases()
+        y = GRAPH_HEIGHT
+        if phases:
+            for name, color in PHASE_COLORS:
+                ms = phases.get(name, 0.0)
+                h = int(round(ms * scale))
+                if h > 0:
+                    y -= h
+                    g.fill(color, (x, max(0, y), GRAPH_COLUMN, h))
+        else:
+            h = min(GRAPH_HEIGHT, int(round(dt_ms * scale)))
+            g.fill(PHASE_COLORS[1][1], (x, GRAPH_HEIGHT - h, GRAPH_COLUMN, h))
+
+        # Linha do orçamento do FPS alvo
+        budget = 1000.0 / performance.target_fps()
+        by = GRAPH_HEIGHT - int(budget * scale)
+        if 0 <= by < GRAPH_HEIGHT:
+            g.fill(BUDGET_COLOR, (x, by, GRAPH_COLUMN, 1))
+
+    def _lines(self):
+        times = list(self.frame_ms)
+        avg = sum(times) / len(times) if times else 0.0
+        fps = 1000.0 / avg if avg > 0 else 0.0
+        pct = instrumentation.percentiles(times)
+        budget = 1000.0 / performance.target_fps()
+
+        counters = instrumentation.last_frame_counters()
+
+        tc = text_cache.stats()
+        hits, misses = tc["hits"], tc["misses"]
+        prev_hits, prev_misses = self._text_hits
+        window = (hits - prev_hits) + (misses - prev_misses)
+        rate = (hits - prev_hits) / window * 100 if window else 100.0
+        self._text_hits = (hits, misses)
+
+        sc = sprite_cache.stats()
+        sprites = sc["bytes"] + sc["halo_bytes"] + sc["glyph_bytes"]
+        assets = asset_manager.stats()["bytes"]
+
+        events_avg = self._events / max(1, self._frames)
+        events_max = self._events_max
+        self._events = self._events_max = self._frames = 0
+
+        governor = "auto" if performance.governor.enabled else "fixo"
+        return [
+            (f"FPS {fps:5.1f}  alvo {performance.target_fps()}", TEXT_COLOR),
+            (f"frame p50 {pct['p50']:.1f}  p95 {pct['p95']:.1f}  p99 {pct['p99']:.1f} ms",
+             WARN_COLOR if pct["p95"] > budget * performance.DOWNGRADE_RATIO else TEXT_COLOR),
+            (f"Preset: {performance.preset_name()} ({governor})", TEXT_COLOR),
+            (f"Partículas: {counters.get('particles', 0)}  blits: {counters.get('blits', 0)}", TEXT_COLOR),
+            (f"Cache de texto: {rate:.0f}% acertos  ({tc['entries']} entradas)", TEXT_COLOR),
+            (f"Memória: sprites {_mb(sprites):.1f}  texto {_mb(tc['bytes']):.1f}  assets {_mb(assets):.1f} MB", TEXT_COLOR),
+            (f"Eventos/frame: {events_avg:.1f}  (máx {events_max})", TEXT_COLOR),
+        ]
+
+    def _build_panel(self):
+        font = self._get_font()
+        rendered = [font.render(text, True, color) for text, color in self._lines()]
+        line_h = font.get_linesize()
+        width = max(GRAPH_FRAMES * GRAPH_COLUMN, max(s.get_width() for s in rendered)) + MARGIN * 2
+        height = MARGIN * 3 + line_h * len(rendered) + GRAPH_HEIGHT
+
+        if self._panel is None or self._panel.get_size() != (width, height):
+            self._panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        self._panel.fill(PANEL_BG)
+        self._panel.blits([(s, (MARGIN, MARGIN + i * line_h)) for i, s in enumerate(rendered)], doreturn=False)
+        self._graph_pos = (MARGIN, MARGIN * 2 + line_h * len(rendered))
+        self._since_refresh = 0
+
+    # ==========================================================
+    # DESENHO
+    # ==========================================================
+    def draw(self, screen):
+        """Desenha no canto da tela. Devolve o retângulo a apresentar (ou None)."""
+        if not self.visible or screen is None:
+            rect, self._clear = self._clear, None
+            return rect
+        if self._graph is None:
+            self._new_graph()
+        if self._panel is None or self._since_refresh >= TEXT_REFRESH_MS:
+            self._build_panel()
+
+        pos = (MARGIN, MARGIN)
+        rect = pygame.Rect(pos, self._panel.get_size()).clip(screen.get_rect())
+        if self._under is None or self._under.get_size() != self._panel.get_size():
+            self._under = pygame.Surface(self._panel.get_size())
+        self._under.blit(screen, (0, 0), rect)
+        self._covered = rect
+
+        screen.blit(self._panel, pos)
+        screen.blit(self._graph, (pos[0] + self._graph_pos[0], pos[1] + self._graph_pos[1]))
+        return rect
+
+    def restore(self, screen):
+        """Devolve à tela o que o painel cobriu (depois do present)."""
+        if self.visible and self._covered is not None and screen is not None:
+            screen.blit(self._under, self._covered.topleft, (0, 0, self._covered.width, self._covered.height))
+
+
+overlay = PerfOverlay()
+input_manager.add_key_hook(OVERLAY_KEY, overlay.toggle)
@@ -5,26 +5,37 @@
 """
 Módulo de detecção de dispositivo e otimizações automáticas
 para performance mobile em Party Pascal.
+
+O preset inicial vem do perfil de calibração do aparelho
+(src/calibration.py, device_profile.json); sem perfil, é um palpite pela
+plataforma e tamanho da tela. O perfil também traz limites do aparelho
+(ex.: smoothscale lento demais) aplicados sobre qualquer nível. Com o
+jogo rodando, o QualityGovernor mede os tempos de frame e sobe ou desce
+de nível (low / medium / high); os acessores abaixo leem sempre o preset
+atual, então cada cena passa a usar os valores novos sem reiniciar.
 """
 
 import pygame
 import sys
+from collections import deque
 
 # ---------------------------------------------------------
 # DETECTAR SE É UM DISPOSITIVO MOBILE-LIKE
 # ---------------------------------------------------------
 def is_mobile_like():
-    try:
-        w, h = pygame.display.get_surface().get_size()
-        if max(w, h) <= 1280:
-            return True
-    except:
-        pass
-
     platform = sys.platform
     if platform.startswith("android") or platform.startswith("ios"):
         return True
 
+    # Navegador (pygbag): só conta como mobile se houver tela de toque.
+    # Janela pequena no desktop NÃO é mobile.
+    if platform == "emscripten":
+        try:
+            from pygame._sdl2 import touch
+            return touch.get_num_devices() > 0
+        except Exception:
+            pass
+
     return False
 
 
@@ -38,7 +49,9 @@ PRESETS = {
         "particle_spawn_ms": 30,
         "use_smoothscale": True,
         "use_rotozoom": True,
+        "blur": 1.0,
         "preload_sfx": True,
+        "dirty_rects": False,
     },
     "medium": {
         "fps": 45,
@@ -46,7 +59,9 @@ PRESETS = {
         "particle_spawn_ms": 60,
         "use_smoothscale": True,
         "use_rotozoom": False,
+        "blur": 1.0,
         "preload_sfx": False,
+        "dirty_rects": False,
     },
     "low": {
         "fps": 30,
@@ -54,39 +69,78 @@ PRESETS = {
         "particle_spawn_ms": 110,
         "use_smoothscale": False,
         "use_rotozoom": False,
+        "blur": 0.5,
         "preload_sfx": False,
+        "dirty_rects": True,
     }
 }
 
+# Do mais leve ao mais pesado (ordem em que o governor anda)
+LEVELS = ["low", "medium", "high"]
+
 PRESET = None
+PRESET_NAME = None
+
+# Limites medidos na calibração: só restringem (flags com `and`, números com min)
+DEVICE_CAPS = {}
 
 
 # ---------------------------------------------------------
 # ESCOLHE PRESET IDEAL
 # ---------------------------------------------------------
-def pick_preset():
+def pick_preset_name():
     if is_mobile_like():
-        return PRESETS["low"]
+        return "low"
 
     try:
         w, h = pygame.display.get_surface().get_size()
         if max(w, h) >= 2000:
-            return PRESETS["high"]
-        elif max(w, h) >= 1400:
-            return PRESETS["medium"]
+            return "high"
         else:
-            return PRESETS["medium"]
+            return "medium"
     except:
-        return PRESETS["medium"]
+        return "medium"
+
+
+def pick_preset():
+    return PRESETS[pick_preset_name()]
 
 
 def ensure_preset():
-    global PRESET
     if PRESET is None:
-        PRESET = pick_preset()
+        set_preset(pick_preset_name())
     return PRESET
 
 
+def preset_name():
+    ensure_preset()
+    return PRESET_NAME
+
+
+def set_preset(name):
+    """Troca o preset com o jogo rodando (governor / calibração)."""
+    global PRESET, PRESET_NAME
+    if name not in PRESETS:
+        return
+    preset = dict(PRESETS[name])
+    for key, cap in DEVICE_CAPS.items():
+        if key not in preset:
+            continue
+        if isinstance(cap, bool):
+            preset[key] = preset[key] and cap
+        else:
+            preset[key] = min(preset[key], cap)
+    PRESET = preset
+    PRESET_NAME = name
+
+
+def apply_profile(profile):
+    """Usa um perfil de calibração: nível inicial + limites do aparelho."""
+    global DEVICE_CAPS
+    DEVICE_CAPS = dict(profile.get("caps", {}))
+    set_preset(profile.get("preset", pick_preset_name()))
+
+
 # ---------------------------------------------------------
 # ACESSORES
 # ---------------------------------------------------------
@@ -99,6 +153,16 @@ def particle_settings():
     return p["particles"], p["particle_spawn_ms"]
 
 
+def particle_scale():
+    """Fator de partículas do preset atual em relação ao medium."""
+    return ensure_preset()["particles"] / PRESETS["medium"]["particles"]
+
+
+def particle_count(base):
+    """Escala a quantidade base de um efeito (pensada para o preset medium)."""
+    return max(1, int(base * particle_scale()))
+
+
 def supports_smoothscale():
     return ensure_preset()["use_smoothscale"]
 
@@ -107,31 +171,124 @@ def supports_rotozoom():
     return ensure_preset()["use_rotozoom"]
 
 
+def blur_strength(base):
+    """Blur de fundo (derived_assets.background) ajustado ao preset."""
+    return int(base * ensure_preset().get("blur", 1.0))
+
+
+def use_dirty_rects():
+    """Telas estáticas apresentam só as regiões alteradas (src/dirty_rects.py)."""
+    return ensure_preset().get("dirty_rects", False)
+
+
 # ---------------------------------------------------------
-# CACHE PARA SUPERFÍCIES ESCALADAS
+# GOVERNOR: QUALIDADE ADAPTATIVA EM TEMPO REAL
 # ---------------------------------------------------------
-_scaled_cache = {}
+# Janela de frames medida antes de decidir (~2 s a 60 FPS)
+GOVERNOR_WINDOW = 120
 
-def adapt_surface(surface, new_size):
-    key = (id(surface), new_size)
-    if key in _scaled_cache:
-        return _scaled_cache[key]
+# Desce se o p90 do frame passar do orçamento do FPS alvo (+15%)
+DOWNGRADE_RATIO = 1.15
 
-    try:
-        if supports_smoothscale():
-            scaled = pygame.transform.smoothscale(surface, new_size)
-        else:
-            scaled = pygame.transform.scale(surface, new_size)
-    except:
-        scaled = pygame.transform.scale(surface, new_size)
+# Sobe só se o p90 do trabalho real (sem a espera do Clock) couber com
+# folga no orçamento do nível de cima; a distância entre os dois limites
+# é a histerese que evita ficar oscilando
+UPGRADE_RATIO = 0.6
+
+# Depois de uma troca, espera antes de decidir de novo (ms)
+GOVERNOR_COOLDOWN_MS = 3000
+
+# Frames acima disso são engasgos de carregamento, não carga de render
+SPIKE_MS = 250
+
+
+def percentile(values, pct):
+    """Percentil `pct` (0-100) por vizinho mais próximo."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+class QualityGovernor:
+    def __init__(self, window=GOVERNOR_WINDOW):
+        self.enabled = True
+        self.window = window
+        self.frames = deque(maxlen=window)   # dt total do frame (ms)
+        self.work = deque(maxlen=window)     # tempo de trabalho, sem a espera do Clock (ms)
+        self.cooldown = 0.0
+        self.changes = []                    # (nível antigo, nível novo, p90)
+
+    def sample(self, frame_ms, work_ms=None):
+        """Registra um frame; chamado pelo scene_manager depois do tick."""
+        if not self.enabled:
+            return None
+        if self.cooldown > 0:
+            self.cooldown -= frame_ms
+            return None
+        if frame_ms > SPIKE_MS:
+            return None
 
-    scaled = scaled.convert_alpha()
-    _scaled_cache[key] = scaled
-    return scaled
+        self.frames.append(frame_ms)
+        self.work.append(frame_ms if work_ms is None else work_ms)
+        if len(self.frames) < self.window:
+            return None
+        return self._decide()
+
+    def _decide(self):
+        current = preset_name()
+        if current not in LEVELS:
+            return None
+        level = LEVELS.index(current)
+        p90_frame = percentile(self.frames, 90)
+        p90_work = percentile(self.work, 90)
+
+        budget = 1000.0 / PRESETS[current]["fps"]
+        if level > 0 and p90_frame > budget * DOWNGRADE_RATIO:
+            return self._switch(LEVELS[level - 1], p90_frame)
+
+        if level < len(LEVELS) - 1:
+            upper = LEVELS[level + 1]
+            if p90_work < (1000.0 / PRESETS[upper]["fps"]) * UPGRADE_RATIO:
+                return self._switch(upper, p90_work)
+        return None
+
+    def _switch(self, name, measured):
+        self.changes.append((preset_name(), name, round(measured, 2)))
+        set_preset(name)
+        self.frames.clear()
+        self.work.clear()
+        self.cooldown = GOVERNOR_COOLDOWN_MS
+        return name
+
+    def stats(self):
+        return {
+            "preset": preset_name(),
+            "enabled": self.enabled,
+            "samples": len(self.frames),
+            "p50": percentile(self.frames, 50),
+            "p90": percentile(self.frames, 90),
+            "p99": percentile(self.frames, 99),
+            "work_p90": percentile(self.work, 90),
+            "changes": list(self.changes),
+        }
+
+
+governor = QualityGovernor()
+
+
+# ---------------------------------------------------------
+# CACHE PARA SUPERFÍCIES ESCALADAS
+# ---------------------------------------------------------
+def adapt_surface(surface, new_size):
+    # O cache (LRU com orçamento) fica no asset_manager
+    from src.asset_manager import asset_manager
+    return asset_manager.scale_surface(surface, new_size, filter="auto")
 
 
-# Para testes
+# Para testes (fixa o preset: o governor para de mexer)
 def force_preset(name):
-    global PRESET
     if name in PRESETS:
-        PRESET = PRESETS[name]
\ No newline at end of file
+        set_preset(name)
+        governor.enabled = False
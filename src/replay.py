@@ -0,0 +1,328 @@
+#=========================================================
+#   GRAVAÇÃO E REPLAY DE SESSÕES (ENTRADA + SEMENTE)
+#=========================================================
+
+"""
+Grava uma sessão de jogo e a reproduz igual, para repetir um engasgo
+relatado e comparar traces de frame antes e depois de uma otimização.
+
+O que a sessão guarda (JSONL: um cabeçalho e uma linha por frame):
+- semente do `random` global: tudo o que sorteia no jogo (shuffle /
+  sample dos minigames, partículas, roleta) deriva dela;
+- tamanho da janela, preset e limites do aparelho (DEVICE_CAPS) no começo
+  da gravação, e se a calibração rodou antes dela. A gravação começa
+  depois do set_mode e da calibração; no replay a janela volta ao tamanho
+  gravado, os limites são os gravados e a calibração não roda (ela mede o
+  aparelho local e gastaria frames, leituras e sorteios fora da gravação);
+- modo e tempo do game_clock no começo da gravação: os pulsos lidos de
+  game_clock.ticks() continuam de onde estavam, com ou sem calibração;
+- dt de cada frame: o passo fixo do scene_manager gera os mesmos ticks;
+- preset de desempenho de cada frame: no replay o QualityGovernor fica
+  desligado e o preset segue o gravado (quantidade de partículas etc.
+  mudam o consumo do `random`);
+- por leitura da fila (input_manager.poll): os eventos crus, a posição e
+  os botões do mouse e as teclas seguradas;
+- pygame.time.get_ticks() no começo de cada frame. Os cronômetros das
+  cenas usam o game_clock (src/game_clock.py), que anda com os dt
+  gravados; o get_ticks fica para código de fora que ainda o leia.
+
+Gravar:   PARTY_PASCAL_RECORD=sessao.jsonl python main.py
+Replay:   PARTY_PASCAL_REPLAY=sessao.jsonl python main.py
+          PARTY_PASCAL_REPLAY_FAST=1 ... sem esperar o Clock (o mais rápido
+          possível); o jogo recebe os mesmos dt, então o estado é o mesmo.
+Junto com PARTY_PASCAL_TRACE (src/instrumentation.py), cada execução
+gera um trace de frames comparável linha a linha.
+
+No replay, a entrada real é ignorada (só fechar a janela vale) e
+pygame.mouse.get_pos / get_pressed, pygame.key.get_pressed e
+pygame.time.get_ticks devolvem o que foi gravado. Quando as linhas acabam,
+o jogo fecha pelo caminho normal (hooks de saída incluídos).
+
+Desligado (padrão), events() e tick() só repassam o que recebem.
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+import pygame
+
+from src import performance
+from src.game_clock import game_clock
+
+FORMAT_VERSION = 1
+
+# Frames entre cada flush da gravação
+FLUSH_FRAMES = 60
+
+mode = None   # None | "record" | "replay"
+
+
+# ---------------------------------------------------------
+# SERIALIZAÇÃO DE EVENTOS
+# ---------------------------------------------------------
+_SKIP = object()   # valor que não vai para o JSON (ex.: objeto Window)
+
+
+def _plain(value):
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    if isinstance(value, (tuple, list)):
+        items = [_plain(v) for v in value]
+        return None if any(v is _SKIP for v in items) else items
+    return _SKIP
+
+
+def encode_event(ev):
+    data = {}
+    for key, value in ev.dict.items():
+        value = _plain(value)
+        if value is not _SKIP and value is not None:
+            data[key] = value
+    return [ev.type, data]
+
+
+def decode_event(item):
+    kind, data = item
+    for key in ("pos", "rel", "buttons", "size"):
+        if isinstance(data.get(key), list):
+            data[key] = tuple(data[key])
+    return pygame.event.Event(kind, data)
+
+
+def _pressed_keys():
+    # Iterar o ScancodeWrapper percorre por scancode (indexar usa keycode)
+    return [i for i, down in enumerate(pygame.key.get_pressed()) if down]
+
+
+# ---------------------------------------------------------
+# GRAVAÇÃO
+# ---------------------------------------------------------
+class Recorder:
+    def __init__(self, path, seed=None, calibrated=False):
+        self.seed = seed if seed is not None else int(time.time() * 1000) % (2 ** 32)
+        self.calibrated = calibrated
+        self.file = open(path, "w", encoding="utf-8")
+        self.frame = 0
+        self.polls = []
+        self.pending = 0
+
+    def start(self):
+        random.seed(self.seed)
+        surface = pygame.display.get_surface()
+        header = {
+            "version": FORMAT_VERSION,
+            "seed": self.seed,
+            "platform": sys.platform,
+            "screen": list(surface.get_size()) if surface else None,
+            "profile": {"preset": performance.preset_name(), "caps": dict(performance.DEVICE_CAPS)},
+            "calibrated": self.calibrated,
+            "clock": game_clock.snapshot(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self._write(header)
+
+    def events(self, raw):
+        self.polls.append({
+            "ev": [encode_event(ev) for ev in raw],
+            "mouse": list(pygame.mouse.get_pos()),
+            "buttons": list(pygame.mouse.get_pressed()),
+            "keys": _pressed_keys(),
+        })
+        return raw
+
+    def tick(self, clock, fps):
+        preset = performance.preset_name()  # o que valeu neste frame (antes do governor)
+        dt = clock.tick(fps)
+        self._write({"f": self.frame, "dt": dt, "t": pygame.time.get_ticks(),
+                     "preset": preset, "polls": self.polls})
+        self.frame += 1
+        self.polls = []
+        self.pending += 1
+        if self.pending >= FLUSH_FRAMES:
+            self.file.flush()
+            self.pending = 0
+        return dt
+
+    def _write(self, line):
+        self.file.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+# ---------------------------------------------------------
+# REPLAY
+# ---------------------------------------------------------
+class Player:
+    def __init__(self, path, fast=False):
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or lines[0].get("version") != FORMAT_VERSION:
+            raise ValueError(f"Gravação inválida ou de outra versão: {path}")
+        self.header = lines[0]
+        self.frames = lines[1:]
+        self.fast = fast
+        self.frame = 0
+        self.poll = 0
+        self.finished = False
+        self._state = {"mouse": (0, 0), "buttons": (False, False, False), "keys": None}
+        self._originals = {}
+
+    def start(self):
+        random.seed(self.header["seed"])
+        clock = self.header.get("clock")
+        if clock:
+            game_clock.restore(clock)
+        self._apply_screen()
+        profile = self.header.get("profile")
+        if profile:
+            performance.apply_profile(profile)
+        performance.governor.enabled = False
+        self._apply_preset()
+        self._patch()
+
+    def _apply_screen(self):
+        # Layouts, fontes e quantidade de partículas dependem do tamanho da tela
+        size = self.header.get("screen")
+        surface = pygame.display.get_surface()
+        if size and surface is not None and tuple(size) != surface.get_size():
+            pygame.display.set_mode(tuple(size), surface.get_flags() & pygame.RESIZABLE)
+
+    def _apply_preset(self):
+        if self.frame < len(self.frames):
+            name = self.frames[self.frame].get("preset")
+            if name and name != performance.preset_name():
+                performance.set_preset(name)
+
+    # Estado de entrada "ao vivo" lido pelas cenas -----------
+    def _patch(self):
+        state = self._state
+        real_keys = pygame.key.get_pressed
+        wrapper = type(real_keys())
+        size = len(real_keys())
+        state["keys"] = wrapper((False,) * size)
+
+        def set_keys(scancodes):
+            down = set(scancodes)
+            state["keys"] = wrapper(tuple(i in down for i in range(size)))
+        self._set_keys = set_keys
+
+        def get_ticks():
+            # "t" de cada linha é o relógio logo depois do tick: começo do frame seguinte
+            if self.frame == 0:
+                first = self.frames[0] if self.frames else {"t": 0, "dt": 0}
+                return first["t"] - first["dt"]
+            return self.frames[min(self.frame, len(self.frames)) - 1]["t"]
+
+        self._originals = {
+            (pygame.mouse, "get_pos"): pygame.mouse.get_pos,
+            (pygame.mouse, "get_pressed"): pygame.mouse.get_pressed,
+            (pygame.key, "get_pressed"): pygame.key.get_pressed,
+            (pygame.time, "get_ticks"): pygame.time.get_ticks,
+        }
+        pygame.mouse.get_pos = lambda: state["mouse"]
+        pygame.mouse.get_pressed = lambda num_buttons=3: state["buttons"][:num_buttons]
+        pygame.key.get_pressed = lambda: state["keys"]
+        pygame.time.get_ticks = get_ticks
+
+    def _unpatch(self):
+        for (module, name), fn in self._originals.items():
+            setattr(module, name, fn)
+        self._originals = {}
+
+    def events(self, raw):
+        # Da entrada real só vale fechar a janela
+        quit_events = [ev for ev in raw if ev.type == pygame.QUIT]
+        if self.finished or self.frame >= len(self.frames):
+            self.finished = True
+            return quit_events or [pygame.event.Event(pygame.QUIT)]
+
+        polls = self.frames[self.frame]["polls"]
+        if self.poll >= len(polls):
+            return quit_events
+        record = polls[self.poll]
+        self.poll += 1
+
+        self._state["mouse"] = tuple(record["mouse"])
+        self._state["buttons"] = tuple(bool(b) for b in record["buttons"])
+        self._set_keys(record["keys"])
+        return [decode_event(item) for item in record["ev"]] + quit_events
+
+    def tick(self, clock, fps):
+        clock.tick(0 if self.fast else fps)
+        if self.frame >= len(self.frames):
+            self.finished = True
+            return clock.get_time()
+        dt = self.frames[self.frame]["dt"]
+        self.frame += 1
+        self.poll = 0
+        self._apply_preset()
+        return dt
+
+    def close(self):
+        self._unpatch()
+
+
+# ---------------------------------------------------------
+# API DO MÓDULO (chamada pelo input_manager e pelo scene_manager)
+# ---------------------------------------------------------
+_active = None
+
+
+def events(raw):
+    """Eventos crus da fila: gravados ou trocados pelos da gravação."""
+    return raw if _active is None else _active.events(raw)
+
+
+def tick(clock, fps):
+    """dt (ms) do frame: o do Clock, gravado ou lido da gravação."""
+    return clock.tick(fps) if _active is None else _active.tick(clock, fps)
+
+
+def start_recording(path, seed=None, calibrated=False):
+    global _active, mode
+    stop()
+    _active = Recorder(path, seed, calibrated)
+    _active.start()
+    mode = "record"
+    return _active.seed
+
+
+def start_replay(path, fast=False):
+    global _active, mode
+    stop()
+    _active = Player(path, fast)
+    _active.start()
+    mode = "replay"
+    return _active.header
+
+
+def stop():
+    global _active, mode
+    if _active is not None:
+        _active.close()
+    _active = None
+    mode = None
+
+
+def replay_from_env():
+    """PARTY_PASCAL_REPLAY=arquivo reproduz. Devolve True se o replay começou."""
+    replay_path = os.environ.get("PARTY_PASCAL_REPLAY")
+    if not replay_path:
+        return False
+    header = start_replay(replay_path, fast=bool(os.environ.get("PARTY_PASCAL_REPLAY_FAST")))
+    print(f"▶ Replay de {replay_path} (semente {header['seed']})")
+    return True
+
+
+def record_from_env(calibrated=False):
+    """PARTY_PASCAL_RECORD=arquivo grava (depois do set_mode e da calibração)."""
+    record_path = os.environ.get("PARTY_PASCAL_RECORD")
+    if record_path:
+        seed = start_recording(record_path, calibrated=calibrated)
+        print(f"● Gravando sessão em {record_path} (semente {seed})")
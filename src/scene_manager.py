@@ -0,0 +1,426 @@
+#=========================================================
+#   GERENCIADOR DE CENAS (PILHA + LOOP ÚNICO DE FRAMES)
+#=========================================================
+
+"""
+SceneManager – um único loop de frames para o jogo inteiro
+-----------------------------------------------------------
+O jogo roda dentro de scene_manager.run(): é o único lugar com
+pygame.time.Clock, apresentação da tela (flip / dirty rects), fim de frame
+dos caches e o `await asyncio.sleep(0)` que devolve o controle ao
+navegador (pygbag).
+
+As cenas ficam numa pilha. Só a do topo roda; ao empilhar uma nova, a de
+baixo é suspensa (suspend/resume) e recebe o resultado quando a de cima
+termina. Dois tipos de cena:
+
+- Scene: objeto com handle_event / update(dt) / draw(screen), chamados
+  uma vez por frame pelo loop.
+- Loops antigos (async def com while): viram CoroutineScene e são
+  conduzidos pelo loop. No lugar de flip + sleep + tick, o loop da cena
+  faz `await scene_manager.frame()`; em vez de `await asyncio.sleep(s)`,
+  `await scene_manager.wait(ms)`; para abrir outra cena,
+  `resultado = await scene_manager.call(cena_ou_corrotina)`.
+
+preload() enfileira geradores (ex.: carregar o fundo do próximo minigame)
+que avançam no fim de cada frame dentro de um orçamento de tempo, junto
+com os fundos derivados pendentes.
+
+Simulação em passo fixo: o tempo real de cada frame entra num acumulador
+(FixedTimestep) que é consumido em ticks de TICK segundos (120 Hz). A
+lógica do jogo avança por tick (`for _ in range(scene_manager.ticks)`,
+ou update(TICK) nas Scenes) e o desenho usa `scene_manager.alpha` para
+interpolar entre o tick anterior e o atual. O FPS do preset
+(performance.target_fps, ajustado em tempo real pelo QualityGovernor)
+muda só a suavidade, não a velocidade do jogo.
+Depois de um engasgo, no máximo MAX_CATCHUP_TICKS são recuperados; o
+resto do atraso é descartado.
+
+O dt de cada frame passa pelo game_clock (src/game_clock.py): em modo
+real é o do Clock; acelerado ou em passos fixos, o jogo inteiro (ticks,
+wait(), cronômetros das cenas) anda junto.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+import pygame
+
+from src import sprite_cache, derived_assets, performance, instrumentation, replay
+from src.game_clock import game_clock
+from src.input_manager import input_manager
+from src.perf_overlay import overlay
+
+FPS = 60
+
+# Passo fixo da simulação
+TICK_HZ = 120
+TICK = 1.0 / TICK_HZ          # segundos por tick
+TICK_MS = 1000.0 / TICK_HZ
+
+# Teto de ticks recuperados num frame (~100 ms); acima disso o jogo "pula"
+MAX_CATCHUP_TICKS = 12
+
+
+def ease_per_tick(factor, frame_hz=60):
+    """Fator de aproximação (`x += (alvo - x) * f`) ajustado por frame a
+    `frame_hz` convertido para um tick, mantendo a mesma curva no tempo."""
+    return 1.0 - (1.0 - factor) ** (frame_hz / TICK_HZ)
+
+# Orçamento por frame dos preloads (ms)
+PRELOAD_BUDGET_MS = 4.0
+
+
+class Scene:
+    """Cena conduzida pelo loop: eventos -> update(dt) -> draw(screen)."""
+
+    def __init__(self):
+        self.done = False
+        self.result = None
+
+    # Ciclo de vida -----------------------------------------
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+    def suspend(self):
+        """Outra cena foi empilhada por cima."""
+        pass
+
+    def resume(self, result=None):
+        """A cena de cima terminou com `result`."""
+        pass
+
+    def preload(self):
+        """Gerador opcional com o trabalho pesado da cena (um passo por yield)."""
+        return None
+
+    # Frame -------------------------------------------------
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        """Um tick de simulação: dt é sempre TICK (segundos)."""
+        pass
+
+    def draw(self, screen):
+        pass
+
+    def present(self):
+        pygame.display.flip()
+
+    def finish(self, result=None):
+        self.done = True
+        self.result = result
+
+
+class CoroutineScene(Scene):
+    """Loop antigo (`async def` com while) adaptado à pilha."""
+
+    def __init__(self, coro):
+        super().__init__()
+        self.coro = coro
+        self._send = None
+        self._throw = None
+
+    def resume(self, result=None):
+        self._send = result
+
+    def exit(self):
+        self.coro.close()
+
+
+class FixedTimestep:
+    """Acumulador de tempo real -> ticks de tamanho fixo."""
+
+    def __init__(self, hz=TICK_HZ, max_ticks=MAX_CATCHUP_TICKS):
+        self.step = 1.0 / hz
+        self.step_ms = 1000.0 / hz
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.ticks = 0           # ticks a simular neste frame
+        self.alpha = 0.0         # fração do próximo tick já decorrida (interpolação)
+        self.total = 0           # ticks simulados desde o início
+        self.dropped = 0         # ticks descartados pelo teto de recuperação
+
+    def advance(self, dt_ms):
+        """Soma o tempo do frame e devolve quantos ticks simular."""
+        self.accumulator += dt_ms
+        ticks = int(self.accumulator // self.step_ms)
+        if ticks > self.max_ticks:
+            self.dropped += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self.accumulator %= self.step_ms
+        else:
+            self.accumulator -= ticks * self.step_ms
+        self.ticks = ticks
+        self.total += ticks
+        self.alpha = self.accumulator / self.step_ms
+        return ticks
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.alpha = 0.0
+
+
+class _Request:
+    """O que uma CoroutineScene pede ao loop ao fazer `await`."""
+
+    __slots__ = ("kind", "arg")
+
+    def __init__(self, kind, arg=None):
+        self.kind = kind
+        self.arg = arg
+
+    def __await__(self):
+        return (yield self)
+
+
+class _SceneManager:
+    def __init__(self, fps=FPS):
+        self.fps = fps
+        self.dt = 1000 // fps          # ms do jogo no último frame (game_clock)
+        self.real_dt = self.dt         # ms reais do último frame
+        self.frames = 0
+        self.timestep = FixedTimestep()
+        self.result = None
+        self._clock = None
+        self._stack = []
+        self._preloads = deque()
+
+    # ==========================================================
+    # PILHA
+    # ==========================================================
+    @staticmethod
+    def _wrap(scene):
+        return scene if isinstance(scene, Scene) else CoroutineScene(scene)
+
+    def push(self, scene):
+        scene = self._wrap(scene)
+        if self._stack:
+            self._stack[-1].suspend()
+        self._stack.append(scene)
+        self.preload(scene)
+        scene.enter()
+        return scene
+
+    def pop(self, result=None, error=None):
+        scene = self._stack.pop()
+        scene.exit()
+        if error is not None:
+            if not self._stack or not isinstance(self._stack[-1], CoroutineScene):
+                raise error
+            self._stack[-1]._throw = error
+        elif self._stack:
+            self._stack[-1].resume(result)
+        else:
+            self.result = result
+        return scene
+
+    def replace(self, scene):
+        """Troca a cena do topo sem acordar a de baixo."""
+        old = self._stack.pop()
+        old.exit()
+        self._stack.append(self._wrap(scene))
+        self.preload(self._stack[-1])
+        self._stack[-1].enter()
+        return self._stack[-1]
+
+    @property
+    def current(self):
+        return self._stack[-1] if self._stack else None
+
+    def depth(self):
+        return len(self._stack)
+
+    def scene_name(self):
+        """Nome da cena do topo (função do loop antigo ou classe da Scene)."""
+        scene = self.current
+        if scene is None:
+            return None
+        if isinstance(scene, CoroutineScene):
+            return getattr(scene.coro, "__name__", "coroutine")
+        return type(scene).__name__
+
+    # ==========================================================
+    # PASSO FIXO
+    # ==========================================================
+    @property
+    def ticks(self):
+        """Ticks de TICK segundos a simular neste frame."""
+        return self.timestep.ticks
+
+    @property
+    def alpha(self):
+        """Interpolação de desenho entre o tick anterior (0) e o atual (1)."""
+        return self.timestep.alpha
+
+    @property
+    def sim_dt(self):
+        """Tempo simulado neste frame (ms): ticks * TICK_MS."""
+        return self.timestep.ticks * TICK_MS
+
+    # ==========================================================
+    # API PARA OS LOOPS ANTIGOS (usar com await)
+    # ==========================================================
+    def frame(self, present=None):
+        """Fecha o frame da cena; devolve o dt (ms) do próximo.
+
+        present: função de apresentação (ex.: DirtyRects.present), None para
+        flip, False para manter na tela o que já foi apresentado.
+        """
+        return _Request("frame", present)
+
+    async def wait(self, ms):
+        """Apresenta o frame atual e segura a tela por `ms` sem travar o loop."""
+        elapsed = await self.frame()
+        while elapsed < ms:
+            elapsed += await self.frame(present=False)
+
+    def call(self, scene):
+        """Empilha `scene` (Scene ou corrotina) e devolve o seu resultado."""
+        return _Request("call", scene)
+
+    # ==========================================================
+    # PRELOAD
+    # ==========================================================
+    def preload(self, job):
+        """Enfileira um gerador (ou o preload() de uma Scene)."""
+        if isinstance(job, Scene):
+            job = job.preload()
+        if job is not None:
+            self._preloads.append(job)
+
+    def _pump_preloads(self, budget_ms=PRELOAD_BUDGET_MS):
+        start = time.perf_counter()
+        while self._preloads:
+            try:
+                next(self._preloads[0])
+            except StopIteration:
+                self._preloads.popleft()
+            if (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+
+    def finish_preloads(self):
+        while self._preloads:
+            self._pump_preloads(budget_ms=1000)
+
+    # ==========================================================
+    # LOOP
+    # ==========================================================
+    def _advance(self):
+        """Roda a cena do topo até ela fechar um frame. Devolve o present."""
+        while self._stack:
+            scene = self._stack[-1]
+
+            if isinstance(scene, CoroutineScene):
+                try:
+                    if scene._throw is not None:
+                        error, scene._throw = scene._throw, None
+                        req = scene.coro.throw(error)
+                    else:
+                        value, scene._send = scene._send, None
+                        req = scene.coro.send(value)
+                except StopIteration as stop:
+                    self.pop(stop.value)
+                    continue
+                except Exception as e:
+                    self.pop(error=e)
+                    continue
+
+                if not isinstance(req, _Request):
+                    raise RuntimeError("Cena aguardou algo fora do scene_manager: use frame()/wait()/call()")
+                if req.kind == "call":
+                    self.push(req.arg)
+                    continue
+                self._waiting = scene
+                return req.arg
+
+            for ev in input_manager.poll():
+                scene.handle_event(ev)
+            for _ in range(self.ticks):
+                if scene.done:
+                    break
+                scene.update(TICK)
+            if scene.done:
+                self.pop(scene.result)
+                continue
+            with instrumentation.phase("draw"):
+                scene.draw(pygame.display.get_surface())
+            self._waiting = None
+            return scene.present
+        return False
+
+    async def run(self, scene):
+        """Loop principal: roda até a pilha esvaziar e devolve o último resultado."""
+        self._clock = pygame.time.Clock()
+        self._waiting = None
+        self.result = None
+        self.fps = performance.target_fps()
+        self.timestep.reset()
+        self.timestep.advance(1000 / self.fps)
+        self.push(scene)
+
+        try:
+            while self._stack:
+                # Fases do frame (src/instrumentation.py; vazio se desligado)
+                rec = instrumentation.frame(self.scene_name())
+                present = self._advance()
+                if not self._stack:
+                    break
+                rec.mark("update")
+                scene = self.scene_name()
+
+                # Overlay F3 por cima de qualquer cena (None se fechado)
+                overlay_rect = overlay.draw(pygame.display.get_surface())
+                if overlay_rect is not None:
+                    rec.mark("overlay")
+
+                if present is None:
+                    pygame.display.flip()
+                elif present is not False:
+                    present()
+                if overlay_rect is not None and present is not None:
+                    # dirty rects / frame segurado: o flip não cobriu o overlay
+                    pygame.display.update(overlay_rect)
+                overlay.restore(pygame.display.get_surface())
+                rec.mark("present")
+                sprite_cache.end_frame()
+                derived_assets.pump()
+                self._pump_preloads()
+                rec.mark("pump")
+
+                await asyncio.sleep(0)
+                # FPS lido a cada frame: o preset pode mudar com o jogo rodando
+                self.fps = performance.target_fps()
+                # dt do Clock (ou o gravado, no replay de sessão: src/replay.py)
+                self.real_dt = replay.tick(self._clock, game_clock.fps_limit(self.fps))
+                if game_clock.mode != "stepped":
+                    performance.governor.sample(self.real_dt, self._clock.get_rawtime())
+                # Tempo do jogo: real, acelerado ou em passos fixos
+                self.dt = game_clock.frame(self.real_dt)
+                self.timestep.advance(self.dt)
+                self.frames += 1
+                rec.mark("sleep")
+                instrumentation.gauge("dt_ms", self.real_dt)
+                instrumentation.gauge("fps_target", self.fps)
+                instrumentation.gauge("ticks", self.timestep.ticks)
+                instrumentation.gauge("stack", len(self._stack))
+                rec.end(scene)
+                overlay.sample(self.real_dt)
+                if self._waiting is not None:
+                    self._waiting._send = self.dt
+        finally:
+            # Saída por exceção (ou sys.exit): fecha o que sobrou na pilha
+            while self._stack:
+                self._stack.pop().exit()
+            self._preloads.clear()
+
+        return self.result
+
+
+scene_manager = _SceneManager()
@@ -5,12 +5,20 @@
 import pygame
 import os
 import math
-import random
-import sys
 import json
-import asyncio  # <--- Importante
-from src.utils import load_font, draw_text
+from src.utils import load_font, draw_text, render_text
 from src.audio_manager import audio_manager
+from src import performance, instrumentation
+from src.asset_manager import asset_manager
+from src import image_ops
+from src.particle_system import ParticleSystem
+from src.dirty_rects import DirtyRects
+from src.input_manager import input_manager
+from src.scene_manager import scene_manager, TICK, ease_per_tick
+from src.calibration import run_calibration
+
+# Mola do hover dos botões (0.2 por frame a 60 FPS)
+BUTTON_EASE = ease_per_tick(0.2)
 
 # ---------- Config paths ----------
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -65,31 +73,23 @@ def save_settings(s):
 
 
 # ---------- Partículas (Bolinhas coloridas de fundo) ----------
-class Particle:
-    def __init__(self, w, h):
-        self.w, self.h = max(1, w), max(1, h)
-        self.reset()
-
-    def reset(self):
-        self.x = random.uniform(0, self.w)
-        self.y = random.uniform(0, self.h)
-        self.r = random.uniform(2, 5)
-        self.speed = random.uniform(0.2, 0.6)
-        self.alpha = random.randint(50, 150)
-        self.color = random.choice([(255, 255, 255), (100, 200, 255), (255, 100, 150)])
-
-    def update(self, dt):
-        self.y -= self.speed * dt * 0.06
-        self.x += math.sin(self.y * 0.01) * 0.2
-        if self.y < -10:
-            self.reset()
-            self.y = self.h + 10
-
-    def draw(self, surf):
-        s = pygame.Surface((int(self.r*2), int(self.r*2)), pygame.SRCALPHA)
-        c = (*self.color, int(self.alpha))
-        pygame.draw.circle(s, c, (int(self.r), int(self.r)), int(self.r))
-        surf.blit(s, (int(self.x), int(self.y)))
+def settings_particles(w, h):
+    w, h = max(1, w), max(1, h)
+    return ParticleSystem(
+        performance.particle_count(25),
+        palette=[(255, 255, 255), (100, 200, 255), (255, 100, 150)],
+        bounds=(-math.inf, -10, math.inf, math.inf),
+        spawn={
+            "x": (0, w), "y": (0, h),
+            "size": (2, 5),
+            "alpha": (50, 150),
+            "vy": (-34.6, -11.5),
+            "sway": 12,
+            "phase": lambda ps, idx: ps.y[idx] * 0.01,
+            "sway_freq": lambda ps, idx: ps.vy[idx] * 0.01,
+        },
+        respawn={"y": h + 10},
+    )
 
 
 # ---------- Slider (Controle de Volume) ----------
@@ -115,6 +115,7 @@ class Slider:
         knob_y = self.rect.centery
         pygame.draw.circle(screen, (255, 255, 255), (knob_x, knob_y), self.knob_radius)
         pygame.draw.circle(screen, (200, 200, 200), (knob_x, knob_y), self.knob_radius - 3)
+        return self.rect.inflate(self.knob_radius * 2 + 2, self.knob_radius * 2)
 
     def handle_event(self, event):
         """Retorna True se o valor mudou."""
@@ -172,7 +173,8 @@ class Button:
         self.hovering = self.rect.collidepoint(mouse)
         
         target_scale = 1.05 if self.hovering else 1.0
-        self.scale += (target_scale - self.scale) * 0.2
+        for _ in range(scene_manager.ticks):
+            self.scale += (target_scale - self.scale) * BUTTON_EASE
 
         r, g, b = self.base_color
         if self.hovering:
@@ -201,8 +203,9 @@ class Button:
         pygame.draw.rect(screen, border_col, draw_rect, border_width, border_radius=15)
 
         # Texto e Sombra
-        screen.blit(self.shadow_surf, self.shadow_surf.get_rect(center=(draw_rect.centerx+1, draw_rect.centery+1)))
-        screen.blit(self.text_surf, self.text_surf.get_rect(center=draw_rect.center))
+        image_ops.blit(screen, self.shadow_surf, self.shadow_surf.get_rect(center=(draw_rect.centerx+1, draw_rect.centery+1)))
+        image_ops.blit(screen, self.text_surf, self.text_surf.get_rect(center=draw_rect.center))
+        return draw_rect.union(shadow_rect)
 
     def clicked(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -219,14 +222,13 @@ class SettingsUI:
         self.settings = settings
         self.w, self.h = screen.get_size()
         
-        self.particles = [Particle(self.w, self.h) for _ in range(25)]
+        self.particles = settings_particles(self.w, self.h)
+        self.dirty = DirtyRects(screen)
         
         # Background
-        try:
-            raw_bg = pygame.image.load(BG_PATH_DEFAULT).convert()
-            self.bg = pygame.transform.smoothscale(raw_bg, (self.w, self.h))
-        except:
-            self.bg = pygame.Surface((self.w, self.h))
+        self.bg = asset_manager.scaled(BG_PATH_DEFAULT, (self.w, self.h))
+        if self.bg is None:
+            self.bg = image_ops.new_surface((self.w, self.h))
             self.bg.fill((30, 30, 45))
 
         self._init_elements()
@@ -257,7 +259,10 @@ class SettingsUI:
         is_full = self.settings.get("fullscreen")
         txt = "Tela Cheia: DESATIVAR" if is_full else "Tela Cheia: ATIVAR"
         
-        self.btn_full = Button(txt, (cx, int(h * 0.80)), self.font_btn, COLORS["btn_gray"])
+        self.btn_full = Button(txt, (cx - int(spacing * 0.75), int(h * 0.80)), self.font_btn, COLORS["btn_gray"])
+
+        # Refaz o perfil do aparelho (src/calibration.py)
+        self.btn_calib = Button("Calibrar Desempenho", (cx + int(spacing * 0.75), int(h * 0.80)), self.font_btn, COLORS["btn_gray"])
 
         # Ações
         self.btn_save = Button("Salvar & Voltar", (cx, int(h * 0.92)), self.font_btn, (40, 150, 60))
@@ -265,78 +270,79 @@ class SettingsUI:
     def resize(self, screen):
         self.screen = screen
         self.w, self.h = screen.get_size()
-        try:
-            raw_bg = pygame.image.load(BG_PATH_DEFAULT).convert()
-            self.bg = pygame.transform.smoothscale(raw_bg, (self.w, self.h))
-        except: pass
+        bg = asset_manager.scaled(BG_PATH_DEFAULT, (self.w, self.h))
+        if bg is not None:
+            self.bg = bg
         self._init_elements()
+        self.dirty.invalidate()
 
     def draw(self):
         # BG e Overlay
-        self.screen.blit(self.bg, (0, 0))
-        overlay = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
-        overlay.fill(COLORS["panel_bg"])
-        self.screen.blit(overlay, (0, 0))
+        image_ops.blit(self.screen, self.bg, (0, 0))
+        image_ops.shade(self.screen, COLORS["panel_bg"], COLORS["panel_bg"][3])
 
         # Partículas
-        for p in self.particles:
-            p.update(16)
-            p.draw(self.screen)
+        self.particles.advance(scene_manager.ticks, TICK)
+        drawn = [] if self.dirty.enabled else None
+        self.particles.draw(self.screen, rects=drawn, interp=scene_manager.alpha)
+        self.dirty.group("particles", drawn or ())
 
         # Título
-        title = self.font_title.render("CONFIGURAÇÕES", True, (255, 255, 255))
-        shad = self.font_title.render("CONFIGURAÇÕES", True, (0,0,0))
+        title = render_text(self.font_title, "CONFIGURAÇÕES", (255, 255, 255))
+        shad = render_text(self.font_title, "CONFIGURAÇÕES", (0,0,0))
         tr = title.get_rect(center=(self.w//2, int(self.h * 0.10)))
-        self.screen.blit(shad, (tr.x+4, tr.y+4))
-        self.screen.blit(title, tr)
+        image_ops.blit(self.screen, shad, (tr.x+4, tr.y+4))
+        image_ops.blit(self.screen, title, tr)
 
         # Labels
-        l1 = self.font_label.render("Música", True, (200, 200, 200))
-        self.screen.blit(l1, (self.slider_music.rect.x, self.slider_music.rect.y - 45))
-        self.slider_music.draw(self.screen)
+        l1 = render_text(self.font_label, "Música", (200, 200, 200))
+        image_ops.blit(self.screen, l1, (self.slider_music.rect.x, self.slider_music.rect.y - 45))
+        self.dirty.widget("music", self.slider_music.draw(self.screen), self.slider_music.value)
 
-        l2 = self.font_label.render("Efeitos Sonoros", True, (200, 200, 200))
-        self.screen.blit(l2, (self.slider_fx.rect.x, self.slider_fx.rect.y - 45))
-        self.slider_fx.draw(self.screen)
+        l2 = render_text(self.font_label, "Efeitos Sonoros", (200, 200, 200))
+        image_ops.blit(self.screen, l2, (self.slider_fx.rect.x, self.slider_fx.rect.y - 45))
+        self.dirty.widget("fx", self.slider_fx.draw(self.screen), self.slider_fx.value)
 
         # Dificuldade Label
-        ld = self.font_label.render("Dificuldade", True, (255, 255, 255))
-        self.screen.blit(ld, ld.get_rect(center=(self.w//2, int(self.h * 0.60))))
+        ld = render_text(self.font_label, "Dificuldade", (255, 255, 255))
+        image_ops.blit(self.screen, ld, ld.get_rect(center=(self.w//2, int(self.h * 0.60))))
 
         # Botões
         curr_diff = self.settings.get("difficulty", "normal")
-        self.btn_easy.draw(self.screen, is_selected=(curr_diff == "facil"))
-        self.btn_normal.draw(self.screen, is_selected=(curr_diff == "normal"))
-        self.btn_hard.draw(self.screen, is_selected=(curr_diff == "dificil"))
-
-        self.btn_full.draw(self.screen)
-        self.btn_save.draw(self.screen)
+        buttons = (
+            ("easy", self.btn_easy, curr_diff == "facil"),
+            ("normal", self.btn_normal, curr_diff == "normal"),
+            ("hard", self.btn_hard, curr_diff == "dificil"),
+            ("full", self.btn_full, False),
+            ("calib", self.btn_calib, False),
+            ("save", self.btn_save, False),
+        )
+        for name, btn, selected in buttons:
+            rect = btn.draw(self.screen, is_selected=selected)
+            self.dirty.widget(name, rect, (btn.text, btn.hovering, selected))
 
 
 # ---------- Loop Principal (ASYNC) ----------
 async def run_settings_menu(screen):
-    clock = pygame.time.Clock()
-    
     # Carrega config atual
     current_settings = load_settings()
     
     ui = SettingsUI(screen, current_settings)
 
+    # Fechar a janela com o menu aberto não perde o que foi ajustado
+    save_on_quit = lambda: save_settings(current_settings)
+    input_manager.add_quit_hook(save_on_quit)
+
     running = True
     while running:
-        dt = clock.tick(60)
-
+        instrumentation.mark("update")
         ui.draw()
-        pygame.display.flip()
+        instrumentation.mark("draw")
         
         # ⚠️ CORREÇÃO CRÍTICA PARA WEB ⚠️
-        await asyncio.sleep(0)
+        await scene_manager.frame(present=ui.dirty.present)
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                save_settings(current_settings)
-                pygame.quit(); sys.exit()
-            
+        for event in input_manager.poll():
             # Sliders
             res_mus = ui.slider_music.handle_event(event)
             if res_mus:
@@ -378,18 +384,19 @@ async def run_settings_menu(screen):
                 txt = "Tela Cheia: DESATIVAR" if current_settings["fullscreen"] else "Tela Cheia: ATIVAR"
                 ui.btn_full = Button(txt, ui.btn_full.center, ui.font_btn, COLORS["btn_gray"])
 
+            # Botão Calibrar: mede o aparelho de novo e troca o preset
+            if ui.btn_calib.clicked(event):
+                await scene_manager.call(run_calibration(screen))
+                ui.resize(pygame.display.get_surface())
+
             # Botão Salvar/Sair
             if ui.btn_save.clicked(event) or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
                 save_settings(current_settings)
+                input_manager.remove_quit_hook(save_on_quit)
                 return
 
-            # F11 Global
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
-                is_full = screen.get_flags() & pygame.FULLSCREEN
-                if is_full:
-                    screen = pygame.display.set_mode((1024, 600), pygame.RESIZABLE)
-                    current_settings["fullscreen"] = False
-                else:
-                    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                    current_settings["fullscreen"] = True
+            # F11 Global (o toggle é feito pelo input_manager)
+            if event.type == input_manager.RESIZED:
+                screen = pygame.display.get_surface()
+                current_settings["fullscreen"] = bool(screen.get_flags() & pygame.FULLSCREEN)
                 ui.resize(screen)
\ No newline at end of file
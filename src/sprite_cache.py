@@ -0,0 +1,345 @@
+#=========================================================
+#   CACHE DE SPRITES PRÉ-RENDERIZADOS (PARTÍCULAS)
+#=========================================================
+
+"""
+Cache compartilhado de "carimbos" (stamps) usados pelas partículas.
+
+Cada forma é desenhada uma única vez por (forma, raio, cor, faixa de alpha)
+e reaproveitada em todos os frames seguintes, de modo que um frame em regime
+permanente não aloca nenhuma Surface nova. O contador de alocações por frame
+serve justamente para comprovar isso.
+
+Os halos de brilho aditivo (backlight da roleta, contornos de painel) usam
+o mesmo esquema com poucos níveis de alpha, num LRU próprio.
+
+Glyphs girados / escalados também têm LRU próprio, com teto fixo, e não
+entram na chave com o alpha: a variante é uma só por (caractere, cor,
+escala, ângulo). glyph() e image() devolvem a surface do cache sem mexer
+nela; o alpha é de quem desenha, aplicado no momento do blit (ver
+ParticleSystem.draw). Com o ParticleSystem mantendo caractere, cor e escala
+ao reciclar uma partícula e pré-renderizando os ângulos na criação, as
+variantes vivas cabem no orçamento de glyphs e o cache para de alocar.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from src import instrumentation
+
+# Faixas de alpha: 256 níveis viram 16 carimbos por forma/cor
+ALPHA_STEP = 16
+
+# Rotação e escala de glyphs são quantizadas para limitar as variantes
+ANGLE_STEP = 20
+SCALE_STEP = 0.2
+
+# Orçamento de memória do cache (bytes)
+MAX_BYTES = 24 * 1024 * 1024
+
+# Glyphs girados: teto fixo. As letras do STOP (fonte de partícula limitada
+# a 96px) ocupam uns 44 MB a 1080p e são o maior conjunto vivo
+GLYPH_MAX_BYTES = 64 * 1024 * 1024
+
+# Halos de brilho são grandes (quase do tamanho da roleta): ficam num LRU
+# separado para não expulsar os carimbos pequenos das partículas. Os níveis
+# são distribuídos na faixa de alpha de quem chama; o orçamento cabe os
+# 2 x HALO_LEVELS halos do backlight da roleta a 1080p (~3,6 MB cada)
+HALO_LEVELS = 12
+HALO_MAX_BYTES = 96 * 1024 * 1024
+
+_stamps = OrderedDict()
+_bytes = 0
+
+_halos = OrderedDict()
+_halo_bytes = 0
+
+_glyphs = OrderedDict()
+_glyph_bytes = 0
+
+_stats = {
+    "allocated": 0,     # total de surfaces criadas desde o início
+    "frame": 0,         # criadas no frame corrente
+    "last_frame": 0,    # criadas no último frame fechado
+    "hits": 0,
+    "evicted": 0,
+}
+
+
+# ---------------------------------------------------------
+# QUANTIZAÇÃO
+# ---------------------------------------------------------
+def alpha_bucket(alpha):
+    a = max(0, min(255, int(alpha)))
+    return min(255, int(round(a / ALPHA_STEP)) * ALPHA_STEP)
+
+
+def _angle_bucket(angle):
+    return int(round(angle / ANGLE_STEP)) * ANGLE_STEP % 360
+
+
+def _scale_bucket(scale):
+    return max(SCALE_STEP, round(round(scale / SCALE_STEP) * SCALE_STEP, 2))
+
+
+def halo_level(alpha, lo=0, hi=255):
+    """Nível mais próximo entre HALO_LEVELS níveis distribuídos de `lo` a `hi`."""
+    step = (hi - lo) / (HALO_LEVELS - 1)
+    a = max(lo, min(hi, alpha))
+    return int(round(lo + round((a - lo) / step) * step))
+
+
+# ---------------------------------------------------------
+# INTERNOS
+# ---------------------------------------------------------
+def _count_allocation():
+    _stats["allocated"] += 1
+    _stats["frame"] += 1
+    instrumentation.count("surfaces")
+
+
+def _new_surface(size):
+    _count_allocation()
+    return pygame.Surface(size, pygame.SRCALPHA)
+
+
+def _get(key):
+    surf = _stamps.get(key)
+    if surf is not None:
+        _stamps.move_to_end(key)
+        _stats["hits"] += 1
+    return surf
+
+
+def _put(key, surf):
+    global _bytes
+    _stamps[key] = surf
+    _bytes += surf.get_width() * surf.get_height() * surf.get_bytesize()
+    while _bytes > MAX_BYTES and len(_stamps) > 1:
+        _, old = _stamps.popitem(last=False)
+        _bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        _stats["evicted"] += 1
+    return surf
+
+
+def _surface_bytes(surf):
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+def _get_halo(key):
+    surf = _halos.get(key)
+    if surf is not None:
+        _halos.move_to_end(key)
+        _stats["hits"] += 1
+    return surf
+
+
+def _get_glyph(key):
+    surf = _glyphs.get(key)
+    if surf is not None:
+        _glyphs.move_to_end(key)
+        _stats["hits"] += 1
+    return surf
+
+
+def _put_glyph(key, surf):
+    global _glyph_bytes
+    _glyphs[key] = surf
+    _glyph_bytes += _surface_bytes(surf)
+    while _glyph_bytes > GLYPH_MAX_BYTES and len(_glyphs) > 1:
+        _, old = _glyphs.popitem(last=False)
+        _glyph_bytes -= _surface_bytes(old)
+        _stats["evicted"] += 1
+    return surf
+
+
+def _put_halo(key, surf):
+    global _halo_bytes
+    _halos[key] = surf
+    _halo_bytes += _surface_bytes(surf)
+    while _halo_bytes > HALO_MAX_BYTES and len(_halos) > 1:
+        _, old = _halos.popitem(last=False)
+        _halo_bytes -= _surface_bytes(old)
+        _stats["evicted"] += 1
+    return surf
+
+
+# ---------------------------------------------------------
+# CARIMBOS
+# ---------------------------------------------------------
+def circle(radius, color, alpha=255):
+    """Círculo preenchido com lado 2*raio (mesmo recorte das partículas antigas)."""
+    r = max(1, int(radius))
+    a = alpha_bucket(alpha)
+    key = ("circle", r, tuple(color[:3]), a)
+    surf = _get(key)
+    if surf is None:
+        surf = _new_surface((r * 2, r * 2))
+        pygame.draw.circle(surf, (color[0], color[1], color[2], a), (r, r), r)
+        _put(key, surf)
+    return surf
+
+
+def ring(radius, color, alpha=255, width=2):
+    """Anel (círculo vazado) com 2px de folga para a borda."""
+    r = max(1, int(radius))
+    a = alpha_bucket(alpha)
+    key = ("ring", r, tuple(color[:3]), a, width)
+    surf = _get(key)
+    if surf is None:
+        size = r * 2 + 4
+        surf = _new_surface((size, size))
+        pygame.draw.circle(surf, (color[0], color[1], color[2], a), (size // 2, size // 2), r, width)
+        _put(key, surf)
+    return surf
+
+
+def line(length, width, color, alpha=255):
+    """Traço vertical (linhas de velocidade da Perseguição)."""
+    ln = max(1, int(length))
+    wd = max(1, int(width))
+    a = alpha_bucket(alpha)
+    key = ("line", ln, wd, tuple(color[:3]), a)
+    surf = _get(key)
+    if surf is None:
+        surf = _new_surface((wd, ln))
+        surf.fill((color[0], color[1], color[2], a))
+        _put(key, surf)
+    return surf
+
+
+def image(source, size):
+    """Ícone reduzido para `size` x `size` (ex.: maletas caindo).
+
+    Como no glyph, a surface é uma só para todos os alphas: quem desenha
+    aplica o alpha (set_alpha) logo antes do próprio blit.
+    """
+    sz = max(1, int(size))
+    key = ("image", source, sz)
+    surf = _get(key)
+    if surf is None:
+        surf = pygame.transform.smoothscale(source, (sz, sz))
+        _count_allocation()
+        _put(key, surf)
+    return surf
+
+
+def glyph(font, char, color, scale=1.0, angle=0):
+    """Caractere renderizado (com escala/rotação opcionais) usado como partícula.
+
+    A surface é compartilhada entre todos os alphas e sai daqui com o alpha
+    que o último blit deixou: quem desenha aplica o seu (set_alpha) logo
+    antes do próprio blit.
+    """
+    base_key = ("glyph", font, char, tuple(color[:3]))
+    base = _get_glyph(base_key)
+    if base is None:
+        base = font.render(char, True, color)
+        _count_allocation()
+        _put_glyph(base_key, base)
+
+    s = _scale_bucket(scale)
+    ang = _angle_bucket(angle)
+    key = ("glyph", font, char, tuple(color[:3]), s, ang)
+    surf = _get_glyph(key)
+    if surf is None:
+        surf = base
+        if s != 1.0:
+            w = int(base.get_width() * s)
+            h = int(base.get_height() * s)
+            if w <= 0 or h <= 0:
+                return None
+            surf = pygame.transform.scale(surf, (w, h))
+        if ang:
+            surf = pygame.transform.rotate(surf, ang)
+        if surf is base:
+            surf = base.copy()
+        _count_allocation()
+        _put_glyph(key, surf)
+    return surf
+
+
+def faded(source, alpha):
+    """Cópia de `source` com alpha de superfície fixo (brilhos aditivos de ícones)."""
+    a = alpha_bucket(alpha)
+    key = ("faded", source, a)
+    surf = _get(key)
+    if surf is None:
+        surf = source.copy()
+        _count_allocation()
+        surf.set_alpha(a)
+        _put(key, surf)
+    return surf
+
+
+# ---------------------------------------------------------
+# HALOS DE BRILHO (BLIT ADITIVO)
+# ---------------------------------------------------------
+def halo(radius, color, alpha, rings=None, alpha_range=(0, 255)):
+    """Disco de brilho com lado 2*raio, para blit com BLEND_RGBA_ADD.
+
+    rings: [(raio, fração do alpha), ...] de fora para dentro, para halos
+    com núcleo mais forte. O alpha é arredondado por halo_level() dentro de
+    `alpha_range` (a faixa real do pulso de quem chama), então o pulso de
+    uma cor/raio passa por no máximo HALO_LEVELS surfaces.
+    """
+    r = max(1, int(radius))
+    a = halo_level(alpha, *alpha_range)
+    rings = tuple((int(rr), f) for rr, f in rings) if rings else ((r, 1.0),)
+    key = ("halo", r, tuple(color[:3]), a, rings)
+    surf = _get_halo(key)
+    if surf is None:
+        surf = _new_surface((r * 2, r * 2))
+        for ring_radius, factor in rings:
+            pygame.draw.circle(surf, (color[0], color[1], color[2], int(a * factor)), (r, r), ring_radius)
+        _put_halo(key, surf)
+    return surf
+
+
+def glow_outline(size, color, alpha=255, width=4, border_radius=0):
+    """Contorno arredondado usado como brilho em volta de painéis."""
+    size = (max(1, int(size[0])), max(1, int(size[1])))
+    a = alpha_bucket(alpha)
+    key = ("outline", size, tuple(color[:3]), a, width, border_radius)
+    surf = _get_halo(key)
+    if surf is None:
+        surf = _new_surface(size)
+        pygame.draw.rect(surf, (color[0], color[1], color[2], a), surf.get_rect(),
+                         border_radius=border_radius, width=width)
+        _put_halo(key, surf)
+    return surf
+
+
+# ---------------------------------------------------------
+# CONTADORES
+# ---------------------------------------------------------
+def end_frame():
+    """Fecha o frame corrente: chamado uma vez por frame, antes do flip."""
+    _stats["last_frame"] = _stats["frame"]
+    _stats["frame"] = 0
+
+
+def allocations_last_frame():
+    return _stats["last_frame"]
+
+
+def stats():
+    info = dict(_stats)
+    info["entries"] = len(_stamps)
+    info["bytes"] = _bytes
+    info["halos"] = len(_halos)
+    info["halo_bytes"] = _halo_bytes
+    info["glyphs"] = len(_glyphs)
+    info["glyph_bytes"] = _glyph_bytes
+    return info
+
+
+def clear():
+    global _bytes, _halo_bytes, _glyph_bytes
+    _stamps.clear()
+    _bytes = 0
+    _halos.clear()
+    _halo_bytes = 0
+    _glyphs.clear()
+    _glyph_bytes = 0
@@ -0,0 +1,181 @@
+#=========================================================
+#   CACHE DE TEXTO RENDERIZADO + ATLAS DE GLYPHS
+#=========================================================
+
+"""
+Camada de cache para texto, usada junto com `utils.load_font`.
+
+render_text() memoiza superfícies por (fonte, texto, cor, antialias) num LRU
+limitado por bytes: títulos, legendas e botões deixam de ser rasterizados a
+cada frame.
+
+Para texto que muda o tempo todo (placar, cronômetros) o cache de strings
+inteiras só encheria de variantes, então GlyphAtlas compõe a string a partir
+de glyphs já renderizados, um blit por caractere.
+
+Os glyphs dos atlas moram no mesmo LRU das strings e entram no MAX_BYTES:
+fontes recriadas num resize deixam de ser usadas e seus glyphs saem do
+cache como qualquer outra entrada. Os objetos GlyphAtlas em si não guardam
+surfaces e ficam num LRU curto (MAX_ATLASES).
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from src import image_ops, instrumentation
+
+# Orçamento de memória do cache (bytes)
+MAX_BYTES = 16 * 1024 * 1024
+
+# Variantes com alpha (fades) são quantizadas para limitar o cache
+ALPHA_STEP = 8
+
+# Atlas (fonte, cor, alpha) lembrados por glyph_atlas()
+MAX_ATLASES = 64
+
+_surfaces = OrderedDict()
+_bytes = 0
+_atlases = OrderedDict()
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "evicted": 0,
+}
+
+
+# ---------------------------------------------------------
+# INTERNOS
+# ---------------------------------------------------------
+def _surface_bytes(surf):
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+def _get(key):
+    surf = _surfaces.get(key)
+    if surf is not None:
+        _surfaces.move_to_end(key)
+        _stats["hits"] += 1
+    else:
+        _stats["misses"] += 1
+    return surf
+
+
+def _put(key, surf):
+    global _bytes
+    _surfaces[key] = surf
+    _bytes += _surface_bytes(surf)
+    while _bytes > MAX_BYTES and len(_surfaces) > 1:
+        _, old = _surfaces.popitem(last=False)
+        _bytes -= _surface_bytes(old)
+        _stats["evicted"] += 1
+    return surf
+
+
+# ---------------------------------------------------------
+# TEXTO
+# ---------------------------------------------------------
+def render_text(font, text, color, antialias=True, alpha=255):
+    """
+    Equivalente cacheado de `font.render(text, antialias, color)`.
+
+    A superfície devolvida é compartilhada: não altere (set_alpha, fill...).
+    Para fades, passe `alpha` e receba uma variante própria.
+    """
+    color = tuple(color)
+    key = (font, text, color, antialias)
+    surf = _get(key)
+    if surf is None:
+        surf = _put(key, font.render(text, antialias, color))
+        instrumentation.count("text_renders")
+        instrumentation.count("surfaces")
+
+    if alpha >= 255:
+        return surf
+
+    a = max(0, int(alpha)) // ALPHA_STEP * ALPHA_STEP
+    akey = key + (a,)
+    faded = _get(akey)
+    if faded is None:
+        faded = image_ops.copy(surf)
+        faded.set_alpha(a)
+        _put(akey, faded)
+    return faded
+
+
+# ---------------------------------------------------------
+# ATLAS DE GLYPHS (números e textos que mudam todo frame)
+# ---------------------------------------------------------
+class GlyphAtlas:
+    def __init__(self, font, color, antialias=True, alpha=255):
+        self.font = font
+        self.color = tuple(color)
+        self.antialias = antialias
+        self.alpha = alpha
+        self._key = ("atlas", font, self.color, antialias, alpha)
+
+    def glyph(self, char):
+        key = self._key + (char,)
+        surf = _get(key)
+        if surf is None:
+            surf = self.font.render(char, self.antialias, self.color)
+            instrumentation.count("text_renders")
+            instrumentation.count("surfaces")
+            if self.alpha < 255:
+                surf.set_alpha(self.alpha)
+            _put(key, surf)
+        return surf
+
+    def size(self, text):
+        return sum(self.glyph(c).get_width() for c in text), self.font.get_height()
+
+    def get_rect(self, text, **kwargs):
+        """Mesmo uso de Surface.get_rect(center=..., topright=...)."""
+        rect = pygame.Rect((0, 0), self.size(text))
+        for attr, value in kwargs.items():
+            setattr(rect, attr, value)
+        return rect
+
+    def draw(self, surface, text, **kwargs):
+        rect = self.get_rect(text, **kwargs)
+        x, y = rect.topleft
+        seq = []
+        for c in text:
+            g = self.glyph(c)
+            seq.append((g, (x, y)))
+            x += g.get_width()
+        surface.blits(seq, doreturn=False)
+        instrumentation.count("blits", len(seq))
+        return rect
+
+
+def glyph_atlas(font, color, antialias=True, alpha=255):
+    a = 255 if alpha >= 255 else max(0, int(alpha)) // ALPHA_STEP * ALPHA_STEP
+    key = (font, tuple(color), antialias, a)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(font, color, antialias, a)
+        if len(_atlases) > MAX_ATLASES:
+            _atlases.popitem(last=False)
+    else:
+        _atlases.move_to_end(key)
+    return atlas
+
+
+# ---------------------------------------------------------
+# CONTADORES
+# ---------------------------------------------------------
+def stats():
+    info = dict(_stats)
+    info["entries"] = len(_surfaces)
+    info["bytes"] = _bytes
+    info["atlases"] = len(_atlases)
+    return info
+
+
+def clear():
+    global _bytes
+    _surfaces.clear()
+    _atlases.clear()
+    _bytes = 0
@@ -0,0 +1,161 @@
+#=========================================================
+#   LAYOUT DE TEXTO COM QUEBRA DE LINHA (MEMOIZADO)
+#=========================================================
+
+"""
+Quebra de linha e blocos de texto prontos para blit.
+
+A quebra gulosa (uma chamada de font.size() por palavra) é feita uma única
+vez por (texto, fonte, largura). O bloco inteiro é renderizado numa só
+superfície por (texto, fonte, largura, cor, alinhamento), então perguntas,
+opções e maletas custam um blit por frame (dois com sombra).
+
+measure() devolve a altura do bloco para dimensionar containers sem uma
+segunda passada de quebra.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from src import image_ops
+from src.text_cache import render_text
+
+# Orçamento de memória dos blocos renderizados (bytes)
+MAX_BYTES = 16 * 1024 * 1024
+
+_layouts = {}
+_blocks = OrderedDict()
+_bytes = 0
+
+_stats = {
+    "layouts": 0,
+    "hits": 0,
+    "misses": 0,
+    "evicted": 0,
+}
+
+
+# ---------------------------------------------------------
+# QUEBRA DE LINHAS
+# ---------------------------------------------------------
+class TextLayout:
+    """Linhas já quebradas de um texto para uma fonte e largura."""
+
+    def __init__(self, text, font, width):
+        self.font = font
+        self.width = int(width)
+        self.lines = _wrap(text, font, self.width)
+        self.line_height = font.get_linesize()
+        self.height = len(self.lines) * self.line_height
+        # Palavra maior que a largura vaza para os lados, como antes
+        widest = max((font.size(line)[0] for line in self.lines), default=0)
+        self.block_width = max(self.width, widest)
+
+
+def _wrap(text, font, width):
+    # Mesma regra gulosa de sempre: split() por espaços, palavra a palavra
+    lines, current_line = [], ""
+    for word in text.split():
+        test_line = f"{current_line}{word} "
+        if font.size(test_line)[0] <= width: current_line = test_line
+        else: lines.append(current_line.strip()); current_line = word + " "
+    if current_line: lines.append(current_line.strip())
+    return tuple(lines)
+
+
+def layout_text(text, font, width):
+    key = (text, font, int(width))
+    lay = _layouts.get(key)
+    if lay is None:
+        if len(_layouts) > 2048:
+            _layouts.clear()
+        lay = _layouts[key] = TextLayout(text, font, width)
+        _stats["layouts"] += 1
+    return lay
+
+
+def measure(text, font, width):
+    """Altura (px) que o texto ocupa quebrado em `width`."""
+    return layout_text(text, font, width).height
+
+
+# ---------------------------------------------------------
+# BLOCOS RENDERIZADOS
+# ---------------------------------------------------------
+def _block_bytes(surf):
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+def _get(key):
+    surf = _blocks.get(key)
+    if surf is not None:
+        _blocks.move_to_end(key)
+        _stats["hits"] += 1
+    else:
+        _stats["misses"] += 1
+    return surf
+
+
+def _put(key, surf):
+    global _bytes
+    _blocks[key] = surf
+    _bytes += _block_bytes(surf)
+    while _bytes > MAX_BYTES and len(_blocks) > 1:
+        _, old = _blocks.popitem(last=False)
+        _bytes -= _block_bytes(old)
+        _stats["evicted"] += 1
+    return surf
+
+
+def _build_block(lay, color, align):
+    bw = lay.block_width
+    surf = image_ops.new_surface((max(1, bw), max(1, lay.height)), pygame.SRCALPHA)
+    for i, line in enumerate(lay.lines):
+        text_surface = render_text(lay.font, line, color)
+        lw = text_surface.get_width()
+        if align == "left": x = 0
+        elif align == "right": x = bw - lw
+        else: x = bw // 2 - lw // 2
+        image_ops.blit(surf, text_surface, (x, i * lay.line_height))
+    return surf
+
+
+def render_block(text, font, color, width, align="center"):
+    """Superfície com o texto quebrado em `width` (largura do bloco: layout.block_width)."""
+    key = (text, font, int(width), tuple(color), align)
+    surf = _get(key)
+    if surf is None:
+        surf = _put(key, _build_block(layout_text(text, font, width), color, align))
+    return surf
+
+
+def fit_text(font, text, color, max_width):
+    """Texto de uma linha reduzido (smoothscale) para caber em `max_width`."""
+    base = render_text(font, text, color)
+    if base.get_width() <= max_width:
+        return base
+
+    key = ("fit", text, font, tuple(color), int(max_width))
+    surf = _get(key)
+    if surf is None:
+        scale = max_width / base.get_width()
+        surf = _put(key, image_ops.smoothscale(base, (int(base.get_width() * scale), int(base.get_height() * scale))))
+    return surf
+
+
+# ---------------------------------------------------------
+# CONTADORES
+# ---------------------------------------------------------
+def stats():
+    info = dict(_stats)
+    info["blocks"] = len(_blocks)
+    info["bytes"] = _bytes
+    return info
+
+
+def clear():
+    global _bytes
+    _layouts.clear()
+    _blocks.clear()
+    _bytes = 0
@@ -0,0 +1,112 @@
+#=========================================================
+#   EFEITO MÁQUINA DE ESCREVER (INCREMENTAL)
+#=========================================================
+
+"""
+Texto revelado letra a letra para as cutscenes.
+
+O texto completo é quebrado em linhas uma única vez (text_layout) e cada
+letra já tem sua posição final. A cada frame só as letras novas são
+carimbadas (atlas de glyphs do text_cache) numa superfície persistente,
+então o custo por frame é proporcional às letras reveladas naquele frame,
+e não ao tamanho do texto.
+
+Como a posição final é conhecida desde o início, as palavras não "pulam"
+de linha enquanto são escritas.
+"""
+
+import pygame
+
+from src import image_ops
+from src.text_cache import glyph_atlas
+from src.text_layout import layout_text
+
+
+class Typewriter:
+    def __init__(self, text, font, color, align="left"):
+        self.text = text
+        self.font = font
+        self.color = tuple(color)
+        self.align = align
+        self.revealed = 0
+        self.total = len(text)
+        self._width = None
+        self._glyphs = []
+        self._surface = None
+        self._drawn = 0
+        self._clock = 0.0
+
+    # -----------------------------------------------------
+    # CONTROLE
+    # -----------------------------------------------------
+    def advance(self, count=1):
+        self.revealed = min(self.total, self.revealed + count)
+
+    def update(self, dt_ms, char_ms):
+        """Revela uma letra a cada `char_ms` de tempo simulado (scene_manager.sim_dt)."""
+        if self.done:
+            self._clock = 0.0
+            return
+        self._clock += dt_ms
+        steps = int(self._clock // char_ms)
+        if steps:
+            self.advance(steps)
+            self._clock -= steps * char_ms
+
+    def reveal_all(self):
+        self.revealed = self.total
+
+    @property
+    def done(self):
+        return self.revealed >= self.total
+
+    # -----------------------------------------------------
+    # LAYOUT (uma vez por largura)
+    # -----------------------------------------------------
+    def _build(self, width):
+        lay = layout_text(self.text, self.font, width)
+        bw = lay.block_width
+        glyphs = []
+        for i, line in enumerate(lay.lines):
+            lw = self.font.size(line)[0]
+            if self.align == "left": x0 = 0
+            elif self.align == "right": x0 = bw - lw
+            else: x0 = bw // 2 - lw // 2
+            y = i * lay.line_height
+            for k, ch in enumerate(line):
+                glyphs.append((ch, x0 + self.font.size(line[:k])[0], y))
+            # O espaço que a quebra consumiu também conta como uma letra
+            glyphs.append((" ", 0, y))
+
+        self._width = width
+        self._layout = lay
+        self._glyphs = glyphs
+        self.total = len(glyphs)
+        self.revealed = min(self.revealed, self.total)
+        self._surface = image_ops.new_surface((max(1, bw), max(1, lay.height)), pygame.SRCALPHA)
+        self._drawn = 0
+
+    # -----------------------------------------------------
+    # DESENHO
+    # -----------------------------------------------------
+    def draw(self, surface, rect):
+        """Desenha centralizado verticalmente em `rect`, como draw_text_wrapped."""
+        if self._width != rect.width:
+            self._build(rect.width)
+
+        if self._drawn < self.revealed:
+            atlas = glyph_atlas(self.font, self.color)
+            target = self._surface
+            for ch, x, y in self._glyphs[self._drawn:self.revealed]:
+                if ch != " ":
+                    # MAX evita franja escura ao compor alpha sobre fundo transparente
+                    image_ops.blit(target, atlas.glyph(ch), (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            self._drawn = self.revealed
+
+        lay = self._layout
+        y = int(rect.centery - lay.height / 2)
+        if self.align == "left": x = rect.left
+        elif self.align == "right": x = rect.right - lay.block_width
+        else: x = rect.centerx - lay.block_width // 2
+        image_ops.blit(surface, self._surface, (x, y))
+        return pygame.Rect(x, y, lay.block_width, lay.height)
@@ -6,9 +6,8 @@ Execute com:  python test_imports.py
 try:
     import pygame
     import sys
-    from src.core import iniciar_jogo
+    from src.core import main_menu
     from src.game_loop import start_game_loop
-    from src.menu import main_menu
 
     print("✅ Todos os módulos foram importados com sucesso!")
 except ModuleNotFoundError as e:
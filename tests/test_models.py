@@ -0,0 +1,157 @@
+"""
+Regras dos minigames (src/minigames/models.py), sem pygame nem tela.
+Execute com:  python -m pytest -q tests   (ou python -m unittest discover tests)
+"""
+
+import random
+import unittest
+
+from src.minigames.models import QuizModel, NavalModel, RouletteModel
+
+PERGUNTAS = [
+    {"pergunta": "2 + 2?", "opcoes": ["3", "4", "5"], "correta": "4"},
+    {"pergunta": "Capital do Brasil?", "opcoes": ["Rio", "Brasília", "Recife"], "correta": "Brasília"},
+]
+
+AMEACAS = [("Phishing", "Treinamento"), ("Ransomware", "Backup"), ("DDoS", "CDN")]
+
+EVENTOS = [
+    {"nome": "Auditoria", "efeito": -30},
+    {"nome": "Bônus", "efeito": 50},
+    {"nome": "Multa", "efeito": -10},
+    {"nome": "Prêmio", "efeito": 20},
+]
+
+
+def errada(pergunta):
+    return next(o for o in pergunta["opcoes"] if o != pergunta["correta"])
+
+
+# ---------------------------------------------------------
+# QUIZ
+# ---------------------------------------------------------
+class QuizModelTest(unittest.TestCase):
+    def novo(self, **kw):
+        return QuizModel(PERGUNTAS, acerto=10, erro=-5, rng=random.Random(1), **kw)
+
+    def test_acerto_e_erro_pontuam(self):
+        quiz = self.novo()
+        certo = quiz.apply(("answer", quiz.atual["correta"]))
+        self.assertTrue(certo["correct"])
+        self.assertEqual(certo["points"], 10)
+
+        quiz.apply(("next",))
+        errado = quiz.apply(("answer", errada(quiz.atual)))
+        self.assertFalse(errado["correct"])
+        self.assertEqual(errado["points"], -5)
+        self.assertEqual(errado["correta"], quiz.atual["correta"])
+        self.assertEqual(quiz.score, 5)
+        self.assertEqual(quiz.acertos, 1)
+
+    def test_segunda_resposta_e_ignorada(self):
+        quiz = self.novo()
+        quiz.apply(("answer", quiz.atual["correta"]))
+        self.assertIsNone(quiz.apply(("answer", quiz.atual["correta"])))
+        self.assertEqual(quiz.score, 10)
+
+    def test_next_ate_o_fim(self):
+        quiz = self.novo()
+        self.assertFalse(quiz.apply(("next",))["done"])
+        self.assertTrue(quiz.apply(("next",))["done"])
+        self.assertTrue(quiz.done)
+        self.assertIsNone(quiz.atual)
+        self.assertIsNone(quiz.apply(("answer", "4")))
+
+    def test_tempo_limite_conta_como_erro(self):
+        quiz = self.novo(tempo_limite=2.0)
+        self.assertIsNone(quiz.apply(("tick", 1.5)))
+        self.assertAlmostEqual(quiz.tempo_restante, 0.5)
+        fim = quiz.apply(("tick", 1.0))
+        self.assertTrue(fim["timeout"])
+        self.assertFalse(fim["correct"])
+        self.assertEqual(fim["points"], -5)
+        self.assertEqual(quiz.tempo_restante, 0.0)
+
+    def test_opcoes_embaralhadas_mantem_a_certa(self):
+        quiz = self.novo(evitar_repeticao=True)
+        for p in quiz.perguntas:
+            self.assertIn(p["correta"], p["opcoes"])
+            self.assertEqual(len(p["opcoes"]), 3)
+
+    def test_acao_desconhecida(self):
+        with self.assertRaises(ValueError):
+            self.novo().apply(("fire", 0, 0))
+
+
+# ---------------------------------------------------------
+# BATALHA NAVAL
+# ---------------------------------------------------------
+class NavalModelTest(unittest.TestCase):
+    def setUp(self):
+        self.naval = NavalModel(AMEACAS, qtd=2, lado=3, acerto=10, erro=-5, rng=random.Random(7))
+        ocupadas = set(self.naval.navios)
+        self.navios = [divmod(c, 3) for c in sorted(ocupadas)]
+        self.vazia = next(divmod(c, 3) for c in range(9) if c not in ocupadas)
+
+    def test_agua(self):
+        linha, coluna = self.vazia
+        tiro = self.naval.apply(("fire", linha, coluna))
+        self.assertFalse(tiro["hit"])
+        self.assertEqual(tiro["points"], -5)
+        self.assertEqual(self.naval.grid[linha][coluna], "X")
+        self.assertFalse(self.naval.aberta(linha, coluna))
+
+    def test_acerto_revela_a_ameaca(self):
+        linha, coluna = self.navios[0]
+        tiro = self.naval.apply(("fire", linha, coluna))
+        self.assertTrue(tiro["hit"])
+        self.assertEqual(tiro["points"], 10)
+        self.assertEqual((tiro["ameaca"], tiro["controle"]), self.naval.navios[linha * 3 + coluna])
+        self.assertIn((linha, coluna), self.naval.reveladas)
+        self.assertFalse(self.naval.done)
+
+    def test_casa_repetida_e_ignorada(self):
+        self.naval.apply(("fire", *self.vazia))
+        self.naval.apply(("fire", *self.navios[0]))
+        self.assertIsNone(self.naval.apply(("fire", *self.vazia)))
+        self.assertIsNone(self.naval.apply(("fire", *self.navios[0])))
+        self.assertEqual(self.naval.score, 5)
+
+    def test_afunda_todas(self):
+        for linha, coluna in self.navios:
+            self.naval.apply(("fire", linha, coluna))
+        self.assertTrue(self.naval.done)
+        self.assertEqual(self.naval.score, 20)
+        self.assertIsNone(self.naval.apply(("fire", *self.vazia)))
+
+
+# ---------------------------------------------------------
+# ROLETA DO RISCO
+# ---------------------------------------------------------
+class RouletteModelTest(unittest.TestCase):
+    def giro(self, seed):
+        return RouletteModel(EVENTOS, rng=random.Random(seed)).apply(("spin",))
+
+    def test_mesma_semente_mesmo_resultado(self):
+        for seed in (0, 1, 42):
+            a, b = self.giro(seed), self.giro(seed)
+            self.assertEqual(a["index"], b["index"])
+            self.assertEqual(a["points"], b["points"])
+
+    def test_resultado_conhecido(self):
+        esperado = random.Random(42).randrange(len(EVENTOS))
+        giro = self.giro(42)
+        self.assertEqual(giro["index"], esperado)
+        self.assertIs(giro["evento"], EVENTOS[esperado])
+        self.assertEqual(giro["points"], EVENTOS[esperado]["efeito"])
+
+    def test_um_giro_so(self):
+        roleta = RouletteModel(EVENTOS, rng=random.Random(3))
+        primeiro = roleta.apply(("spin",))
+        self.assertTrue(roleta.done)
+        self.assertEqual(roleta.score, primeiro["points"])
+        self.assertIsNone(roleta.apply(("spin",)))
+
+
+if __name__ == "__main__":
+    unittest.main()